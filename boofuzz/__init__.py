@@ -7,16 +7,20 @@ from . import pedrpc
 from . import primitives
 from . import sex
 
+from .async_socket_connection import AsyncSocketConnection
 from .blocks.request import Request
 from .blocks.block import Block
 from .blocks.checksum import Checksum
+from .blocks.combinations import Combinations
 from .blocks.repeat import Repeat
+from .blocks.shared_block import SharedBlock, SharedBlockDefinition
 from .blocks.size import Size
 from .constants import BIG_ENDIAN, LITTLE_ENDIAN
 from .event_hook import EventHook
 from .fuzz_logger import FuzzLogger
 from .fuzz_logger_text import FuzzLoggerText
 from .fuzz_logger_csv import FuzzLoggerCsv
+from .iasync_target_connection import IAsyncTargetConnection
 from .ifuzz_logger import IFuzzLogger
 from .ifuzz_logger_backend import IFuzzLoggerBackend
 from .itarget_connection import ITargetConnection
@@ -205,6 +209,68 @@ def s_block_end(name=None):
     blocks.CURRENT.pop()
 
 
+def s_shared_block(name, definition, hosts=1):
+    """
+    Define a block structure once, for use in several requests with s_shared(). Each request gets its own copy, but
+    only the first hosts copies are fuzzed; the others always render the original value. Common structures such as
+    headers are then fuzzed once instead of once per request::
+
+        def headers():
+            s_string("Host: ")
+            s_string("example.com", name="host")
+            s_static("\\r\\n")
+
+        s_shared_block("headers", headers)
+
+        s_initialize("GET")
+        s_static("GET / HTTP/1.1\\r\\n")
+        s_shared("headers")  # fuzzed
+
+        s_initialize("HEAD")
+        s_static("HEAD / HTTP/1.1\\r\\n")
+        s_shared("headers")  # original value only
+
+    :type  name:       str
+    :param name:       Name of the shared block
+    :type  definition: callable
+    :param definition: Called without arguments to define the contents of each copy with s_* functions
+    :type  hosts:      int
+    :param hosts:      (Optional, def=1) Number of copies to fuzz
+    """
+
+    if name in blocks.SHARED:
+        raise sex.SullyRuntimeError("SHARED BLOCK ALREADY EXISTS: %s" % name)
+
+    blocks.SHARED[name] = SharedBlockDefinition(name, definition, hosts)
+
+
+def s_shared(shared_name, host=None, name=None):
+    """
+    Add a copy of a block structure defined with s_shared_block() to the current request, as a closed block.
+
+    :type  shared_name: str
+    :param shared_name: Name of the shared block
+    :type  host:        bool
+    :param host:        (Optional, def=None) Whether to fuzz this copy. Default True for the first copies, up to the
+                        number of hosts of the shared block, False after that
+    :type  name:        str
+    :param name:        (Optional, def=None) Name of the block in this request. Default shared_name
+
+    :rtype:  SharedBlock
+    :return: The copy
+    """
+
+    if shared_name not in blocks.SHARED:
+        raise sex.SullyRuntimeError("SHARED BLOCK NOT FOUND: %s" % shared_name)
+
+    block = blocks.SHARED[shared_name].copy(blocks.CURRENT, host, name)
+    blocks.CURRENT.push(block)
+    blocks.SHARED[shared_name].definition()
+    blocks.CURRENT.pop()
+
+    return block
+
+
 def s_checksum(block_name, algorithm="crc32", length=0, endian=LITTLE_ENDIAN, fuzzable=True, name=None,
                ipv4_src_block_name=None,
                ipv4_dst_block_name=None):
@@ -247,6 +313,34 @@ def s_checksum(block_name, algorithm="crc32", length=0, endian=LITTLE_ENDIAN, fu
     blocks.CURRENT.push(checksum)
 
 
+def s_combinations(strength=2, max_values=10, primitives=None, fuzzable=True, name=None):
+    """
+    Mutate several primitives at once. Every other item mutates a single primitive per test case; this one adds test
+    cases that set the primitives together, covering every combination of values of any strength primitives (pairwise
+    by default) with a covering array instead of the full cartesian product. Its number of test cases is part of
+    num_mutations(). Add it at the top level of the request, after the primitives it combines.
+
+    :type  strength:   int
+    :param strength:   (Optional, def=2) Number of primitives whose value combinations are all covered
+    :type  max_values: int
+    :param max_values: (Optional, def=10) Number of library values of each primitive to combine, spread evenly over
+                       its library
+    :type  primitives: list of str
+    :param primitives: (Optional, def=None) Names of the primitives to combine. Default every fuzzable primitive
+                       added so far
+    :type  fuzzable:   bool
+    :param fuzzable:   (Optional, def=True) Enable/disable fuzzing of this item
+    :type  name:       str
+    :param name:       (Optional, def=None) Specifying a name gives you direct access to this item
+    """
+
+    if blocks.CURRENT.block_stack:
+        raise sex.SullyRuntimeError("CAN NOT ADD COMBINATIONS INSIDE A BLOCK")
+
+    combinations = Combinations(blocks.CURRENT, strength, max_values, primitives, fuzzable, name)
+    blocks.CURRENT.push(combinations)
+
+
 def s_repeat(block_name, min_reps=0, max_reps=None, step=1, variable=None, fuzzable=True, name=None):
     """
     Repeat the rendered contents of the specified block cycling from min_reps to max_reps counting by step. By
@@ -0,0 +1,118 @@
+from __future__ import absolute_import
+import datetime
+import errno
+import socket
+
+from tornado import gen
+from tornado import iostream
+from tornado import tcpclient
+
+from . import iasync_target_connection
+from . import sex
+
+
+class AsyncSocketConnection(iasync_target_connection.IAsyncTargetConnection):
+    """IAsyncTargetConnection implementation over TCP, using tornado.
+
+    Example::
+
+        session.fuzz_concurrent(lambda: AsyncSocketConnection(host='127.0.0.1', port=17971), concurrency=32)
+
+    Args:
+        host (str): Hostname or IP address of target system.
+        port (int): Port of target service.
+        timeout (float): Seconds to wait for a connect/recv prior to timing out. Default 5.0.
+    """
+
+    def __init__(self, host, port, timeout=5.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+        self._stream = None
+        self._read_future = None
+
+    @gen.coroutine
+    def close(self):
+        """
+        Close connection to the target.
+
+        Returns:
+            Future: Resolves to None.
+        """
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        self._read_future = None
+
+    @gen.coroutine
+    def open(self):
+        """
+        Opens connection to the target. Make sure to call close!
+
+        Returns:
+            Future: Resolves to None.
+        """
+        try:
+            self._stream = yield gen.with_timeout(datetime.timedelta(seconds=self.timeout),
+                                                  tcpclient.TCPClient().connect(self.host, self.port))
+        except gen.TimeoutError:
+            raise sex.BoofuzzTargetConnectionFailedError("timed out connecting to {0}:{1}".format(self.host,
+                                                                                               self.port))
+        except (socket.error, iostream.StreamClosedError) as e:
+            raise sex.BoofuzzTargetConnectionFailedError(str(e))
+
+    @gen.coroutine
+    def recv(self, max_bytes):
+        """
+        Receive up to max_bytes data from the target.
+
+        Args:
+            max_bytes (int): Maximum number of bytes to receive.
+
+        Returns:
+            Future: Resolves to the received data, bytes('') on timeout or if the target closed the connection.
+        """
+        # a stream allows one read at a time; a read that timed out is still pending, and the next recv() waits for it.
+        if self._read_future is None:
+            self._read_future = self._stream.read_bytes(max_bytes, partial=True)
+
+        try:
+            data = yield gen.with_timeout(datetime.timedelta(seconds=self.timeout), self._read_future)
+        except gen.TimeoutError:
+            raise gen.Return(bytes(''))
+        except iostream.StreamClosedError:
+            self._read_future = None
+            self._raise_stream_error()
+            raise gen.Return(bytes(''))
+
+        self._read_future = None
+        raise gen.Return(data)
+
+    @gen.coroutine
+    def send(self, data):
+        """
+        Send data to the target. Only valid after calling open!
+
+        Args:
+            data: Data to send.
+
+        Returns:
+            Future: Resolves to the number of bytes actually sent.
+        """
+        try:
+            yield self._stream.write(data)
+        except iostream.StreamClosedError:
+            self._raise_stream_error()
+            raise sex.BoofuzzTargetConnectionReset()
+
+        raise gen.Return(len(data))
+
+    def _raise_stream_error(self):
+        """Raise the boofuzz equivalent of the socket error that closed the stream, if there was one."""
+        e = self._stream.error
+        if isinstance(e, socket.error):
+            if e.errno == errno.ECONNABORTED:
+                raise sex.BoofuzzTargetConnectionAborted(socket_errno=e.errno, socket_errmsg=e.strerror)
+            elif e.errno in (errno.ECONNRESET, errno.ENETRESET, errno.ETIMEDOUT):
+                raise sex.BoofuzzTargetConnectionReset()
@@ -2,13 +2,18 @@
 # blocks/ used to be blocks.py
 from .block import Block
 from .checksum import Checksum
+from .combinations import Combinations
 from .repeat import Repeat
 from .request import Request
+from .shared_block import SharedBlock, SharedBlockDefinition
 from .size import Size
 
 REQUESTS = {}
 CURRENT = None
 
+# shared block definitions by name, see s_shared_block().
+SHARED = {}
+
 # add a global quene
 # this is a dic that contact the data when fuzz one node,
 # and i will send it to next node
@@ -4,6 +4,65 @@ from ..primitives import BasePrimitive
 from ..ifuzzable import IFuzzable
 
 
+def seek_stack(stack, mutant_index):
+    """
+    Put a stack of items into the state that mutate() would leave it in after mutant_index mutations: items before the
+    one being mutated are exhausted, the rest are left as they are (reset).
+
+    @type  stack:        list
+    @param stack:        Reset items of a Request or Block
+    @type  mutant_index: int
+    @param mutant_index: Positive mutation index within the stack
+
+    @rtype:  IFuzzable
+    @return: The item currently being mutated
+    """
+
+    for item in stack:
+        if not item.fuzzable:
+            continue
+
+        num_mutations = item.num_mutations()
+        if mutant_index <= num_mutations:
+            item.seek(mutant_index)
+            return item
+
+        item.exhaust()
+        mutant_index -= num_mutations
+
+    raise IndexError("mutant index out of range for stack")
+
+
+def stack_mutation_ranges(stack, offset=0):
+    """
+    List the ranges of mutant indices in which each primitive of a stack is mutated, in mutation order.
+
+    @type  stack:  list
+    @param stack:  Items of a Request or Block
+    @type  offset: int
+    @param offset: Mutant index before the first mutation of the stack
+
+    @rtype:  list of tuple
+    @return: (first mutant index, number of mutations, item) for every run of mutations of a single item. An item
+             inside a grouped block gets one range for each group value.
+    """
+
+    ranges = []
+
+    for item in stack:
+        if not item.fuzzable:
+            continue
+
+        if isinstance(item, Block):
+            ranges.extend(item.mutation_ranges(offset))
+        elif item.num_mutations() > 0:
+            ranges.append((offset + 1, item.num_mutations(), item))
+
+        offset += item.num_mutations()
+
+    return ranges
+
+
 class Block(IFuzzable):
     def __init__(self, name, request, group=None, encoder=None, dep=None, dep_value=None, dep_values=None,
                  dep_compare="=="):
@@ -97,8 +156,8 @@ class Block(IFuzzable):
 
                 # if the group values are exhausted, we are done with this block.
                 if self.group_idx == group_count:
-                    # restore the original group value.
-                    self.request.names[self.group].reset()
+                    # restore the original group value. don't reset() it, that would restart its own mutations.
+                    self._restore_original_value(self.group)
 
                 # otherwise continue mutating this group/block.
                 else:
@@ -151,10 +210,72 @@ class Block(IFuzzable):
 
             # if we had a dependency, make sure we restore the original value.
             if self.dep:
-                self.request.names[self.dep].reset()
+                self._restore_original_value(self.dep)
 
         return mutated
 
+    def seek(self, mutant_index):
+        self.reset()
+
+        if mutant_index == 0:
+            return
+
+        if not 0 < mutant_index <= self.num_mutations():
+            raise IndexError("mutant index {0} out of range for {1!r}".format(mutant_index, self))
+
+        # every group value gets a full pass over the stack, so split the index into group value and stack index.
+        if self.group:
+            self.group_idx, mutant_index = divmod(mutant_index - 1, self._num_stack_mutations())
+            mutant_index += 1
+            self.request.names[self.group]._value = self.request.names[self.group].values[self.group_idx]
+
+        item = seek_stack(self.stack, mutant_index)
+
+        if not isinstance(item, Block):
+            self.request.mutant = item
+
+        # apply the dependency value exactly as mutate() does.
+        if self.dep:
+            if self.dep_values:
+                self.request.names[self.dep]._value = self.dep_values[0]
+            else:
+                self.request.names[self.dep]._value = self.dep_value
+
+    def exhaust(self):
+        self._fuzz_complete = True
+
+        for item in self.stack:
+            if item.fuzzable:
+                item.reset()
+
+        if self.group:
+            self.group_idx = len(self.request.names[self.group].values)
+            self._restore_original_value(self.group)
+
+        if self.dep:
+            self._restore_original_value(self.dep)
+
+    def mutation_ranges(self, offset=0):
+        """
+        List the ranges of mutant indices in which each primitive of this block is mutated. See stack_mutation_ranges().
+        """
+
+        if not self.group:
+            return stack_mutation_ranges(self.stack, offset)
+
+        ranges = []
+        for group_idx in range(len(self.request.names[self.group].values)):
+            ranges.extend(stack_mutation_ranges(self.stack, offset + group_idx * self._num_stack_mutations()))
+
+        return ranges
+
+    def _restore_original_value(self, name):
+        """
+        Restore the original value of a group or dependency primitive, leaving its own mutation state alone.
+        """
+        primitive = self.request.names[name]
+        primitive._value = primitive._original_value
+
     def num_mutations(self):
         """
         Determine the number of repetitions we will be making.
@@ -163,16 +284,25 @@ class Block(IFuzzable):
         @return: Number of mutated forms this primitive can take.
         """
 
+        num_mutations = self._num_stack_mutations()
+
+        # if this block is associated with a group, then multiply out the number of possible mutations.
+        if self.group:
+            num_mutations *= len(self.request.names[self.group].values)
+
+        return num_mutations
+
+    def _num_stack_mutations(self):
+        """
+        Number of mutations for a single pass over the block stack, i.e. for one group value.
+        """
+
         num_mutations = 0
 
         for item in self.stack:
             if item.fuzzable:
                 num_mutations += item.num_mutations()
 
-        # if this block is associated with a group, then multiply out the number of possible mutations.
-        if self.group:
-            num_mutations *= len(self.request.names[self.group].values)
-
         return num_mutations
 
     def push(self, item):
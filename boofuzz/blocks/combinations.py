@@ -0,0 +1,229 @@
+from .. import sex
+from .. import ifuzzable
+from ..primitives import BasePrimitive
+
+
+def _next_prime(n):
+    """
+    @rtype:  int
+    @return: Smallest prime >= n
+    """
+    n = max(n, 2)
+    while any(n % d == 0 for d in range(2, int(n ** 0.5) + 1)):
+        n += 1
+    return n
+
+
+class Combinations(ifuzzable.IFuzzable):
+    """
+    This block type mutates several primitives of a request at once, where every other item mutates exactly one. It
+    renders to nothing itself; each of its mutations sets a fuzz library value on every primitive it combines.
+
+    The mutations are the rows of a covering array of strength t: for any t of the primitives, every combination of
+    their (up to max_values) library values appears in some mutation. The array is the orthogonal array of Bush's
+    construction, OA(q^t, q + 1, q, t) for the smallest prime q that is at least the number of values of any primitive
+    and one less than the number of primitives. Row r is computed straight from r, so seek() costs the same as mutate().
+    """
+
+    def __init__(self, request, strength=2, max_values=10, primitives=None, fuzzable=True, name=None):
+        """
+        Combine the fuzz library values of primitives of a request. The primitives must come before this item.
+
+        @type  request:    Request
+        @param request:    Request this block belongs to
+        @type  strength:   int
+        @param strength:   (Optional, def=2) Size t of the combinations covered; 2 for pairwise
+        @type  max_values: int
+        @param max_values: (Optional, def=10) Number of library values of each primitive to combine, spread evenly over
+                           its library
+        @type  primitives: list of str
+        @param primitives: (Optional, def=None) Names of the primitives to combine. Default every fuzzable primitive
+                           of the request
+        @type  fuzzable:   bool
+        @param fuzzable:   (Optional, def=True) Enable/disable fuzzing of this item
+        @type  name:       str
+        @param name:       (Optional, def=None) Specifying a name gives you direct access to this item
+        """
+
+        self.request = request
+        self.strength = strength
+        self.max_values = max_values
+        self._fuzzable = fuzzable
+        self._name = name
+
+        self._rendered = ""
+        self._fuzz_complete = False
+        self._mutant_index = 0
+
+        if primitives is None:
+            self.primitives = [item for item in request.walk()
+                               if isinstance(item, BasePrimitive) and item.fuzzable and item.num_mutations() > 0]
+        else:
+            for primitive_name in primitives:
+                if primitive_name not in request.names:
+                    raise sex.SullyRuntimeError("Can't combine non-existent primitive: %s!" % primitive_name)
+            self.primitives = [request.names[primitive_name] for primitive_name in primitives]
+
+        if self.strength < 2:
+            raise sex.SullyRuntimeError("Combination strength must be at least 2, not %d" % self.strength)
+
+        if len(self.primitives) < self.strength:
+            raise sex.SullyRuntimeError(
+                "Combinations of strength %d need at least %d primitives, found %d" %
+                (self.strength, self.strength, len(self.primitives)))
+
+        # number of library values of each primitive taking part.
+        self._levels = [min(primitive.num_mutations(), self.max_values) for primitive in self.primitives]
+        self._order = _next_prime(max(max(self._levels), len(self.primitives) - 1, self.strength))
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def mutant_index(self):
+        return self._mutant_index
+
+    @property
+    def fuzzable(self):
+        return self._fuzzable
+
+    @property
+    def original_value(self):
+        return ""
+
+    def mutate(self):
+        """
+        Set the primitives to the values of the next row of the covering array, return False on completion.
+
+        @rtype:  bool
+        @return: True on success, False otherwise.
+        """
+
+        if self._mutant_index == self.num_mutations():
+            self._fuzz_complete = True
+
+        if not self.fuzzable or self._fuzz_complete:
+            self._restore_primitives()
+            return False
+
+        self._apply_row(self._mutant_index)
+        self._mutant_index += 1
+
+        return True
+
+    def seek(self, mutant_index):
+        """
+        Jump to the row at mutant_index of the covering array.
+        """
+
+        if mutant_index == 0:
+            self.reset()
+            return
+
+        if not 0 < mutant_index <= self.num_mutations():
+            raise IndexError("mutant index {0} out of range for {1!r}".format(mutant_index, self))
+
+        self._fuzz_complete = False
+        self._apply_row(mutant_index - 1)
+        self._mutant_index = mutant_index
+
+    def exhaust(self):
+        """
+        Skip the remaining combinations.
+
+        @rtype:  int
+        @return: The number of mutations skipped
+        """
+
+        num = self.num_mutations() - self._mutant_index
+
+        self._fuzz_complete = True
+        self._mutant_index = self.num_mutations()
+        self._restore_primitives()
+
+        return num
+
+    def num_mutations(self):
+        """
+        Number of rows of the covering array, q^t.
+
+        @rtype:  int
+        @return: Number of mutated forms this item can take.
+        """
+
+        if not self.fuzzable:
+            return 0
+
+        return self._order ** self.strength
+
+    def render(self):
+        """
+        The combined primitives render themselves; this item renders to nothing.
+        """
+
+        return self._rendered
+
+    def reset(self):
+        """
+        Reset the fuzz state of this item and restore the original values of the combined primitives.
+        """
+
+        self._fuzz_complete = False
+        self._mutant_index = 0
+        self._restore_primitives()
+
+    def row(self, index):
+        """
+        Row of the covering array.
+
+        @type  index: int
+        @param index: Zero-based row index, 0 <= index < num_mutations()
+
+        @rtype:  list of int
+        @return: Zero-based library position of the value of each primitive
+        """
+
+        # the row index, in base q, gives the coefficients of a polynomial of degree < t over GF(q).
+        coefficients = []
+        for _ in range(self.strength):
+            index, coefficient = divmod(index, self._order)
+            coefficients.append(coefficient)
+
+        positions = []
+        for column, level in enumerate(self._levels):
+            if column < self._order:
+                # column j holds the polynomial evaluated at j.
+                value = 0
+                for coefficient in reversed(coefficients):
+                    value = (value * column + coefficient) % self._order
+            else:
+                # the one extra column holds the leading coefficient.
+                value = coefficients[-1]
+
+            # fold q values onto the level values of this primitive, spread evenly over its library.
+            positions.append((value % level) * self.primitives[column].num_mutations() // level)
+
+        return positions
+
+    def _apply_row(self, index):
+        for primitive, position in zip(self.primitives, self.row(index)):
+            primitive._value = primitive._mutation_value(position)
+
+    def _restore_primitives(self):
+        for primitive in self.primitives:
+            primitive._value = primitive._original_value
+
+    def __repr__(self):
+        return "<%s %s>" % (self.__class__.__name__, self._name)
+
+    def __len__(self):
+        return 0
+
+    def __nonzero__(self):
+        """
+        Make sure instances evaluate to True even if __len__ is zero.
+
+        :return: True
+        """
+        return True
@@ -135,6 +135,44 @@ class Repeat(ifuzzable.IFuzzable):
 
         return True
 
+    def seek(self, mutant_index):
+        """
+        Jump to the repetition count at mutant_index in the fuzz library.
+        """
+
+        if mutant_index == 0:
+            self.reset()
+            return
+
+        if not 0 < mutant_index <= self.num_mutations():
+            raise IndexError("mutant index {0} out of range for {1!r}".format(mutant_index, self))
+
+        # render the contents of the block we are repeating, as mutate() does.
+        block = self.request.names[self.block_name]
+        block.render()
+
+        self._fuzz_complete = False
+        self.current_reps = self._fuzz_library[mutant_index - 1]
+        self._value = block.render() * self.current_reps
+        self._mutant_index = mutant_index
+
+    def exhaust(self):
+        """
+        Skip the remaining repetition counts.
+
+        @rtype:  int
+        @return: The number of mutations skipped
+        """
+
+        num = self.num_mutations() - self._mutant_index
+
+        self._fuzz_complete = True
+        self._mutant_index = self.num_mutations()
+        self._value = self.original_value
+        self.current_reps = self.min_reps
+
+        return num
+
     def num_mutations(self):
         """
         Determine the number of repetitions we will be making.
@@ -1,7 +1,7 @@
 import collections
 
 from ..import sex
-from .block import Block
+from .block import Block, seek_stack, stack_mutation_ranges
 from ..ifuzzable import IFuzzable
 
 
@@ -26,6 +26,7 @@ class Request(IFuzzable):
         self._rendered = ""  # rendered block structure.
         self._mutant_index = 0  # current mutation index.
         self.mutant = None  # current primitive being mutated.
+        self.version = 0  # incremented whenever the mutation state changes, see Session.transmit().
         self._callback = callback # if this request has a callback, it will call it after fuzz this node, it
                                   # need to be definition as func(data)
 
@@ -79,9 +80,43 @@ class Request(IFuzzable):
 
         if mutated:
             self._mutant_index += 1
+        self.version += 1
 
         return mutated
 
+    def seek(self, mutant_index):
+        self.reset()
+
+        if mutant_index == 0:
+            return
+
+        if not 0 < mutant_index <= self.num_mutations():
+            raise IndexError("mutant index {0} out of range for {1!r}".format(mutant_index, self))
+
+        item = seek_stack(self.stack, mutant_index)
+
+        if not isinstance(item, Block):
+            self.mutant = item
+
+        self._mutant_index = mutant_index
+
+    def exhaust(self):
+        self.version += 1
+        for item in self.stack:
+            if item.fuzzable:
+                item.exhaust()
+
+    def mutation_ranges(self):
+        """
+        List the ranges of mutant indices in which each primitive of this request is mutated.
+
+        @rtype:  list of tuple
+        @return: (first mutant index, number of mutations, primitive) for every run of mutations of a single
+                 primitive, in mutation order.
+        """
+
+        return stack_mutation_ranges(self.stack)
+
     def num_mutations(self):
         """
         Determine the number of repetitions we will be making.
@@ -160,8 +195,9 @@ class Request(IFuzzable):
         Reset every block and primitives mutant state under this request.
         """
 
-        self._mutant_index = 1
+        self._mutant_index = 0
         self.closed_blocks = {}
+        self.version += 1
 
         for item in self.stack:
             if item.fuzzable:
@@ -0,0 +1,83 @@
+from .block import Block
+
+
+class SharedBlockDefinition(object):
+    """
+    A block structure defined once with s_shared_block() and added to requests with s_shared().
+
+    Every request that uses it gets its own copy of the structure, built by calling definition, so names, sizers and
+    checksums work as in any block. Only the first hosts copies are fuzzed; the others always render the original
+    value, so the mutations of the structure are not repeated in every request.
+    """
+
+    def __init__(self, name, definition, hosts=1):
+        """
+        @type  name:       str
+        @param name:       Name of the shared block
+        @type  definition: callable
+        @param definition: Called without arguments to define the contents of a copy, with s_* functions, inside the
+                           open block
+        @type  hosts:      int
+        @param hosts:      (Optional, def=1) Number of copies to fuzz
+        """
+
+        self.name = name
+        self.definition = definition
+        self.hosts = hosts
+
+        self.copies = []  # every SharedBlock made from this definition, in order.
+
+    @property
+    def num_hosts(self):
+        """
+        @rtype:  int
+        @return: Number of copies made so far that are fuzzed
+        """
+
+        return len([copy for copy in self.copies if copy.host])
+
+    def copy(self, request, host=None, name=None):
+        """
+        Make an empty copy to add to a request; the caller pushes it and calls definition.
+
+        @type  request: Request
+        @param request: Request the copy belongs to
+        @type  host:    bool
+        @param host:    (Optional, def=None) Whether to fuzz the copy. Default while fewer than hosts copies are fuzzed
+        @type  name:    str
+        @param name:    (Optional, def=None) Name of the copy in the request. Default the name of the shared block
+
+        @rtype:  SharedBlock
+        @return: The copy
+        """
+
+        if host is None:
+            host = self.num_hosts < self.hosts
+
+        copy = SharedBlock(name if name is not None else self.name, request, self, host)
+        self.copies.append(copy)
+        return copy
+
+
+class SharedBlock(Block):
+    """
+    Copy of a SharedBlockDefinition in one request. A copy that is not a host is not fuzzable.
+    """
+
+    def __init__(self, name, request, shared, host):
+        """
+        @type  name:    str
+        @param name:    Name of the block
+        @type  request: Request
+        @param request: Request this block belongs to
+        @type  shared:  SharedBlockDefinition
+        @param shared:  Definition this block is a copy of
+        @type  host:    bool
+        @param host:    Whether the contents are fuzzed in this request
+        """
+
+        super(SharedBlock, self).__init__(name, request)
+
+        self.shared = shared
+        self.host = host
+        self._fuzzable = host
@@ -132,6 +132,15 @@ class Size(IFuzzable):
 
         return not_finished_yet
 
+    def seek(self, mutant_index):
+        """
+        Wrap the seek routine of the internal bit_field primitive.
+        """
+
+        self.bit_field.seek(mutant_index)
+        self._mutant_index = mutant_index
+        self._fuzz_complete = False
+
     def num_mutations(self):
         """
         Wrap the num_mutations routine of the internal bit_field primitive.
@@ -205,6 +214,8 @@ class Size(IFuzzable):
         """
 
         self.bit_field.reset()
+        self._mutant_index = 0
+        self._fuzz_complete = False
 
     def __repr__(self):
         return "<%s %s>" % (self.__class__.__name__, self._name)
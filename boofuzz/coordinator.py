@@ -0,0 +1,183 @@
+import cPickle
+import os
+import zlib
+
+from . import helpers
+from . import leases
+from . import pedrpc
+
+
+class CampaignCoordinator(pedrpc.Server):
+    """
+    PED-RPC server that shares one fuzzing campaign between several worker Sessions, possibly on different hosts.
+
+    Workers are ordinary Sessions created with coordinator=pedrpc.Client(host, port). They register with the number
+    of test cases in their protocol, then repeatedly lease a range of test case indices, fuzz it and report it
+    complete along with its crash synopses. Leases that are not completed within lease_timeout seconds, e.g. because
+    the worker died, are handed out again.
+
+    Progress is saved to state_filename whenever a lease is completed or released, and loaded again on start, so the
+    campaign survives a coordinator restart. Leases active at the time are handed out again.
+
+    Args:
+        host (str): Hostname or IP address to bind to.
+        port (int): Port to bind to.
+        state_filename (str): File to save campaign progress to. Default None (don't save).
+        lease_size (int): Number of test cases per lease. Default 100.
+        lease_timeout (float): Seconds after which a lease that was not completed is handed out again. Default 600.
+    """
+
+    def __init__(self, host, port, state_filename=None, lease_size=100, lease_timeout=600):
+        pedrpc.Server.__init__(self, host, port)
+
+        self.state_filename = state_filename
+        self.lease_size = lease_size
+        self.lease_timeout = lease_timeout
+
+        self.total_num_mutations = None
+        self.procmon_results = {}
+        self.netmon_results = {}
+        self._leases = None
+
+        self._load_state()
+
+    # noinspection PyMethodMayBeStatic
+    def alive(self):
+        """
+        Returns True. Useful for PED-RPC clients who want to see if the PED-RPC connection is still alive.
+        """
+        return True
+
+    def register(self, owner, total_num_mutations):
+        """
+        Register a worker. The first worker to register sets the number of test cases in the campaign.
+
+        Args:
+            owner (str): Name of the worker.
+            total_num_mutations (int): Number of test cases in the worker's protocol.
+
+        Returns:
+            bool: False if the worker's protocol has a different number of test cases than the campaign.
+        """
+        _ = owner
+        if self.total_num_mutations is None:
+            self.total_num_mutations = total_num_mutations
+            self._leases = leases.LeaseTable(first_index=1,
+                                             last_index=total_num_mutations,
+                                             lease_size=self.lease_size,
+                                             lease_timeout=self.lease_timeout)
+            self._save_state()
+
+        return self.total_num_mutations == total_num_mutations
+
+    def lease(self, owner):
+        """
+        Lease the next range of test cases.
+
+        Args:
+            owner (str): Name of the worker.
+
+        Returns:
+            tuple: (lease id, first test case index, index after the last test case), or None if nothing is left to
+                hand out right now. If status() isn't done, other workers still hold leases that may yet expire.
+        """
+        if self._leases is None:
+            return None
+
+        # not saved: leases active when the coordinator restarts are handed out again anyway.
+        lease = self._leases.lease(owner=owner)
+        if lease is None:
+            return None
+        return lease.id, lease.start, lease.stop
+
+    def complete(self, lease_id, start, stop, results):
+        """
+        Report a lease complete.
+
+        A lease that expired and was handed out again is still marked done, so the other worker skips whatever it
+        has not started yet.
+
+        Args:
+            lease_id (int): Lease id returned by lease().
+            start (int): First test case index of the lease.
+            stop (int): Index after the last test case of the lease.
+            results (dict): "procmon_results" and "netmon_results" for test cases of the lease, keyed by test case
+                index, and "done_to", the index of the last test case the worker is done with. done_to is beyond the
+                lease if the worker's crash threshold exhausted a primitive.
+        """
+        if self._leases is None:
+            return
+
+        self._leases.complete(lease_id)
+        self._leases.skip(start, max(stop, results["done_to"] + 1))
+        self.procmon_results.update(results["procmon_results"])
+        self.netmon_results.update(results["netmon_results"])
+        self._save_state()
+
+    def release(self, lease_id):
+        """
+        Give a lease back without completing it, so it is handed out again right away.
+
+        Args:
+            lease_id (int): Lease id returned by lease().
+        """
+        if self._leases is not None:
+            self._leases.release(lease_id)
+            self._save_state()
+
+    def status(self):
+        """
+        Returns:
+            dict: Campaign progress: total_num_mutations, num_done, watermark (every test case up to it is done),
+                done, active_leases as (owner, start, stop) tuples and num_crashes.
+        """
+        if self._leases is None:
+            return {
+                "total_num_mutations": None,
+                "num_done": 0,
+                "watermark": 0,
+                "done": False,
+                "active_leases": [],
+                "num_crashes": 0,
+            }
+
+        return {
+            "total_num_mutations": self.total_num_mutations,
+            "num_done": self._leases.num_done,
+            "watermark": self._leases.watermark,
+            "done": self._leases.done,
+            "active_leases": [(lease.owner, lease.start, lease.stop) for lease in self._leases.active_leases],
+            "num_crashes": len(self.procmon_results),
+        }
+
+    def crash_synopses(self):
+        """
+        Returns:
+            dict: Crash synopses reported by all workers, keyed by test case index.
+        """
+        return self.procmon_results
+
+    def _load_state(self):
+        if self.state_filename is None or not os.path.exists(self.state_filename):
+            return
+
+        with open(self.state_filename, "rb") as f:
+            data = cPickle.loads(zlib.decompress(f.read()))
+
+        self.total_num_mutations = data["total_num_mutations"]
+        self.procmon_results = data["procmon_results"]
+        self.netmon_results = data["netmon_results"]
+        self._leases = data["leases"]
+
+    def _save_state(self):
+        if self.state_filename is None:
+            return
+
+        data = {
+            "total_num_mutations": self.total_num_mutations,
+            "procmon_results": self.procmon_results,
+            "netmon_results": self.netmon_results,
+            "leases": self._leases,
+        }
+
+        helpers.write_file_atomically(self.state_filename, zlib.compress(cPickle.dumps(data, protocol=2)))
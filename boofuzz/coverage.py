@@ -0,0 +1,161 @@
+import ctypes
+import ctypes.util
+import os
+
+# name of the environment variable holding the shared memory id, as in AFL.
+SHM_ENV_VAR = "__AFL_SHM_ID"
+
+# size of the bitmap, as in AFL.
+MAP_SIZE = 1 << 16
+
+_IPC_PRIVATE = 0
+_IPC_RMID = 0
+_IPC_CREAT = 0o1000
+_IPC_EXCL = 0o2000
+
+# hit count classes, as in AFL: 1, 2, 3, 4-7, 8-15, 16-31, 32-127, 128-255. Each class is one bit.
+_COUNT_CLASS = [0, 1, 2, 4] + [8] * 4 + [16] * 8 + [32] * 16 + [64] * 96 + [128] * 128
+
+# bytes of the bitmap compared at once; most chunks of a trace are empty.
+_CHUNK_SIZE = 1024
+
+
+def _libc():
+    libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+    libc.shmget.restype = ctypes.c_int
+    libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+    libc.shmat.restype = ctypes.c_void_p
+    libc.shmdt.argtypes = [ctypes.c_void_p]
+    libc.shmdt.restype = ctypes.c_int
+    libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+    libc.shmctl.restype = ctypes.c_int
+    return libc
+
+
+class CoverageMap(object):
+    """
+    AFL-style edge coverage bitmap in System V shared memory.
+
+    The process monitor creates the map and starts the target with the environment from environment(). A target built
+    with AFL instrumentation (afl-gcc, afl-clang-fast) attaches to the shared memory named there and counts every edge
+    it takes in the byte at the edge's position. Other targets can do the same with CoverageMap.attach() and hit().
+
+    reset() clears the trace before each test case; update() compares the trace with everything seen before and tells
+    how many edges were new.
+
+    Args:
+        shm_id (int): Id of an existing shared memory segment to attach to. Default None (create a new one, removed by
+            close()).
+        size (int): Size of the bitmap in bytes. Default MAP_SIZE.
+    """
+
+    def __init__(self, shm_id=None, size=MAP_SIZE):
+        self.size = size
+        self._libc = _libc()
+        self._owner = shm_id is None
+
+        if shm_id is None:
+            shm_id = self._libc.shmget(_IPC_PRIVATE, size, _IPC_CREAT | _IPC_EXCL | 0o600)
+            if shm_id < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, "shmget() failed: {0}".format(os.strerror(errno)))
+        self.shm_id = shm_id
+
+        address = self._libc.shmat(shm_id, None, 0)
+        if address is None or address == ctypes.c_void_p(-1).value:
+            errno = ctypes.get_errno()
+            if self._owner:
+                self._libc.shmctl(shm_id, _IPC_RMID, None)
+            raise OSError(errno, "shmat() failed: {0}".format(os.strerror(errno)))
+        self._address = address
+        self._trace = (ctypes.c_ubyte * size).from_address(address)
+
+        # per edge, the hit count classes never seen yet.
+        self._virgin = bytearray("\xff" * size)
+        self.edges = 0
+
+    @classmethod
+    def attach(cls, environ=None):
+        """
+        Attach to the map named in the environment, like an instrumented target does.
+
+        Args:
+            environ (dict): Environment. Default os.environ.
+
+        Returns:
+            CoverageMap: The map, or None if the environment names none.
+        """
+        if environ is None:
+            environ = os.environ
+        if SHM_ENV_VAR not in environ:
+            return None
+        return cls(shm_id=int(environ[SHM_ENV_VAR]))
+
+    def environment(self):
+        """
+        Returns:
+            dict: Environment variables telling a target where the map is.
+        """
+        return {SHM_ENV_VAR: str(self.shm_id)}
+
+    def hit(self, edge):
+        """
+        Count one hit of an edge, as instrumentation does.
+
+        Args:
+            edge (int): Edge id; reduced modulo the map size.
+        """
+        edge %= self.size
+        self._trace[edge] = (self._trace[edge] + 1) & 0xff
+
+    def reset(self):
+        """
+        Clear the trace, e.g. before a test case.
+        """
+        ctypes.memset(self._address, 0, self.size)
+
+    def update(self):
+        """
+        Compare the trace with all traces since the map was created.
+
+        Returns:
+            int: Number of edges hit for the first time or with a new hit count class (1, 2, 3, 4-7, 8-15, 16-31,
+                32-127, 128+) in this trace.
+        """
+        trace = ctypes.string_at(self._address, self.size)
+        empty_chunk = "\x00" * _CHUNK_SIZE
+
+        new_edges = 0
+        for start in range(0, self.size, _CHUNK_SIZE):
+            if trace[start:start + _CHUNK_SIZE] == empty_chunk:
+                continue
+
+            for edge in range(start, min(start + _CHUNK_SIZE, self.size)):
+                count = ord(trace[edge])
+                if count and self._virgin[edge] & _COUNT_CLASS[count]:
+                    if self._virgin[edge] == 0xff:
+                        self.edges += 1
+                    self._virgin[edge] &= ~_COUNT_CLASS[count] & 0xff
+                    new_edges += 1
+
+        return new_edges
+
+    def close(self):
+        """
+        Detach from the map, and remove it if this object created it.
+        """
+        if self._address is None:
+            return
+
+        self._trace = None
+        self._libc.shmdt(self._address)
+        self._address = None
+        if self._owner:
+            self._libc.shmctl(self.shm_id, _IPC_RMID, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
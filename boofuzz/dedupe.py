@@ -0,0 +1,184 @@
+import cPickle
+import hashlib
+import math
+import os
+import struct
+import threading
+import zlib
+
+from . import helpers
+
+
+def payload_digest(payloads):
+    """
+    Digest of the sequence of messages of a test case.
+
+    Args:
+        payloads (list of str): Rendered messages, in the order they are sent.
+
+    Returns:
+        str: 16 byte digest.
+    """
+    digest = hashlib.md5()
+    for payload in payloads:
+        digest.update(struct.pack(">I", len(payload)))
+        digest.update(payload)
+    return digest.digest()
+
+
+class DigestSet(object):
+    """
+    In-memory set of the test cases sent so far, for Session(dedupe=...). Exact, but lasts one campaign.
+
+    Attributes:
+        num_duplicates (int): Number of add() calls that found the digest already there.
+    """
+
+    def __init__(self):
+        self.num_duplicates = 0
+
+        self._lock = threading.Lock()
+        self._digests = set()
+
+    def add(self, digest):
+        """
+        Add the digest of a test case.
+
+        Args:
+            digest (str): Result of payload_digest().
+
+        Returns:
+            bool: True if the digest is new, False if it was added before.
+        """
+        with self._lock:
+            if digest in self._digests:
+                self.num_duplicates += 1
+                return False
+            self._digests.add(digest)
+            return True
+
+    def save(self):
+        """
+        Nothing to save; the set is not persisted.
+        """
+        pass
+
+    def __contains__(self, digest):
+        with self._lock:
+            return digest in self._digests
+
+    def __len__(self):
+        with self._lock:
+            return len(self._digests)
+
+
+class BloomFilter(object):
+    """
+    Bloom filter of the test cases sent so far, for Session(dedupe=...), that can be saved and used across campaigns.
+
+    Its size is fixed by capacity and error_rate: as long as it holds at most capacity digests, a new digest is taken
+    for a duplicate (and its test case skipped) with probability at most error_rate. Digests are never missed.
+
+    Args:
+        filename (str): File to load the filter from and save() it to. A loaded filter keeps the capacity and error
+            rate it was made with. Default None (don't persist).
+        capacity (int): Number of digests to size the filter for. Default 1000000 (about 1.7 MiB).
+        error_rate (float): False positive rate at capacity. Default 0.001.
+
+    Attributes:
+        num_duplicates (int): Number of add() calls that found the digest (probably) already there.
+    """
+
+    def __init__(self, filename=None, capacity=1000000, error_rate=0.001):
+        self.filename = filename
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_duplicates = 0
+
+        self._lock = threading.Lock()
+        self._count = 0
+
+        if filename is not None and os.path.exists(filename):
+            self.load()
+        else:
+            self._num_bits = int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+            self._num_hashes = max(1, int(round(self._num_bits / float(capacity) * math.log(2))))
+            self._bits = bytearray((self._num_bits + 7) // 8)
+
+    def add(self, digest):
+        """
+        Add the digest of a test case.
+
+        Args:
+            digest (str): Result of payload_digest().
+
+        Returns:
+            bool: True if the digest is new, False if it was (probably) added before.
+        """
+        with self._lock:
+            new = False
+            for byte, bit in self._bit_positions(digest):
+                if not self._bits[byte] >> bit & 1:
+                    self._bits[byte] |= 1 << bit
+                    new = True
+
+            if new:
+                self._count += 1
+            else:
+                self.num_duplicates += 1
+            return new
+
+    def _bit_positions(self, digest):
+        """
+        Returns:
+            list of tuple: (byte, bit) of each bit of the filter standing for a digest.
+        """
+        # double hashing: bit i is h1 + i * h2, with h1 and h2 taken from a hash of the digest.
+        h1, h2 = struct.unpack(">QQ", hashlib.md5(digest).digest())
+        h2 |= 1
+        return [divmod((h1 + i * h2) % self._num_bits, 8) for i in range(self._num_hashes)]
+
+    def load(self):
+        """
+        Replace the filter with the one saved in self.filename.
+        """
+        with open(self.filename, "rb") as f:
+            data = cPickle.loads(zlib.decompress(f.read()))
+
+        with self._lock:
+            self.capacity = data["capacity"]
+            self.error_rate = data["error_rate"]
+            self._num_bits = data["num_bits"]
+            self._num_hashes = data["num_hashes"]
+            self._bits = bytearray(data["bits"])
+            self._count = data["count"]
+
+    def save(self):
+        """
+        Save the filter to self.filename.
+        """
+        if self.filename is None:
+            return
+
+        with self._lock:
+            data = cPickle.dumps({
+                "capacity": self.capacity,
+                "error_rate": self.error_rate,
+                "num_bits": self._num_bits,
+                "num_hashes": self._num_hashes,
+                "bits": str(self._bits),
+                "count": self._count,
+            }, protocol=2)
+
+        helpers.write_file_atomically(self.filename, zlib.compress(data))
+
+    def __contains__(self, digest):
+        with self._lock:
+            return all(self._bits[byte] >> bit & 1 for byte, bit in self._bit_positions(digest))
+
+    def __len__(self):
+        """
+        Number of digests added that were new.
+        """
+        with self._lock:
+            return self._count
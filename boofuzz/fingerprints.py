@@ -0,0 +1,111 @@
+import collections
+import re
+import zlib
+
+_STATUS_CODE = re.compile(r"\b\d{3}\b")
+
+
+def status_token(data):
+    """
+    First status code (three digit number) on the first line of a response, or else its first word.
+
+    Args:
+        data (str): Response.
+
+    Returns:
+        str: Status token, at most 16 characters. "" for an empty response.
+    """
+    first_line = data.split("\n", 1)[0][:64]
+    match = _STATUS_CODE.search(first_line)
+    if match:
+        return match.group(0)
+
+    words = first_line.split()
+    if words:
+        return words[0][:16]
+    return ""
+
+
+def simhash(data, shingle_size=4, max_len=1024):
+    """
+    64-bit similarity hash of a response: responses that share most of their byte shingles differ in few bits.
+
+    Args:
+        data (str): Response.
+        shingle_size (int): Bytes per shingle. Default 4.
+        max_len (int): Only the first max_len bytes are hashed. Default 1024.
+
+    Returns:
+        int: The hash.
+    """
+    data = data[:max_len]
+    shingle_hashes = []
+    for i in range(max(1, len(data) - shingle_size + 1)):
+        shingle = data[i:i + shingle_size]
+        shingle_hashes.append((zlib.crc32(shingle) & 0xffffffff) | (zlib.crc32(shingle, 0x5bd1e995) & 0xffffffff) << 32)
+
+    # count the shingle hashes with each bit set, one byte of the hashes at a time.
+    bit_counts = [0] * 64
+    for byte_number in range(8):
+        histogram = collections.Counter(shingle_hash >> (8 * byte_number) & 0xff for shingle_hash in shingle_hashes)
+        for value, count in histogram.items():
+            for bit in range(8):
+                if value >> bit & 1:
+                    bit_counts[8 * byte_number + bit] += count
+
+    return sum(1 << bit for bit in range(64) if 2 * bit_counts[bit] > len(shingle_hashes))
+
+
+def fingerprint(data, failed=False):
+    """
+    Cheap fingerprint of a test case outcome.
+
+    Args:
+        data (str): Response, e.g. session.last_recv. None counts as empty.
+        failed (bool): Whether the test case failed.
+
+    Returns:
+        tuple: (failed, status token, length bucket, simhash). The length bucket is the bit length of the response
+            length, so lengths within a factor of two share a bucket.
+    """
+    if data is None:
+        data = ""
+    return bool(failed), status_token(data), len(data).bit_length(), simhash(data)
+
+
+class ResponseClassIndex(object):
+    """
+    Groups fingerprints into response classes and tells which fingerprints start a new class.
+
+    Fingerprints are in the same class if failure status, status token and length bucket match and their simhashes
+    differ in at most max_distance bits.
+
+    Args:
+        max_distance (int): Maximum Hamming distance between simhashes of the same class. Default 12.
+    """
+
+    def __init__(self, max_distance=12):
+        self.max_distance = max_distance
+        self._classes = {}  # (failed, status token, length bucket) -> list of simhashes
+
+    def add(self, response_fingerprint):
+        """
+        Add a fingerprint.
+
+        Args:
+            response_fingerprint (tuple): Result of fingerprint().
+
+        Returns:
+            bool: True if the fingerprint starts a new response class.
+        """
+        key, response_simhash = response_fingerprint[:-1], response_fingerprint[-1]
+        simhashes = self._classes.setdefault(key, [])
+        for known in simhashes:
+            if bin(known ^ response_simhash).count("1") <= self.max_distance:
+                return False
+
+        simhashes.append(response_simhash)
+        return True
+
+    def __len__(self):
+        return sum(len(simhashes) for simhashes in self._classes.values())
@@ -1,3 +1,5 @@
+import threading
+
 from ifuzz_logger import IFuzzLogger
 
 
@@ -16,6 +18,7 @@ class FuzzLogger(IFuzzLogger):
         if fuzz_loggers is None:
             fuzz_loggers = []
         self._fuzz_loggers = fuzz_loggers
+        self._lock = threading.Lock()
 
         self._cur_test_case_id = ''
         self.failed_test_cases = {}
@@ -27,6 +30,23 @@ class FuzzLogger(IFuzzLogger):
         for fuzz_logger in self._fuzz_loggers:
             fuzz_logger.open_test_step(description=description)
 
+    @property
+    def current_test_case_id(self):
+        """ID of the test case most recently opened with open_test_case()."""
+        return self._cur_test_case_id
+
+    def worker_logger(self, test_case_id=None):
+        """Create a WorkerFuzzLogger that writes to this logger's backends and summary data.
+
+        :param test_case_id: Test case already opened in this logger to log to, if the worker handles only part of
+                             one test case. Default None (the worker opens its own test cases).
+        :type test_case_id: str
+
+        :return: New logger for one worker.
+        :rtype: WorkerFuzzLogger
+        """
+        return WorkerFuzzLogger(parent=self, test_case_id=test_case_id)
+
     def log_error(self, description):
         if self._cur_test_case_id not in self.error_test_cases:
             self.error_test_cases[self._cur_test_case_id] = []
@@ -87,3 +107,74 @@ class FuzzLogger(IFuzzLogger):
             summary += "{0}".format('\n'.join(map(str, self.error_test_cases.iterkeys())))
 
         return summary
+
+
+class WorkerFuzzLogger(FuzzLogger):
+    """
+    FuzzLogger for one of several workers running test cases at the same time.
+
+    Summary failure and error data is shared with the parent FuzzLogger. Calls to the backends are buffered and
+    written to the parent's backends by flush(), all at once and under the parent's lock, so that the output of test
+    cases running in parallel does not interleave.
+
+    Args:
+        parent (FuzzLogger): Logger whose backends and summary data to use.
+        test_case_id (str): Test case already opened in parent to log to. Default None.
+    """
+
+    def __init__(self, parent, test_case_id=None):
+        super(WorkerFuzzLogger, self).__init__(fuzz_loggers=[])
+        self._parent = parent
+        self._buffer = []
+        if test_case_id is not None:
+            self._cur_test_case_id = test_case_id
+
+        self.failures = []  # descriptions logged with log_fail() through this logger
+
+        self.failed_test_cases = parent.failed_test_cases
+        self.error_test_cases = parent.error_test_cases
+        self.passed_test_cases = parent.passed_test_cases
+        self.all_test_cases = parent.all_test_cases
+
+    def flush(self):
+        """Write buffered log data to the parent's backends."""
+        buffered, self._buffer = self._buffer, []
+        with self._parent._lock:
+            for method_name, kwargs in buffered:
+                for fuzz_logger in self._parent._fuzz_loggers:
+                    getattr(fuzz_logger, method_name)(**kwargs)
+
+    def open_test_step(self, description):
+        self._buffer.append(("open_test_step", {"description": description}))
+
+    def log_error(self, description):
+        with self._parent._lock:
+            super(WorkerFuzzLogger, self).log_error(description=description)
+        self._buffer.append(("log_error", {"description": description}))
+
+    def log_fail(self, description=""):
+        with self._parent._lock:
+            super(WorkerFuzzLogger, self).log_fail(description=description)
+        self.failures.append(description)
+        self._buffer.append(("log_fail", {"description": description}))
+
+    def log_info(self, description):
+        self._buffer.append(("log_info", {"description": description}))
+
+    def log_recv(self, data):
+        self._buffer.append(("log_recv", {"data": data}))
+
+    def log_pass(self, description=""):
+        with self._parent._lock:
+            super(WorkerFuzzLogger, self).log_pass(description=description)
+        self._buffer.append(("log_pass", {"description": description}))
+
+    def log_check(self, description):
+        self._buffer.append(("log_check", {"description": description}))
+
+    def open_test_case(self, test_case_id):
+        super(WorkerFuzzLogger, self).open_test_case(test_case_id=test_case_id)
+        self._buffer.append(("open_test_case", {"test_case_id": test_case_id}))
+
+    def log_send(self, data):
+        self._buffer.append(("log_send", {"data": data}))
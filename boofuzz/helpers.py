@@ -1,6 +1,7 @@
 from __future__ import absolute_import
 from __future__ import unicode_literals
 import ctypes
+import os
 import platform
 import re
 import signal
@@ -254,6 +255,30 @@ def hex_str(s):
     return ' '.join("{:02x}".format(ord(b)) for b in s)
 
 
+def write_file_atomically(filename, data):
+    """
+    Writes data to filename through a temporary file, so that a crash while writing doesn't leave a partial file.
+
+    Implementation notes:
+     - On Windows, os.rename() can't replace an existing file under Python 2, so the old file is removed right
+       before the temporary file is renamed.
+
+    :param filename: File to write.
+    :type filename: str
+    :param data: Data to write.
+    :type data: str
+
+    :return: None
+    :rtype: None
+    """
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, "wb") as f:
+        f.write(data)
+    if os.name == "nt" and os.path.exists(filename):
+        os.remove(filename)
+    os.rename(temp_filename, filename)
+
+
 def pause_for_signal():
     """
     Pauses the current thread in a way that can still receive signals like SIGINT from Ctrl+C.
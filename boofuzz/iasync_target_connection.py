@@ -0,0 +1,55 @@
+import abc
+
+
+class IAsyncTargetConnection(object):
+    """
+    Interface for asynchronous connections to fuzzing targets, used by Session.fuzz_concurrent().
+
+    Same semantics as ITargetConnection, except that each method returns a tornado Future (e.g. by being a
+    tornado.gen.coroutine) instead of blocking. Each connection carries one test case at a time; fuzz_concurrent()
+    creates one connection per test case in flight, and opens and closes it for every test case.
+    """
+    __metaclass__ = abc.ABCMeta
+
+    @abc.abstractmethod
+    def close(self):
+        """
+        Close connection.
+
+        :return: Future resolving to None.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def open(self):
+        """
+        Opens connection to the target. Make sure to call close!
+
+        :raise sex.BoofuzzTargetConnectionFailedError: Through the Future, if the target can't be reached.
+
+        :return: Future resolving to None.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def recv(self, max_bytes):
+        """
+        Receive up to max_bytes data.
+
+        :param max_bytes: Maximum number of bytes to receive.
+        :type max_bytes: int
+
+        :return: Future resolving to the received data. bytes('') if no data is received.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def send(self, data):
+        """
+        Send data to the target.
+
+        :param data: Data to send.
+
+        :return: Future resolving to the number of bytes actually sent.
+        """
+        raise NotImplementedError
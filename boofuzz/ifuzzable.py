@@ -72,6 +72,32 @@ class IFuzzable(object):
         """
         return
 
+    @abc.abstractmethod
+    def seek(self, mutant_index):
+        """Jump straight to a mutation without replaying the ones before it.
+
+        Puts the element in the state it would be in after reset() followed by
+        mutant_index calls to mutate(), so that render() and further calls to
+        mutate() behave exactly as if the mutations had been replayed.
+
+        Args:
+            mutant_index (int): 0 => original value. 1 => first mutation.
+                num_mutations() => last mutation.
+
+        Raises:
+            IndexError: If mutant_index is outside [0, num_mutations()].
+        """
+        return
+
+    @abc.abstractmethod
+    def exhaust(self):
+        """Skip all remaining mutations of this element.
+
+        Afterwards mutate() returns False and render() gives the original
+        value, the same state mutate() leaves behind on completion.
+        """
+        return
+
     @abc.abstractmethod
     def num_mutations(self):
         """Return the total number of mutations for this element.
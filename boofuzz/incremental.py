@@ -0,0 +1,256 @@
+import bisect
+import cPickle
+import hashlib
+import os
+import threading
+import zlib
+
+from . import helpers
+from . import primitives
+from . import schedulers
+
+
+def fingerprint(mutation_range):
+    """
+    Stable fingerprint of the primitive mutated in a MutationRange, the same in every campaign as long as its
+    definition doesn't change.
+
+    It covers the node path and primitive name (the range name), the primitive type, its original value and its fuzz
+    library. RandomData has no fixed library; its length range, step and number of mutations stand in for it. Items
+    other than primitives, e.g. combinations, are covered by their number of mutations.
+
+    Args:
+        mutation_range (schedulers.MutationRange): Range of the primitive.
+
+    Returns:
+        str: Hex digest.
+    """
+    mutant = mutation_range.mutant
+
+    digest = hashlib.md5()
+    for part in (mutation_range.name, type(mutant).__name__, mutant.original_value, mutant.num_mutations()):
+        digest.update(repr(part))
+
+    if isinstance(mutant, primitives.RandomData):
+        digest.update(repr((mutant.min_length, mutant.max_length, mutant.step)))
+    elif isinstance(mutant, primitives.BasePrimitive):
+        for index in xrange(mutant.num_mutations()):
+            digest.update(repr(mutant._library_value(index)))
+
+    return digest.hexdigest()
+
+
+class _IndexRanges(object):
+    """
+    Set of non-negative integers, kept as sorted, disjoint [start, end) ranges.
+    """
+
+    def __init__(self, ranges=()):
+        self.starts = [start for start, _ in ranges]
+        self.ends = [end for _, end in ranges]
+
+    def add(self, index):
+        i = bisect.bisect_right(self.starts, index) - 1
+        if i >= 0 and index < self.ends[i]:
+            return
+
+        joins_left = i >= 0 and self.ends[i] == index
+        joins_right = i + 1 < len(self.starts) and self.starts[i + 1] == index + 1
+        if joins_left and joins_right:
+            self.ends[i] = self.ends[i + 1]
+            del self.starts[i + 1]
+            del self.ends[i + 1]
+        elif joins_left:
+            self.ends[i] = index + 1
+        elif joins_right:
+            self.starts[i + 1] = index
+        else:
+            self.starts.insert(i + 1, index)
+            self.ends.insert(i + 1, index + 1)
+
+    def ranges(self):
+        return zip(self.starts, self.ends)
+
+    def __contains__(self, index):
+        i = bisect.bisect_right(self.starts, index) - 1
+        return i >= 0 and index < self.ends[i]
+
+    def __len__(self):
+        return sum(end - start for start, end in zip(self.starts, self.ends))
+
+
+class CampaignHistory(object):
+    """
+    Persistent record of which fuzz library entries of which primitives were fuzzed, across campaigns.
+
+    Primitives are identified by fingerprint(), so a primitive keeps its history while the definitions around it
+    change, and starts over when its own definition does. For each fingerprint, the positions in the fuzz library that
+    ran are kept as ranges.
+
+    CampaignHistory is thread-safe.
+
+    Args:
+        filename (str): File to load the history from and save() it to. Default None (don't persist).
+    """
+
+    def __init__(self, filename=None):
+        self.filename = filename
+
+        self._lock = threading.Lock()
+        self._covered = {}  # fingerprint -> _IndexRanges of library positions
+
+        self.load()
+
+    def add(self, primitive_fingerprint, library_index):
+        """
+        Record that a library entry of a primitive was fuzzed.
+
+        Args:
+            primitive_fingerprint (str): Result of fingerprint().
+            library_index (int): Zero-based position of the entry in the fuzz library.
+        """
+        with self._lock:
+            self._covered.setdefault(primitive_fingerprint, _IndexRanges()).add(library_index)
+
+    def is_covered(self, primitive_fingerprint, library_index):
+        """
+        Returns:
+            bool: Whether a library entry of a primitive was fuzzed.
+        """
+        with self._lock:
+            covered = self._covered.get(primitive_fingerprint)
+            return covered is not None and library_index in covered
+
+    def covered(self, primitive_fingerprint):
+        """
+        Returns:
+            list of tuple: [start, end) ranges of the library positions of a primitive that were fuzzed.
+        """
+        with self._lock:
+            covered = self._covered.get(primitive_fingerprint)
+            return covered.ranges() if covered is not None else []
+
+    def load(self):
+        """
+        Load the history from self.filename, if it exists, adding it to what is already recorded.
+        """
+        if self.filename is None or not os.path.exists(self.filename):
+            return
+
+        with open(self.filename, "rb") as f:
+            data = cPickle.loads(zlib.decompress(f.read()))
+
+        with self._lock:
+            for primitive_fingerprint, ranges in data.items():
+                if primitive_fingerprint not in self._covered:
+                    self._covered[primitive_fingerprint] = _IndexRanges(ranges)
+                    continue
+
+                covered = self._covered[primitive_fingerprint]
+                for start, end in ranges:
+                    for library_index in xrange(start, end):
+                        covered.add(library_index)
+
+    def save(self):
+        """
+        Save the history to self.filename.
+        """
+        if self.filename is None:
+            return
+
+        with self._lock:
+            data = cPickle.dumps(dict((primitive_fingerprint, covered.ranges())
+                                      for primitive_fingerprint, covered in self._covered.items()), protocol=2)
+
+        helpers.write_file_atomically(self.filename, zlib.compress(data))
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(covered) for covered in self._covered.values())
+
+
+class IncrementalScheduler(schedulers.Scheduler):
+    """
+    Runs only the test cases a CampaignHistory has no record of, i.e. those of new or changed primitives and those
+    an earlier campaign didn't get to, in the order of another scheduler. Every test case that runs is added to the
+    history, which is saved when fuzzing stops.
+
+    An interrupted campaign resumes by running it again with the same history; don't resume it with a session file
+    as well, since the saved skip count refers to the schedule before the history grew.
+
+    Test cases skipped after a primitive reached the crash threshold are not recorded, so they run next time.
+
+    Args:
+        history (CampaignHistory): Test cases that already ran.
+        scheduler (schedulers.Scheduler): Order to run test cases in. Default RoundRobinScheduler.
+
+    Attributes:
+        num_skipped (int): Number of test cases skipped so far because the history covers them.
+    """
+
+    def __init__(self, history, scheduler=None):
+        super(IncrementalScheduler, self).__init__()
+        if scheduler is None:
+            scheduler = schedulers.RoundRobinScheduler()
+        self.history = history
+        self.scheduler = scheduler
+        self.num_skipped = 0
+
+        self._first_indices = []
+        self._fingerprints = []
+
+    def start(self, ranges):
+        super(IncrementalScheduler, self).start(ranges)
+        self.scheduler.start(ranges)
+        self.num_skipped = 0
+
+        self._first_indices = [mutation_range.first_index for mutation_range in self.ranges]
+        self._fingerprints = []
+        seen = {}
+        for mutation_range in self.ranges:
+            # a primitive inside a grouped block has a range per group value; tell them apart by occurrence.
+            primitive_fingerprint = fingerprint(mutation_range)
+            seen[primitive_fingerprint] = seen.get(primitive_fingerprint, 0) + 1
+            if seen[primitive_fingerprint] > 1:
+                primitive_fingerprint += "#{0}".format(seen[primitive_fingerprint])
+            self._fingerprints.append(primitive_fingerprint)
+
+    def next_index(self):
+        index = self.scheduler.next_index()
+        while index is not None and self.history.is_covered(*self._library_entry(index)):
+            self.num_skipped += 1
+            index = self.scheduler.next_index()
+        return index
+
+    def exhaust(self, index):
+        self.scheduler.exhaust(index)
+
+    def skip(self, count, state=None):
+        # the state of self.scheduler counts the test cases this scheduler left out as well.
+        if state is None:
+            super(IncrementalScheduler, self).skip(count)
+        else:
+            self.scheduler.skip(count, state=state)
+
+    def state(self):
+        return self.scheduler.state()
+
+    def feedback(self, index, failed, response=None, new_edges=0):
+        self.history.add(*self._library_entry(index))
+        self.scheduler.feedback(index, failed, response=response, new_edges=new_edges)
+
+    def stop(self):
+        self.scheduler.stop()
+        self.history.save()
+
+    def _library_entry(self, index):
+        """
+        Returns:
+            tuple: Fingerprint of the primitive of a test case, and position in its library of the entry under test.
+        """
+        range_number = bisect.bisect_right(self._first_indices, index) - 1
+        mutation_range = self.ranges[range_number]
+        position = index - mutation_range.first_index
+        if isinstance(mutation_range.mutant, primitives.BasePrimitive):
+            position = mutation_range.mutant._library_index(position)
+        return self._fingerprints[range_number], position
@@ -50,3 +50,15 @@ class ITargetConnection(object):
         :return: Number of bytes actually sent.
         """
         raise NotImplementedError
+
+    def set_recv_timeout(self, timeout):
+        """
+        Set how long recv() waits for data, overriding the connection's own timeout. Connections without a receive
+        timeout ignore this.
+
+        :param timeout: Timeout in seconds, or None to go back to the connection's own timeout.
+        :type timeout: float
+
+        :return: None
+        """
+        pass
@@ -0,0 +1,86 @@
+import collections
+import math
+import threading
+
+
+class LatencyTracker(object):
+    """
+    Learns how long each request takes to answer, for Session(latency=...), so that recv() waits only a little longer
+    than a normal answer takes instead of the connection's full timeout.
+
+    Latencies are measured on unmutated messages: the session sends each request with its original values when fuzzing
+    starts, then keeps measuring requests sent along the way to the one being fuzzed. Once a request has enough
+    samples, its receive timeout is the chosen percentile of its latencies times factor, but at least floor. A fuzzed
+    request that answers slower than outlier_factor / factor of its timeout is an outlier.
+
+    LatencyTracker is thread-safe.
+
+    Args:
+        factor (float): Receive timeout as a multiple of the percentile latency. Default 5.
+        percentile (float): Percentile of the latencies to base timeouts on. Default 99.
+        outlier_factor (float): Latency of a fuzzed request, as a multiple of the percentile latency (or of
+            floor / factor, whichever is more), above which it is an outlier. Default 2.
+        baseline_samples (int): Number of times each request is sent when fuzzing starts. Default 5.
+        minimum_samples (int): Samples a request needs before its timeout is used. Default 5.
+        window (int): Number of most recent samples kept per request. Default 1000.
+        floor (float): Shortest receive timeout, in seconds. Default 0.01.
+    """
+
+    def __init__(self, factor=5, percentile=99, outlier_factor=2, baseline_samples=5, minimum_samples=5, window=1000,
+                 floor=0.01):
+        self.factor = factor
+        self.percentile = percentile
+        self.outlier_factor = outlier_factor
+        self.baseline_samples = baseline_samples
+        self.minimum_samples = minimum_samples
+        self.window = window
+        self.floor = floor
+
+        self._lock = threading.Lock()
+        self._samples = {}  # request name -> deque of latencies
+        self._percentiles = {}  # request name -> cached percentile latency
+
+    def record(self, name, latency):
+        """
+        Add a latency sample of an unmutated request.
+
+        Args:
+            name (str): Name of the request.
+            latency (float): Seconds from sending the request to receiving its answer.
+        """
+        with self._lock:
+            self._samples.setdefault(name, collections.deque(maxlen=self.window)).append(latency)
+            self._percentiles.pop(name, None)
+
+    def percentile_latency(self, name):
+        """
+        Returns:
+            float: The percentile latency of a request, or None if it has too few samples.
+        """
+        with self._lock:
+            if name not in self._percentiles:
+                samples = sorted(self._samples.get(name, ()))
+                if len(samples) < self.minimum_samples:
+                    return None
+                # nearest-rank percentile.
+                rank = int(math.ceil(self.percentile / 100.0 * len(samples)))
+                self._percentiles[name] = samples[max(rank, 1) - 1]
+            return self._percentiles[name]
+
+    def timeout(self, name):
+        """
+        Returns:
+            float: Receive timeout for a request, or None to use the connection's own timeout.
+        """
+        latency = self.percentile_latency(name)
+        if latency is None:
+            return None
+        return max(latency * self.factor, self.floor)
+
+    def is_outlier(self, name, latency):
+        """
+        Returns:
+            bool: Whether a fuzzed request answered unusually slowly.
+        """
+        timeout = self.timeout(name)
+        return timeout is not None and latency > timeout * self.outlier_factor / self.factor
@@ -0,0 +1,208 @@
+import bisect
+import threading
+import time
+
+import attr
+
+
+@attr.s
+class Lease(object):
+    """
+    A range of test case indices handed out to one worker.
+
+    start is inclusive, stop is exclusive.
+    """
+    id = attr.ib()
+    start = attr.ib()
+    stop = attr.ib()
+    owner = attr.ib(default=None)
+    expires = attr.ib(default=None)
+
+
+class LeaseTable(object):
+    """
+    Hands out ranges of test case indices to workers and keeps track of which indices are done.
+
+    Leases that are released, or that expire before they are completed, are handed out again. Indices can also be
+    marked done without a lease with skip(), e.g. when the crash threshold exhausts a primitive.
+
+    LeaseTable is thread-safe and can be pickled; leases that were active when it was pickled are handed out again
+    after unpickling, under new ids, so a late complete() or release() of a lease from before never matches them.
+
+    Args:
+        first_index (int): First test case index to hand out.
+        last_index (int): Last test case index to hand out (inclusive).
+        lease_size (int): Maximum number of test cases per lease. Default 1.
+        lease_timeout (float): Seconds after which an uncompleted lease is handed out again. Default None (never).
+    """
+
+    def __init__(self, first_index, last_index, lease_size=1, lease_timeout=None):
+        self.first_index = first_index
+        self.last_index = last_index
+        self.lease_size = lease_size
+        self.lease_timeout = lease_timeout
+
+        self._lock = threading.RLock()
+        self._next_lease_id = 1
+        self._next_index = first_index
+        self._active = {}  # lease id -> Lease
+        self._reissue = []  # (start, stop) ranges to hand out before self._next_index
+        self._done_starts = []  # sorted, disjoint [start, stop) ranges of completed indices
+        self._done_stops = []
+
+    def lease(self, owner=None):
+        """
+        Lease the next range of test cases.
+
+        Args:
+            owner: Arbitrary identifier of the worker taking the lease.
+
+        Returns:
+            Lease: The new lease, or None if there is nothing left to hand out right now. Check done to tell
+                whether the campaign is finished or other workers still hold leases.
+        """
+        with self._lock:
+            self._expire_leases()
+
+            while self._reissue:
+                start, stop = self._reissue.pop(0)
+                start, stop = self._first_pending_range(start, stop)
+                if start is not None:
+                    return self._new_lease(start, stop, owner)
+
+            start, stop = self._first_pending_range(self._next_index, self.last_index + 1)
+            if start is None:
+                self._next_index = self.last_index + 1
+                return None
+
+            stop = min(stop, start + self.lease_size)
+            self._next_index = stop
+            return self._new_lease(start, stop, owner)
+
+    def complete(self, lease_id):
+        """
+        Mark every test case of a lease done.
+
+        Args:
+            lease_id (int): Lease.id of the completed lease.
+        """
+        with self._lock:
+            lease = self._active.pop(lease_id, None)
+            if lease is not None:
+                self._mark_done(lease.start, lease.stop)
+
+    def release(self, lease_id):
+        """
+        Give a lease back without completing it, so it can be handed out again.
+
+        Args:
+            lease_id (int): Lease.id of the released lease.
+        """
+        with self._lock:
+            lease = self._active.pop(lease_id, None)
+            if lease is not None:
+                self._reissue.append((lease.start, lease.stop))
+
+    def skip(self, start, stop):
+        """
+        Mark test cases done outside of any lease, e.g. ones skipped by the crash threshold or run elsewhere.
+
+        Args:
+            start (int): First test case index to skip.
+            stop (int): Index after the last test case to skip.
+        """
+        with self._lock:
+            self._mark_done(max(start, self.first_index), min(stop, self.last_index + 1))
+
+    def is_done(self, index):
+        """
+        Returns:
+            bool: True if test case index was completed or skipped.
+        """
+        with self._lock:
+            position = bisect.bisect_right(self._done_starts, index) - 1
+            return position >= 0 and index < self._done_stops[position]
+
+    @property
+    def done(self):
+        """True once every test case is completed or skipped."""
+        return self.num_done == self.last_index - self.first_index + 1
+
+    @property
+    def num_done(self):
+        """Number of test cases completed or skipped."""
+        with self._lock:
+            return sum(stop - start for start, stop in zip(self._done_starts, self._done_stops))
+
+    @property
+    def watermark(self):
+        """Highest index such that it and every index before it are done; first_index - 1 if there is none."""
+        with self._lock:
+            if self._done_starts and self._done_starts[0] == self.first_index:
+                return self._done_stops[0] - 1
+            return self.first_index - 1
+
+    @property
+    def active_leases(self):
+        """List of leases handed out and not yet completed or released."""
+        with self._lock:
+            return sorted(self._active.values(), key=lambda lease: lease.start)
+
+    def _new_lease(self, start, stop, owner):
+        expires = None
+        if self.lease_timeout is not None:
+            expires = time.time() + self.lease_timeout
+
+        lease = Lease(id=self._next_lease_id, start=start, stop=stop, owner=owner, expires=expires)
+        self._next_lease_id += 1
+        self._active[lease.id] = lease
+        return lease
+
+    def _expire_leases(self):
+        now = time.time()
+        for lease in list(self._active.values()):
+            if lease.expires is not None and lease.expires <= now:
+                self.release(lease.id)
+
+    def _first_pending_range(self, start, stop):
+        """Return the first sub-range of [start, stop) that is not done, or (None, None)."""
+        while start < stop:
+            position = bisect.bisect_right(self._done_starts, start) - 1
+            if position >= 0 and start < self._done_stops[position]:
+                # start is done, jump past this done range.
+                start = self._done_stops[position]
+                continue
+
+            if position + 1 < len(self._done_starts):
+                stop = min(stop, self._done_starts[position + 1])
+            return start, stop
+
+        return None, None
+
+    def _mark_done(self, start, stop):
+        if start >= stop:
+            return
+
+        # merge with every range that overlaps or touches [start, stop).
+        first = bisect.bisect_left(self._done_stops, start)
+        last = bisect.bisect_right(self._done_starts, stop)
+        if first < last:
+            start = min(start, self._done_starts[first])
+            stop = max(stop, self._done_stops[last - 1])
+
+        self._done_starts[first:last] = [start]
+        self._done_stops[first:last] = [stop]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+        # leases that were out when the table was saved are lost; hand them out again.
+        for lease in self._active.values():
+            self._reissue.append((lease.start, lease.stop))
+        self._active = {}
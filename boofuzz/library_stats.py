@@ -0,0 +1,149 @@
+import cPickle
+import hashlib
+import os
+import threading
+import zlib
+
+from . import helpers
+from . import primitives
+
+
+def entry_hash(value):
+    """
+    Returns:
+        str: Hash identifying a fuzz library value, the same in every campaign.
+    """
+    return hashlib.md5(repr(value)).hexdigest()[:16]
+
+
+class LibraryStats(object):
+    """
+    Persistent statistics of how often each fuzz library entry made a test case fail, across campaigns.
+
+    Entries are keyed by (primitive type name, entry_hash() of the library value), so that results carry over between
+    campaigns, protocols and primitives of the same type. For each entry the number of test cases ("runs"), failures
+    ("failures"), crashes detected by a process monitor ("crashes") and test cases where the target did not answer
+    ("timeouts") are counted.
+
+    Pass it to Session(library_stats=...) to record every test case; call sort_libraries() on requests before fuzzing to
+    try the entries with the highest historical yield first.
+
+    LibraryStats is thread-safe.
+
+    Args:
+        filename (str): File to load statistics from and save() them to. Default None (don't persist).
+        prior (float): Yield assumed for entries without statistics, in failures per test case. Default 0.5, so
+            untried entries go after the ones that failed often and before the ones that never failed.
+    """
+
+    def __init__(self, filename=None, prior=0.5):
+        self.filename = filename
+        self.prior = prior
+
+        self._lock = threading.Lock()
+        self._counts = {}  # (type name, entry hash) -> {"runs": int, "failures": int, "crashes": int, "timeouts": int}
+
+        self.load()
+
+    def record(self, primitive, value, failed=False, crashed=False, timed_out=False):
+        """
+        Count one test case of a library entry.
+
+        Args:
+            primitive (BasePrimitive): Primitive mutated in the test case.
+            value: Library value of the primitive in the test case.
+            failed (bool): Whether the test case failed.
+            crashed (bool): Whether a process monitor detected a crash.
+            timed_out (bool): Whether the target did not answer.
+        """
+        key = (type(primitive).__name__, entry_hash(value))
+        with self._lock:
+            counts = self._counts.setdefault(key, {"runs": 0, "failures": 0, "crashes": 0, "timeouts": 0})
+            counts["runs"] += 1
+            counts["failures"] += bool(failed)
+            counts["crashes"] += bool(crashed)
+            counts["timeouts"] += bool(timed_out)
+
+    def counts(self, primitive, value):
+        """
+        Returns:
+            dict: Copy of the counts of a library entry; all zero if it has none.
+        """
+        key = (type(primitive).__name__, entry_hash(value))
+        with self._lock:
+            return dict(self._counts.get(key, {"runs": 0, "failures": 0, "crashes": 0, "timeouts": 0}))
+
+    def entry_yield(self, primitive, value, value_hash=None):
+        """
+        Historical yield of a library entry: failures per test case, with crashes counting twice and prior counting as
+        one test case's worth of evidence.
+
+        Args:
+            primitive (BasePrimitive): Primitive of the entry.
+            value: Library value.
+            value_hash (str): entry_hash(value), if already known.
+
+        Returns:
+            float: The yield.
+        """
+        if value_hash is None:
+            value_hash = entry_hash(value)
+        with self._lock:
+            counts = self._counts.get((type(primitive).__name__, value_hash),
+                                      {"runs": 0, "failures": 0, "crashes": 0})
+        return (counts["failures"] + counts["crashes"] + self.prior) / float(counts["runs"] + 1)
+
+    def sort_libraries(self, request):
+        """
+        Make every primitive of a request mutate through its library in order of decreasing historical yield; see
+        BasePrimitive.sort_library(). The number of test cases stays the same, but a campaign must be resumed with the
+        same order, i.e. with the statistics it started with.
+
+        RandomData is left alone; its values are not repeatable.
+
+        Args:
+            request (Request): Request whose primitives to sort.
+        """
+        # String instances share most of their library; hash each value once.
+        hashes = {}  # id(value) -> (value, hash); keeps value alive so its id isn't reused.
+
+        def key(primitive, value):
+            if id(value) not in hashes:
+                hashes[id(value)] = (value, entry_hash(value))
+            return -self.entry_yield(primitive, value, value_hash=hashes[id(value)][1])
+
+        for item in request.walk():
+            if isinstance(item, primitives.BasePrimitive) and not isinstance(item, primitives.RandomData):
+                item.sort_library(key=lambda value, primitive=item: key(primitive, value))
+
+    def load(self):
+        """
+        Load statistics from self.filename, if it exists, adding them to the ones already counted.
+        """
+        if self.filename is None or not os.path.exists(self.filename):
+            return
+
+        with open(self.filename, "rb") as f:
+            data = cPickle.loads(zlib.decompress(f.read()))
+
+        with self._lock:
+            for key, counts in data.items():
+                own = self._counts.setdefault(key, {"runs": 0, "failures": 0, "crashes": 0, "timeouts": 0})
+                for name, count in counts.items():
+                    own[name] += count
+
+    def save(self):
+        """
+        Save statistics to self.filename.
+        """
+        if self.filename is None:
+            return
+
+        with self._lock:
+            data = cPickle.dumps(self._counts, protocol=2)
+
+        helpers.write_file_atomically(self.filename, zlib.compress(data))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._counts)
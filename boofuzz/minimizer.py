@@ -0,0 +1,74 @@
+import math
+
+
+def shrink_length(data, first_crashing, width=1):
+    """
+    Find the shortest prefix of data that still crashes the target, assuming that a prefix crashes if a shorter one
+    does.
+
+    Args:
+        data (str): Crashing data.
+        first_crashing (callable): Called with a list of candidates; returns the position of the first one that
+            crashes, or None. Candidates in one call may be tried concurrently.
+        width (int): Number of prefix lengths to try in each call. Default 1 (binary search).
+
+    Returns:
+        str: Shortest crashing prefix found.
+    """
+    low, high = 0, len(data)  # the prefix of length high crashes; none of length low or shorter was found to.
+    while high - low > 1:
+        step = (high - low) / float(width + 1)
+        lengths = sorted(set(low + int(math.ceil(step * (i + 1))) for i in range(width)) - {high})
+        crashing = first_crashing([data[:length] for length in lengths])
+        if crashing is None:
+            low = lengths[-1]
+        else:
+            high = lengths[crashing]
+            if crashing > 0:
+                low = lengths[crashing - 1]
+    return data[:high]
+
+
+def ddmin(data, first_crashing, width=1, max_chunks=None):
+    """
+    Delta debugging: remove chunks of data as long as what is left still crashes the target, with ever smaller chunks
+    down to single bytes.
+
+    Each round tries removing every chunk of the current size. Candidates are made width at a time, as they are
+    tried, so that they can be replayed concurrently without holding a whole round in memory.
+
+    Args:
+        data (str): Crashing data.
+        first_crashing (callable): Called with a list of candidates; returns the position of the first one that
+            crashes, or None. Candidates in one call may be tried concurrently.
+        width (int): Number of candidates to try in each call. Default 1.
+        max_chunks (int): Stop after a round of this many chunks removed nothing, even if they are longer than one
+            byte. Bounds the number of candidates tried on long data that can't be reduced, e.g. when the crash depends
+            on its length. Default None (no limit).
+
+    Returns:
+        str: Data that still crashes. No single byte can be removed from it, unless max_chunks stopped the search.
+    """
+    granularity = 2
+    while len(data) >= 2:
+        chunk_size = int(math.ceil(len(data) / float(granularity)))
+        reduced = None
+        for batch_start in xrange(0, len(data), chunk_size * width):
+            batch_end = min(batch_start + chunk_size * width, len(data))
+            candidates = [data[:start] + data[start + chunk_size:]
+                          for start in xrange(batch_start, batch_end, chunk_size)]
+            crashing = first_crashing(candidates)
+            if crashing is not None:
+                reduced = candidates[crashing]
+                break
+
+        if reduced is not None:
+            data = reduced
+            granularity = max(granularity - 1, 2)
+        elif chunk_size == 1 or (max_chunks is not None and granularity >= max_chunks):
+            break
+        else:
+            granularity = min(granularity * 2, len(data))
+            if max_chunks is not None:
+                granularity = min(granularity, max_chunks)
+    return data
@@ -0,0 +1,87 @@
+import threading
+import time
+
+
+class AdaptivePacing(object):
+    """
+    Learns how long to wait after each test case and after each target restart, for Session(pacing=...), replacing
+    sleep_time, restart_sleep_time and the fixed wait after a process monitor restart.
+
+    After a test case, the session waits case_delay. A failed test case may mean the target was not ready yet, so the
+    delay backs off exponentially; every test case that passes shrinks it a little, towards zero.
+
+    After a restart, the session waits restart_delay and then probes the target with connections, backing off
+    exponentially between probes, until one succeeds. The time that took becomes the next restart_delay; if the first
+    probe succeeds, restart_delay shrinks instead.
+
+    AdaptivePacing is thread-safe.
+
+    Args:
+        step (float): Smallest non-zero delay in seconds; delays backing off from zero start there. Default 0.01.
+        maximum (float): Longest delay after a test case, in seconds. Default 10.
+        restart_timeout (float): Seconds to keep probing after a restart before giving up. Default 60.
+        backoff (float): Factor by which a delay grows when the target was not ready. Default 2.
+        shrink (float): Factor by which a delay shrinks when the target kept up. Default 0.9.
+
+    Attributes:
+        case_delay (float): Current delay after a test case, in seconds.
+        restart_delay (float): Current delay after a restart before the first probe, in seconds.
+    """
+
+    def __init__(self, step=0.01, maximum=10, restart_timeout=60, backoff=2, shrink=0.9):
+        self.step = step
+        self.maximum = maximum
+        self.restart_timeout = restart_timeout
+        self.backoff = backoff
+        self.shrink = shrink
+
+        self.case_delay = 0.0
+        self.restart_delay = 0.0
+
+        self._lock = threading.Lock()
+
+    def record_case(self, ok):
+        """
+        Adjust case_delay after a test case.
+
+        Args:
+            ok (bool): Whether the test case passed.
+        """
+        with self._lock:
+            if ok:
+                self.case_delay = self._shrunk(self.case_delay)
+            else:
+                self.case_delay = min(self.maximum, max(self.case_delay * self.backoff, self.step))
+
+    def wait_for_restart(self, probe):
+        """
+        Wait until a restarted target accepts connections, and learn restart_delay from how long it took.
+
+        Args:
+            probe (callable): Tries a connection to the target; returns True if it succeeded.
+
+        Returns:
+            float: Seconds the target took to come back, or None if it didn't within restart_timeout.
+        """
+        start = time.time()
+        with self._lock:
+            delay = self.restart_delay
+        time.sleep(delay)
+
+        interval = self.step
+        first = True
+        while not probe():
+            first = False
+            if time.time() - start >= self.restart_timeout:
+                return None
+            time.sleep(interval)
+            interval = min(interval * self.backoff, self.maximum)
+
+        elapsed = time.time() - start
+        with self._lock:
+            self.restart_delay = self._shrunk(self.restart_delay) if first else elapsed
+        return elapsed
+
+    def _shrunk(self, delay):
+        delay *= self.shrink
+        return delay if delay >= self.step else 0.0
@@ -67,6 +67,12 @@ class Client:
             self.__server_sock.close()
             self.__server_sock = None
 
+    def close(self):
+        """
+        Close the connection to the server, e.g. after a call was interrupted. The next call connects again.
+        """
+        self.__disconnect()
+
     def __debug(self, msg):
         if self.__dbg_flag:
             print "PED-RPC> %s" % msg
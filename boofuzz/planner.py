@@ -0,0 +1,344 @@
+import collections
+import datetime
+import time
+
+import attr
+
+from . import primitives
+from . import schedulers
+
+# Session attributes holding the progress and results of a campaign, which the warm-up must leave as they were.
+_CAMPAIGN_PROGRESS = ("skip", "total_mutant_index", "_schedule_state", "_schedule_position", "_scheduler")
+_CAMPAIGN_RESULTS = ("crashing_primitives", "netmon_results", "procmon_results", "differential_results",
+                     "coverage_results", "canary_results", "hang_results", "latency_outliers", "minimized_crashes")
+
+
+def _format_duration(seconds):
+    return str(datetime.timedelta(seconds=int(round(seconds))))
+
+
+def _node_name(mutation_range):
+    return mutation_range.name.rsplit(".", 1)[0]
+
+
+@attr.s
+class PlanEntry(object):
+    """
+    What a Plan keeps of one MutationRange.
+
+    Attributes:
+        mutation_range (schedulers.MutationRange): The range.
+        latency (float): Estimated seconds per test case of the range's node.
+        positions (list of int): Zero-based positions within the range of the test cases to run, in order.
+        num_available (int): Number of test cases of the range that were not already run in the warm-up.
+    """
+    mutation_range = attr.ib()
+    latency = attr.ib()
+    positions = attr.ib()
+    num_available = attr.ib()
+
+    @property
+    def num_dropped(self):
+        return self.num_available - len(self.positions)
+
+
+class Plan(object):
+    """
+    Subset of a session's test cases that fits a time budget, made by CampaignPlanner.plan().
+
+    Run it with session.fuzz(scheduler=plan.scheduler()); see report() for what it leaves out.
+
+    Args:
+        budget (float): Time budget in seconds.
+        entries (list of PlanEntry): One entry per MutationRange of the session.
+        num_warmup_cases (int): Number of test cases already run in the warm-up.
+    """
+
+    def __init__(self, budget, entries, num_warmup_cases):
+        self.budget = budget
+        self.entries = entries
+        self.num_warmup_cases = num_warmup_cases
+
+    @property
+    def num_cases(self):
+        """Number of test cases in the plan."""
+        return sum(len(entry.positions) for entry in self.entries)
+
+    @property
+    def estimated_duration(self):
+        """Estimated seconds to run the plan."""
+        return sum(len(entry.positions) * entry.latency for entry in self.entries)
+
+    @property
+    def full_duration(self):
+        """Estimated seconds to run every test case not run in the warm-up."""
+        return sum(entry.num_available * entry.latency for entry in self.entries)
+
+    @property
+    def dropped(self):
+        """List of (range name, number of test cases dropped, number of test cases available) of trimmed ranges."""
+        return [(entry.mutation_range.name, entry.num_dropped, entry.num_available)
+                for entry in self.entries if entry.num_dropped > 0]
+
+    def node_estimates(self):
+        """
+        Returns:
+            collections.OrderedDict: Per node path name, a dict with the estimated "latency" per test case, the
+                number of test cases "planned" and "available", and the estimated "duration" of the planned ones.
+        """
+        estimates = collections.OrderedDict()
+        for entry in self.entries:
+            estimate = estimates.setdefault(_node_name(entry.mutation_range),
+                                            {"latency": entry.latency, "planned": 0, "available": 0, "duration": 0})
+            estimate["planned"] += len(entry.positions)
+            estimate["available"] += entry.num_available
+            estimate["duration"] += len(entry.positions) * entry.latency
+        return estimates
+
+    def report(self):
+        """
+        Returns:
+            str: Human readable summary of the plan: estimates per node and every primitive that was trimmed.
+        """
+        lines = ["Campaign plan: {0} test cases, estimated {1} of a {2} budget (all test cases: {3}).".format(
+            self.num_cases,
+            _format_duration(self.estimated_duration),
+            _format_duration(self.budget),
+            _format_duration(self.full_duration))]
+        if self.num_warmup_cases:
+            lines.append("{0} test cases already run in the warm-up are left out.".format(self.num_warmup_cases))
+
+        for node_name, estimate in self.node_estimates().items():
+            lines.append("Node '{0}': {1:.3f}s per test case, {2} of {3} test cases, {4}.".format(
+                node_name, estimate["latency"], estimate["planned"], estimate["available"],
+                _format_duration(estimate["duration"])))
+
+        dropped = self.dropped
+        if dropped:
+            lines.append("Dropped:")
+            for name, num_dropped, num_available in dropped:
+                lines.append("  {0}: {1} of {2} test cases".format(name, num_dropped, num_available))
+        else:
+            lines.append("Nothing dropped.")
+
+        return "\n".join(lines)
+
+    def scheduler(self):
+        """
+        Returns:
+            PlannedScheduler: Scheduler running the test cases of the plan, interleaving nodes and primitives.
+        """
+        return PlannedScheduler(self)
+
+
+class PlannedScheduler(schedulers.RoundRobinScheduler):
+    """
+    Runs the test cases of a Plan, taking one from each range in turn like RoundRobinScheduler, so that an estimate
+    that turns out too low still leaves every primitive fuzzed.
+
+    Args:
+        plan (Plan): Plan to run. Must have been made for the session being fuzzed.
+    """
+
+    def __init__(self, plan):
+        super(PlannedScheduler, self).__init__()
+        self.plan = plan
+        self._positions = []
+
+    def start(self, ranges):
+        positions = dict((entry.mutation_range.first_index, entry.positions) for entry in self.plan.entries)
+        self._positions = [positions.get(mutation_range.first_index, []) for mutation_range in ranges]
+        super(PlannedScheduler, self).start(ranges)
+
+    def _range_size(self, range_number):
+        return len(self._positions[range_number])
+
+    def _range_index(self, range_number, cursor):
+        return self.ranges[range_number].first_index + self._positions[range_number][cursor]
+
+
+class _WarmupScheduler(schedulers.Scheduler):
+    """
+    Runs up to num_cases test cases of each node, spread over its primitives, and measures how long each takes.
+    """
+
+    def __init__(self, num_cases):
+        super(_WarmupScheduler, self).__init__()
+        self.num_cases = num_cases
+        self.latencies = collections.defaultdict(list)  # node path name -> seconds per test case
+        self.indices = set()
+
+        self._indices = []
+        self._started = None
+
+    def start(self, ranges):
+        super(_WarmupScheduler, self).start(ranges)
+
+        by_node = collections.OrderedDict()
+        for mutation_range in self.ranges:
+            by_node.setdefault(_node_name(mutation_range), []).append(mutation_range)
+
+        self._indices = []
+        for node_ranges in by_node.values():
+            # the ranges of a node are adjacent.
+            first_index = node_ranges[0].first_index
+            num_mutations = sum(mutation_range.num_mutations for mutation_range in node_ranges)
+            step = max(1, num_mutations // max(1, self.num_cases))
+            self._indices.extend(range(first_index, first_index + num_mutations, step)[:self.num_cases])
+        self._indices.reverse()
+
+    def next_index(self):
+        if not self._indices:
+            return None
+
+        self._started = time.time()
+        return self._indices.pop()
+
+    def feedback(self, index, failed, response=None, new_edges=0):
+        self.indices.add(index)
+        self.latencies[self._node_of(index)].append(time.time() - self._started)
+
+    def exhaust(self, index):
+        for mutation_range in self.ranges:
+            if mutation_range.first_index <= index < mutation_range.first_index + mutation_range.num_mutations:
+                stop = mutation_range.first_index + mutation_range.num_mutations
+                self._indices = [i for i in self._indices if not mutation_range.first_index <= i < stop]
+
+    def _node_of(self, index):
+        for mutation_range in self.ranges:
+            if mutation_range.first_index <= index < mutation_range.first_index + mutation_range.num_mutations:
+                return _node_name(mutation_range)
+
+
+class CampaignPlanner(object):
+    """
+    Sizes a fuzzing campaign to a time budget.
+
+    warm_up() runs a few real test cases of every node through session.fuzz() to measure the time per test case, which
+    includes sending, receiving, sleep_time and target restarts. plan() then estimates the duration of every node and
+    primitive and, if all test cases don't fit the budget, keeps the same number of test cases of each primitive, as
+    many as fit. The kept test cases are the first entries of each fuzz library, which put the most likely values
+    first, except for BitFields, where the values closest to the integer boundaries are kept.
+
+    Example:
+        planner = CampaignPlanner(session)
+        plan = planner.plan(budget=8 * 60 * 60)
+        print(plan.report())
+        session.fuzz(scheduler=plan.scheduler())
+
+    Args:
+        session (Session): Session to plan. Must have its graph and targets set up.
+        warmup_cases (int): Number of test cases to time per node. Default 5.
+    """
+
+    def __init__(self, session, warmup_cases=5):
+        self.session = session
+        self.warmup_cases = warmup_cases
+
+        self.latencies = None  # node path name -> mean seconds per test case
+        self.warmup_indices = set()
+
+    def warm_up(self):
+        """
+        Run the warm-up test cases and measure their duration.
+
+        The warm-up starts from the beginning of its own schedule and is not saved to the session file; the progress
+        and results of the session are restored afterwards, so a campaign can be planned and resumed with the same
+        session.
+        """
+        session = self.session
+        saved = dict((name, getattr(session, name)) for name in _CAMPAIGN_PROGRESS + _CAMPAIGN_RESULTS)
+        session_filename = session.session_filename
+
+        session.session_filename = None
+        session.skip = 0
+        session._schedule_state = None
+        for name in _CAMPAIGN_RESULTS:
+            setattr(session, name, {})
+
+        warmup = _WarmupScheduler(self.warmup_cases)
+        try:
+            session.fuzz(scheduler=warmup)
+        finally:
+            session.session_filename = session_filename
+            for name, value in saved.items():
+                setattr(session, name, value)
+
+        self.latencies = dict((node_name, sum(durations) / len(durations))
+                              for node_name, durations in warmup.latencies.items())
+        self.warmup_indices = warmup.indices
+
+    def plan(self, budget):
+        """
+        Choose the test cases that fit in budget. Runs warm_up() first if it wasn't run yet.
+
+        Args:
+            budget (float): Time budget in seconds for the test cases of the plan; the warm-up is not included.
+
+        Returns:
+            Plan: The plan.
+        """
+        if self.latencies is None:
+            self.warm_up()
+
+        default_latency = 0
+        if self.latencies:
+            default_latency = sum(self.latencies.values()) / len(self.latencies)
+
+        ranges = self.session._mutation_ranges(self.session._fuzz_case_offsets())
+        candidates = [self._candidates(mutation_range) for mutation_range in ranges]
+        latencies = [self.latencies.get(_node_name(mutation_range), default_latency) for mutation_range in ranges]
+
+        counts = self._allocate(budget, [len(c) for c in candidates], latencies)
+
+        entries = [PlanEntry(mutation_range=mutation_range,
+                             latency=latency,
+                             positions=sorted(candidate[:count]),
+                             num_available=len(candidate))
+                   for mutation_range, candidate, latency, count in zip(ranges, candidates, latencies, counts)]
+
+        return Plan(budget=budget, entries=entries, num_warmup_cases=len(self.warmup_indices))
+
+    def _candidates(self, mutation_range):
+        """
+        Positions within a range that were not run in the warm-up, most valuable first.
+        """
+        positions = range(mutation_range.num_mutations)
+
+        mutant = mutation_range.mutant
+        if isinstance(mutant, primitives.BitField) and len(mutant._fuzz_library) == mutation_range.num_mutations:
+            boundaries = [0] + [mutant.max_num // d for d in (32, 16, 8, 4, 3, 2, 1)]
+            library = mutant._fuzz_library
+
+            positions.sort(key=lambda position: (min(abs(library[position] - boundary) for boundary in boundaries),
+                                                 position))
+
+        return [position for position in positions
+                if mutation_range.first_index + position not in self.warmup_indices]
+
+    @staticmethod
+    def _allocate(budget, sizes, latencies):
+        """
+        Number of test cases to keep of each range: the largest cap k, the same for every range, such that
+        min(size, k) test cases of every range fit the budget, then one more for the first ranges while there is time
+        left.
+        """
+        def cost(cap):
+            return sum(min(size, cap) * latency for size, latency in zip(sizes, latencies))
+
+        low, high = 0, max(sizes + [0])
+        while low < high:
+            middle = (low + high + 1) // 2
+            if cost(middle) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+
+        counts = [min(size, low) for size in sizes]
+        left = budget - cost(low)
+        for i, (size, latency) in enumerate(zip(sizes, latencies)):
+            if counts[i] < size and latency <= left:
+                counts[i] += 1
+                left -= latency
+
+        return counts
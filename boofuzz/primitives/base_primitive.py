@@ -8,6 +8,9 @@ class BasePrimitive(IFuzzable):
     The primitive base class implements common functionality shared across most primitives.
     """
 
+    # positions in the fuzz library in the order to mutate through them, or None for library order. See sort_library().
+    _library_order = None
+
     @abc.abstractproperty
     def name(self):
         pass
@@ -49,16 +52,83 @@ class BasePrimitive(IFuzzable):
             return False
 
         # update the current value from the fuzz library.
-        self._value = self._fuzz_library[self._mutant_index]
+        self._value = self._mutation_value(self._mutant_index)
 
         # increment the mutation count.
         self._mutant_index += 1
 
         return True
 
+    def seek(self, mutant_index):
+        if mutant_index == 0:
+            self.reset()
+            return
+
+        if not 0 < mutant_index <= self.num_mutations():
+            raise IndexError("mutant index {0} out of range for {1!r}".format(mutant_index, self))
+
+        self._fuzz_complete = False
+        self._value = self._mutation_value(mutant_index - 1)
+        self._mutant_index = mutant_index
+
+    def exhaust(self):
+        """
+        Skip the remaining mutations of this primitive.
+
+        :rtype:  int
+        :return: The number of mutations skipped
+        """
+        num = self.num_mutations() - self._mutant_index
+
+        self._fuzz_complete = True
+        self._mutant_index = self.num_mutations()
+        self._value = self._original_value
+
+        return num
+
     def num_mutations(self):
         return len(self._fuzz_library)
 
+    def sort_library(self, key):
+        """
+        Mutate through the fuzz library in a different order. The library itself and num_mutations() are unchanged.
+
+        Args:
+            key (callable): Called with each library value; values are used in ascending order of key, and in library
+                order among equal keys. None restores library order.
+        """
+        if key is None:
+            self._library_order = None
+            return
+
+        self._library_order = sorted(range(self.num_mutations()), key=lambda index: key(self._library_value(index)))
+
+    def _mutation_value(self, mutant_index):
+        """
+        Value of the mutation at a zero-based mutant index, taking sort_library() into account.
+        """
+        return self._library_value(self._library_index(mutant_index))
+
+    def _library_index(self, mutant_index):
+        """
+        Position in the fuzz library of the mutation at a zero-based mutant index, taking sort_library() into account.
+        """
+        if self._library_order is not None:
+            return self._library_order[mutant_index]
+        return mutant_index
+
+    def _library_value(self, index):
+        """
+        Value of the mutation at a zero-based position in the fuzz library.
+
+        Args:
+            index (int): Position in the library, 0 <= index < num_mutations().
+
+        Returns:
+            Value to assign to self._value.
+        """
+        return self._fuzz_library[index]
+
     def render(self):
         """
         Nothing fancy on render, simply return the value.
@@ -48,7 +48,7 @@ class Group(BasePrimitive):
 
         # step through the value list.
         # TODO: break this into a get_value() function, so we can keep mutate as close to standard as possible.
-        self._value = self.values[self._mutant_index]
+        self._value = self._mutation_value(self._mutant_index)
 
         # increment the mutation count.
         self._mutant_index += 1
@@ -64,3 +64,6 @@ class Group(BasePrimitive):
         """
 
         return len(self.values)
+
+    def _library_value(self, index):
+        return self.values[index]
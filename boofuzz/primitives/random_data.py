@@ -60,17 +60,7 @@ class RandomData(BasePrimitive):
             self._value = self._original_value
             return False
 
-        # select a random length for this string.
-        if not self.step:
-            length = random.randint(self.min_length, self.max_length)
-        # select a length function of the mutant index and the step.
-        else:
-            length = self.min_length + self._mutant_index * self.step
-
-        # reset the value and generate a random string of the determined length.
-        self._value = ""
-        for i in xrange(length):
-            self._value += chr(random.randint(0, 255))
+        self._value = self._mutation_value(self._mutant_index)
 
         # increment the mutation count.
         self._mutant_index += 1
@@ -86,3 +76,17 @@ class RandomData(BasePrimitive):
         """
 
         return self.max_mutations
+
+    def _library_value(self, index):
+        """
+        Generate the random value for a mutation; there is no stored library.
+        """
+        # select a random length for this string.
+        if not self.step:
+            length = random.randint(self.min_length, self.max_length)
+        # select a length function of the mutant index and the step.
+        else:
+            length = self.min_length + index * self.step
+
+        # generate a random string of the determined length.
+        return "".join(chr(random.randint(0, 255)) for _ in xrange(length))
@@ -209,12 +209,15 @@ class String(BasePrimitive):
             self.add_long_strings("\xFF")  # expands to 4 characters under utf16
 
             # add some long strings with null bytes thrown in the middle of them.
+            # the positions are random but fixed, so that every process fuzzing the same protocol (e.g. workers of a
+            # distributed campaign) ends up with the same library and thus the same test case indices.
+            rng = random.Random(0)
             for length in [128, 256, 1024, 2048, 4096, 32767, 0xFFFF]:
                 s = "D" * length
                 # Number of null bytes to insert (random)
-                for i in range(random.randint(1, 10)):
+                for i in range(rng.randint(1, 10)):
                     # Location of random byte
-                    loc = random.randint(1, len(s))
+                    loc = rng.randint(1, len(s))
                     s = s[:loc] + "\x00" + s[loc:]
                 self._fuzz_library.append(s)
 
@@ -225,10 +228,28 @@ class String(BasePrimitive):
             # If any of our strings are over max_len
             if any(len(s) > max_len for s in self.this_library):
                 # Pull out only the ones that aren't
-                self.this_library = list(set([s[:max_len] for s in self.this_library]))
+                self.this_library = self._truncate_library(self.this_library, max_len)
             # Same thing here
             if any(len(s) > max_len for s in self._fuzz_library):
-                self._fuzz_library = list(set([s[:max_len] for s in self._fuzz_library]))
+                self._fuzz_library = self._truncate_library(self._fuzz_library, max_len)
+
+        # with a static size, drop library items that don't fit and pad the rest up front, so that every mutant index
+        # maps to exactly one value and seek() agrees with mutate().
+        if self.size != -1:
+            self._fuzz_library = [self._pad(s) for s in self._fuzz_library if len(s) <= self.size]
+            self.this_library = [self._pad(s) for s in self.this_library if len(s) <= self.size]
+
+    @staticmethod
+    def _truncate_library(library, max_len):
+        """Truncate every library value to max_len and drop duplicates, keeping the library order."""
+        truncated = []
+        seen = set()
+        for value in library:
+            value = value[:max_len]
+            if value not in seen:
+                seen.add(value)
+                truncated.append(value)
+        return truncated
 
     @property
     def name(self):
@@ -256,47 +277,19 @@ class String(BasePrimitive):
         for string in strings:
             self._fuzz_library.append(string)
 
-    def mutate(self):
+    def _pad(self, value):
         """
-        Mutate the primitive by stepping through the fuzz library extended with the "this" library, return False on
-        completion.
-
-        @rtype:  bool
-        @return: True on success, False otherwise.
+        Pad value up to the static size of this field.
         """
+        return value + self.padding * (self.size - len(value))
 
-        # loop through the fuzz library until a suitable match is found.
-        while 1:
-            # if we've ran out of mutations, raise the completion flag.
-            if self._mutant_index == self.num_mutations():
-                self._fuzz_complete = True
-
-            # if fuzzing was disabled or complete, and mutate() is called, ensure the original value is restored.
-            if not self._fuzzable or self._fuzz_complete:
-                self._value = self._original_value
-                return False
-
-            # update the current value from the fuzz library.
-            self._value = (self._fuzz_library + self.this_library)[self._mutant_index]
-
-            # increment the mutation count.
-            self._mutant_index += 1
-
-            # if the size parameter is disabled, break out of the loop right now.
-            if self.size == -1:
-                break
-
-            # ignore library items greater then user-supplied length.
-            # TODO: might want to make this smarter.
-            if len(self._value) > self.size:
-                continue
-
-            # pad undersized library items.
-            if len(self._value) < self.size:
-                self._value += self.padding * (self.size - len(self._value))
-                break
-
-        return True
+    def _library_value(self, index):
+        """
+        Step through the fuzz library extended with the "this" library.
+        """
+        if index < len(self._fuzz_library):
+            return self._fuzz_library[index]
+        return self.this_library[index - len(self._fuzz_library)]
 
     def num_mutations(self):
         """
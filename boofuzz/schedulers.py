@@ -0,0 +1,520 @@
+import abc
+import bisect
+import collections
+import hashlib
+import struct
+
+import attr
+
+from . import fingerprints
+
+
+@attr.s
+class MutationRange(object):
+    """
+    Contiguous range of test case indices in which one primitive of one node is mutated.
+
+    Attributes:
+        first_index (int): Global index of the first test case of the range.
+        num_mutations (int): Number of test cases in the range.
+        path (list of Connection): Path to the node under test.
+        mutant: The primitive mutated in this range.
+        name (str): "<node path>.<primitive name>", like test case names without the mutant index.
+    """
+    first_index = attr.ib()
+    num_mutations = attr.ib()
+    path = attr.ib(repr=False)
+    mutant = attr.ib(repr=False)
+    name = attr.ib(default=None)
+
+
+class Scheduler(object):
+    """
+    Decides in which order Session.fuzz() runs test cases.
+
+    The session hands the scheduler the MutationRanges of the whole protocol via start(), then asks for global test
+    case indices one by one with next_index(). Since the session seeks straight to each test case, any order costs
+    the same.
+
+    Subclasses implement next_index() and exhaust(). Schedulers that only pick which range to take the next test case
+    from derive from RangeScheduler instead.
+    """
+    __metaclass__ = abc.ABCMeta
+
+    def __init__(self):
+        self.ranges = []
+
+    def start(self, ranges):
+        """
+        Start scheduling.
+
+        Args:
+            ranges (list of MutationRange): Ranges to schedule, in the session's default order.
+        """
+        self.ranges = list(ranges)
+
+    @abc.abstractmethod
+    def next_index(self):
+        """
+        Returns:
+            int: Global index of the next test case, or None once every test case was scheduled.
+        """
+        raise NotImplementedError
+
+    def __iter__(self):
+        index = self.next_index()
+        while index is not None:
+            yield index
+            index = self.next_index()
+
+    def skip(self, count, state=None):
+        """
+        Skip the first count test cases of the schedule, e.g. to resume a campaign. Call right after start().
+
+        The default steps through them with next_index(). Subclasses that can restore their position directly
+        override this and state().
+
+        Args:
+            count (int): Number of test cases to skip.
+            state: What state() returned after count test cases had been scheduled. Default None (unknown).
+        """
+        for _ in range(count):
+            if self.next_index() is None:
+                break
+
+    def state(self):
+        """
+        Returns:
+            Picklable state of the schedule, to be passed to skip() on resume, or None. The session saves it with its
+            progress. Default None.
+        """
+        return None
+
+    @abc.abstractmethod
+    def exhaust(self, index):
+        """
+        Schedule no more test cases of the range containing index, e.g. because its primitive reached the crash
+        threshold.
+
+        Args:
+            index (int): Global test case index.
+        """
+        raise NotImplementedError
+
+    def feedback(self, index, failed, response=None, new_edges=0):
+        """
+        Called by the session after each test case. Override to adapt the schedule to results.
+
+        Args:
+            index (int): Global test case index.
+            failed (bool): Whether the test case failed.
+            response (str): Data received after the node under test, if any.
+            new_edges (int): Number of new coverage edges the test case found; see Session(coverage_feedback=True).
+        """
+        pass
+
+    def stop(self):
+        """
+        Called by the session when fuzzing stops, whether or not every test case ran. Override to clean up or save
+        state.
+        """
+        pass
+
+
+class RangeScheduler(Scheduler):
+    """
+    Scheduler that keeps a cursor in each range and schedules every test case of every range exactly once.
+
+    Subclasses implement _choose() to pick which range to take the next test case from.
+    """
+
+    def __init__(self):
+        super(RangeScheduler, self).__init__()
+        self._cursors = []
+        self._active = []
+
+    def start(self, ranges):
+        super(RangeScheduler, self).start(ranges)
+        self._cursors = [0] * len(self.ranges)
+        self._active = [i for i in range(len(self.ranges)) if self._range_size(i) > 0]
+
+    def next_index(self):
+        if not self._active:
+            return None
+
+        range_number = self._choose()
+        index = self._range_index(range_number, self._cursors[range_number])
+
+        self._cursors[range_number] += 1
+        if self._cursors[range_number] >= self._range_size(range_number):
+            self._active.remove(range_number)
+
+        return index
+
+    def exhaust(self, index):
+        for range_number in list(self._active):
+            mutation_range = self.ranges[range_number]
+            if mutation_range.first_index <= index < mutation_range.first_index + mutation_range.num_mutations:
+                self._cursors[range_number] = self._range_size(range_number)
+                self._active.remove(range_number)
+
+    def _range_size(self, range_number):
+        """
+        Returns:
+            int: Number of test cases to schedule from a range. Default all of them.
+        """
+        return self.ranges[range_number].num_mutations
+
+    def _range_index(self, range_number, cursor):
+        """
+        Returns:
+            int: Global index of the test case at position cursor among those scheduled from a range.
+        """
+        return self.ranges[range_number].first_index + cursor
+
+    @abc.abstractmethod
+    def _choose(self):
+        """
+        Returns:
+            int: Position in self.ranges of the range to take the next test case from. Must be in self._active.
+        """
+        raise NotImplementedError
+
+
+class RoundRobinScheduler(RangeScheduler):
+    """
+    Takes one test case from each (path, primitive) range in turn, so every primitive of every node is fuzzed early
+    on instead of exhausting each node before moving on to the next.
+    """
+
+    def __init__(self):
+        super(RoundRobinScheduler, self).__init__()
+        self._turn = 0
+
+    def start(self, ranges):
+        super(RoundRobinScheduler, self).start(ranges)
+        self._turn = 0
+
+    def _choose(self):
+        # self._active is in range order; take the first active range at or after the current turn.
+        for range_number in self._active:
+            if range_number >= self._turn:
+                break
+        else:
+            range_number = self._active[0]
+
+        self._turn = range_number + 1
+        return range_number
+
+
+class WeightedScheduler(RangeScheduler):
+    """
+    Interleaves (path, primitive) ranges like RoundRobinScheduler, but takes test cases from each range in proportion
+    to its weight, using smooth weighted round-robin so the order is deterministic and evenly spread.
+
+    Args:
+        weights (dict): Weight by range name ("<node>.<primitive>", see MutationRange.name), primitive name or node
+            name, looked up in that order. Default {}.
+        default_weight (float): Weight of ranges not in weights. Default 1.
+        weight_function (callable): Called with each MutationRange to get its weight, instead of using weights.
+            Default None.
+    """
+
+    def __init__(self, weights=None, default_weight=1, weight_function=None):
+        super(WeightedScheduler, self).__init__()
+        if weights is None:
+            weights = {}
+        self.weights = weights
+        self.default_weight = default_weight
+        self.weight_function = weight_function
+
+        self._weights = []
+        self._current = []
+
+    def start(self, ranges):
+        super(WeightedScheduler, self).start(ranges)
+        self._weights = [self._weight(mutation_range) for mutation_range in self.ranges]
+        self._current = [0] * len(self.ranges)
+        # ranges with no weight are never chosen.
+        self._active = [i for i in self._active if self._weights[i] > 0]
+
+    def _weight(self, mutation_range):
+        if self.weight_function is not None:
+            return self.weight_function(mutation_range)
+
+        node_name = mutation_range.name.rsplit(".", 1)[0]
+        for key in (mutation_range.name, mutation_range.mutant.name, node_name):
+            if key in self.weights:
+                return self.weights[key]
+        return self.default_weight
+
+    def _choose(self):
+        total = 0
+        best = None
+        for range_number in self._active:
+            self._current[range_number] += self._weights[range_number]
+            total += self._weights[range_number]
+            if best is None or self._current[range_number] > self._current[best]:
+                best = range_number
+
+        self._current[best] -= total
+        return best
+
+
+class FeistelPermutation(object):
+    """
+    Keyed pseudo-random permutation of range(size), computed one position at a time in constant memory.
+
+    A balanced Feistel network permutes the smallest domain of an even number of bits that holds size; values outside
+    range(size) are mapped again until they fall inside (cycle walking). The domain is less than 4 times size, so this
+    takes few steps on average.
+
+    Args:
+        size (int): Number of values to permute.
+        seed: Key of the permutation. The same seed gives the same permutation in every process.
+        rounds (int): Number of Feistel rounds. Default 4.
+    """
+
+    def __init__(self, size, seed=0, rounds=4):
+        self.size = size
+        self.seed = seed
+        self.rounds = rounds
+
+        half_bits = 1
+        while 1 << (2 * half_bits) < size:
+            half_bits += 1
+        self._half_bits = half_bits
+        self._mask = (1 << half_bits) - 1
+        self._keys = [hashlib.md5("{0!r}:{1}".format(seed, r)).digest() for r in range(rounds)]
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, position):
+        """
+        Returns:
+            int: The value at position of the permutation.
+        """
+        if not 0 <= position < self.size:
+            raise IndexError("position out of range for permutation")
+
+        value = self._encrypt(position)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return int(value)
+
+    def _encrypt(self, value):
+        left = value >> self._half_bits
+        right = value & self._mask
+        for key in self._keys:
+            left, right = right, left ^ (self._round_function(key, right) & self._mask)
+        return (left << self._half_bits) | right
+
+    @staticmethod
+    def _round_function(key, value):
+        return struct.unpack("<Q", hashlib.md5(key + struct.pack("<Q", value)).digest()[:8])[0]
+
+
+class RandomScheduler(Scheduler):
+    """
+    Samples test cases uniformly at random without replacement, visiting every test case exactly once.
+
+    The order is a FeistelPermutation of all test case indices, which must be adjacent ranges as made by the
+    session, so no list of indices is stored, and the walk is fully
+    determined by (seed, position) and the ranges exhausted so far: a campaign is resumed by starting a
+    RandomScheduler with the same seed, which jumps straight to the position and exhausted ranges saved by state().
+
+    Args:
+        seed: Key of the permutation. Default 0.
+        num_samples (int): Stop after this many test cases. Default None (run every test case).
+    """
+
+    def __init__(self, seed=0, num_samples=None):
+        super(RandomScheduler, self).__init__()
+        self.seed = seed
+        self.num_samples = num_samples
+        self.position = 0
+
+        self._permutation = None
+        self._first_index = 1
+        self._first_indices = []
+        self._exhausted = set()
+        self._num_scheduled = 0
+
+    def start(self, ranges):
+        super(RandomScheduler, self).start(ranges)
+        ranges = [mutation_range for mutation_range in self.ranges if mutation_range.num_mutations > 0]
+        self.ranges = ranges
+        self._first_indices = [mutation_range.first_index for mutation_range in ranges]
+        self._exhausted = set()
+        self._num_scheduled = 0
+        self.position = 0
+
+        first_index = ranges[0].first_index if ranges else 1
+        size = sum(mutation_range.num_mutations for mutation_range in ranges)
+        self._first_index = first_index
+        self._permutation = FeistelPermutation(size, seed=self.seed)
+
+    def next_index(self):
+        if self.num_samples is not None and self._num_scheduled >= self.num_samples:
+            return None
+
+        while self.position < len(self._permutation):
+            index = self._first_index + self._permutation[self.position]
+            self.position += 1
+            if self._range_number(index) not in self._exhausted:
+                self._num_scheduled += 1
+                return index
+
+        return None
+
+    def exhaust(self, index):
+        self._exhausted.add(self._range_number(index))
+
+    def skip(self, count, state=None):
+        if state is None:
+            # without exhausted ranges, every position of the permutation was scheduled.
+            state = {"position": count, "num_scheduled": count, "exhausted": []}
+
+        self.position = min(state["position"], len(self._permutation))
+        self._num_scheduled = state["num_scheduled"]
+        self._exhausted = set(state["exhausted"])
+
+    def state(self):
+        return {"position": self.position, "num_scheduled": self._num_scheduled, "exhausted": sorted(self._exhausted)}
+
+    def _range_number(self, index):
+        return bisect.bisect_right(self._first_indices, index) - 1
+
+
+class NoveltyScheduler(RangeScheduler):
+    """
+    Gives more test cases to the primitives whose mutations keep producing new kinds of responses, and fewer to the
+    ones whose mutations all get the same answer. Meant for closed targets, where responses are the only feedback;
+    with Session(coverage_feedback=True), a test case that found new coverage edges counts as new as well.
+
+    After each test case the response is fingerprinted (see fingerprints.fingerprint()) and added to a
+    ResponseClassIndex. Ranges are interleaved with smooth weighted round-robin, with a weight that grows with the
+    share of their test cases that found a new response class; a range that found nothing new in its last patience
+    test cases drops to min_weight. When a library entry finds a new class, the entry at the same position of the other
+    ranges of primitives of the same type runs next in those ranges.
+
+    Every test case is still scheduled exactly once; only the order changes.
+
+    Args:
+        boost (float): Extra weight of a range all of whose test cases found a new response class. Default 10.
+        min_weight (float): Weight of a range that stopped finding new response classes. Default 0.1.
+        patience (int): Test cases without a new response class after which a range drops to min_weight. Default 20.
+        max_distance (int): See fingerprints.ResponseClassIndex. Default 12.
+
+    Attributes:
+        response_classes (fingerprints.ResponseClassIndex): Response classes seen so far.
+        novelty (dict): Number of test cases of each range that found a new response class or new coverage, keyed by
+            range name.
+    """
+
+    def __init__(self, boost=10, min_weight=0.1, patience=20, max_distance=12):
+        super(NoveltyScheduler, self).__init__()
+        self.boost = boost
+        self.min_weight = min_weight
+        self.patience = patience
+        self.max_distance = max_distance
+
+        self.response_classes = None
+        self.novelty = {}
+
+        self._first_indices = []
+        self._runs = []
+        self._novel = []
+        self._since_novel = []
+        self._current = []
+        self._promoted = []  # per range, positions to run before the cursor gets there
+        self._ahead = []  # per range, positions beyond the cursor that already ran
+        self._num_scheduled = []
+
+    def start(self, ranges):
+        super(NoveltyScheduler, self).start(ranges)
+        self.response_classes = fingerprints.ResponseClassIndex(max_distance=self.max_distance)
+        self.novelty = collections.defaultdict(int)
+
+        num_ranges = len(self.ranges)
+        self._first_indices = [mutation_range.first_index for mutation_range in self.ranges]
+        self._runs = [0] * num_ranges
+        self._novel = [0] * num_ranges
+        self._since_novel = [0] * num_ranges
+        self._current = [0] * num_ranges
+        self._promoted = [collections.deque() for _ in range(num_ranges)]
+        self._ahead = [set() for _ in range(num_ranges)]
+        self._num_scheduled = [0] * num_ranges
+
+    def next_index(self):
+        if not self._active:
+            return None
+
+        range_number = self._choose()
+        mutation_range = self.ranges[range_number]
+
+        if self._promoted[range_number]:
+            position = self._promoted[range_number].popleft()
+            self._ahead[range_number].add(position)
+        else:
+            while self._cursors[range_number] in self._ahead[range_number]:
+                self._ahead[range_number].remove(self._cursors[range_number])
+                self._cursors[range_number] += 1
+            position = self._cursors[range_number]
+            self._cursors[range_number] += 1
+
+        self._num_scheduled[range_number] += 1
+        if self._num_scheduled[range_number] >= mutation_range.num_mutations:
+            self._active.remove(range_number)
+
+        return mutation_range.first_index + position
+
+    def feedback(self, index, failed, response=None, new_edges=0):
+        range_number = bisect.bisect_right(self._first_indices, index) - 1
+        mutation_range = self.ranges[range_number]
+
+        self._runs[range_number] += 1
+        new_class = self.response_classes.add(fingerprints.fingerprint(response, failed=failed))
+        if not new_class and not new_edges:
+            self._since_novel[range_number] += 1
+            return
+
+        self._novel[range_number] += 1
+        self._since_novel[range_number] = 0
+        self.novelty[mutation_range.name] += 1
+
+        # try the same library entry on the other primitives of this type.
+        position = index - mutation_range.first_index
+        mutant_type = type(mutation_range.mutant)
+        for other in self._active:
+            other_range = self.ranges[other]
+            if other != range_number \
+                    and type(other_range.mutant) is mutant_type \
+                    and self._cursors[other] <= position < other_range.num_mutations \
+                    and position not in self._ahead[other] \
+                    and position not in self._promoted[other]:
+                self._promoted[other].append(position)
+
+    def exhaust(self, index):
+        range_number = bisect.bisect_right(self._first_indices, index) - 1
+        if range_number in self._active:
+            self._active.remove(range_number)
+
+    def _weight(self, range_number):
+        if self._since_novel[range_number] >= self.patience:
+            return self.min_weight
+        return 1 + self.boost * self._novel[range_number] / float(self._runs[range_number] + 1)
+
+    def _choose(self):
+        total = 0
+        best = None
+        for range_number in self._active:
+            weight = self._weight(range_number)
+            self._current[range_number] += weight
+            total += weight
+            if best is None or self._current[range_number] > self._current[best]:
+                best = range_number
+
+        self._current[best] -= total
+        return best
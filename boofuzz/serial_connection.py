@@ -49,6 +49,7 @@ class SerialConnection(itarget_connection.ITargetConnection):
         self.content_checker = content_checker
 
         self._leftover_bytes = b''
+        self._recv_timeout = None
 
     def close(self):
         """
@@ -78,7 +79,8 @@ class SerialConnection(itarget_connection.ITargetConnection):
             Received data.
         """
 
-        self._connection.timeout = min(.001, self.message_separator_time, self.timeout)
+        timeout = self.timeout if self._recv_timeout is None else self._recv_timeout
+        self._connection.timeout = min(.001, self.message_separator_time, timeout)
 
         start_time = last_byte_time = time.time()
 
@@ -103,13 +105,25 @@ class SerialConnection(itarget_connection.ITargetConnection):
 
             # Check timeout and message_separator_time
             cur_time = time.time()
-            if self.timeout is not None and cur_time - start_time >= self.timeout:
+            if timeout is not None and cur_time - start_time >= timeout:
                 return data
             if self.message_separator_time is not None and cur_time - last_byte_time >= self.message_separator_time:
                 return data
 
         return data
 
+    def set_recv_timeout(self, timeout):
+        """
+        Set how long recv() waits for data, overriding self.timeout.
+
+        Args:
+            timeout (float): Timeout in seconds, or None to use self.timeout again.
+
+        Returns:
+            None
+        """
+        self._recv_timeout = timeout
+
     def send(self, data):
         """
         Send data to the target. Only valid after calling open!
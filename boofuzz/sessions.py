@@ -1,27 +1,49 @@
 from __future__ import absolute_import
 
+import bisect
+import collections
+import contextlib
+import copy
 import cPickle
 import logging
+import multiprocessing
+import os
+import Queue
 import re
+import signal
+import socket
 import sys
 import threading
 import time
+import traceback
 import zlib
 
+from tornado import gen
+from tornado.concurrent import Future
 from tornado.httpserver import HTTPServer
 from tornado.ioloop import IOLoop
 from tornado.wsgi import WSGIContainer
 
 from . import blocks
+from . import dedupe
 from . import event_hook
 from . import fuzz_logger
 from . import fuzz_logger_text
 from . import ifuzz_logger
+from . import leases
+from . import minimizer
+from . import pedrpc
 from . import pgraph
 from . import primitives
+from . import schedulers
 from . import sex
+from . import verification
+from . import watchdog
 from .web.app import app
 
+# Number of bytes to read from the target when receiving its answer to a message.
+RECV_MAX_BYTES = 10000
+
 
 class Target(object):
     """Target descriptor container.
@@ -138,6 +160,21 @@ class Target(object):
         if self._fuzz_data_logger is not None:
             self._fuzz_data_logger.log_info("{0} bytes sent".format(num_sent))
 
+    def set_recv_timeout(self, timeout):
+        """
+        Set how long recv() waits for data, overriding the connection's own timeout.
+
+        Args:
+            timeout (float): Timeout in seconds, or None to use the connection's own timeout again.
+
+        Returns:
+            None
+        """
+        # connections written before ITargetConnection.set_recv_timeout() keep their own timeout.
+        set_recv_timeout = getattr(self._target_connection, "set_recv_timeout", None)
+        if set_recv_timeout is not None:
+            set_recv_timeout(timeout)
+
     def set_fuzz_data_logger(self, fuzz_data_logger):
         """
         Set this object's fuzz data logger -- for sent and received fuzz data.
@@ -195,6 +232,64 @@ class Session(pgraph.Graph):
                                 failures.
         ignore_connection_aborted (bool): Log ECONNABORTED errors as "info" instead of failures.
         target (Target):        Target for fuzz session. Target must be fully initialized. Default None.
+                                More targets can be added with add_target(); with more than one target, fuzz() runs
+                                test cases on all of them in parallel.
+        coordinator (pedrpc.Client): Client of a coordinator.CampaignCoordinator. If given, fuzz() fuzzes test cases
+                                leased from the coordinator, sharing the campaign with other Sessions. Default None.
+        library_stats (library_stats.LibraryStats): If given, the outcome of every test case is counted for the fuzz
+                                library entry under test, and the statistics are saved when fuzz() returns.
+                                Test cases run in worker processes of fuzz(processes=N) are not counted.
+                                Default None.
+        coverage_feedback (bool): If True, process monitors are asked for the coverage of each test case with
+                                post_send_with_coverage(); see process_monitor_unix.py --coverage. Test cases that
+                                found new edges are recorded in coverage_results, and schedulers get the number of new
+                                edges as feedback. Default False.
+        dedupe (dedupe.DigestSet or dedupe.BloomFilter): If given, test cases whose messages render to the same bytes
+                                as an earlier test case are skipped, and counted in dedupe.num_duplicates. Test cases
+                                on a path with an edge callback are always sent, since the callback may change what is
+                                sent. A BloomFilter is saved when fuzz() returns. Default None.
+        health_check_interval (int): Contact the process and network monitors only every this many test cases, and
+                                after each test case that fails, instead of after every test case. When the process
+                                monitor reports a crash, the test cases since the last check are replayed on a
+                                restarted target, bisecting them to find the one that triggers the crash; see
+                                bisection_results. Applies to fuzz() with one target, with or without a scheduler or
+                                pipelining. Default 1 (check after every test case).
+        canary_interval (int): If not 0, check that the target still answers normally after at most this many test
+                                cases by sending a canary: the first request connected to the root, rendered with
+                                original values, without edge callbacks. Its response is compared with a baseline
+                                sent twice when fuzzing starts, byte for byte if both baseline responses were the
+                                same and otherwise only for whether anything was received. A failed canary fails the
+                                last test case, restarts the target and records the test cases since the last good
+                                canary in canary_results. The interval halves after each failed canary and doubles
+                                after each good one, up to canary_interval. Applies to fuzz() with one target, with or
+                                without a scheduler or pipelining. Default 0 (no canaries).
+        case_timeout (float): Seconds a test case may take, from telling the monitors about it to polling them
+                                afterwards, including edge callbacks and post_send. A test case that runs longer is
+                                aborted and fails as a hang, recorded in hang_results; its connection and the
+                                connections to the monitors are closed and fuzzing goes on. Enforced with SIGALRM, so
+                                only on Unix and in the main thread, i.e. not with several targets or processes.
+                                Restarting the target and the health check ending a batch of health_check_interval
+                                test cases are not covered. Default None (no limit).
+        phase_timeouts (dict): Seconds each phase of a test case may take, by phase: "monitor" (each call to the
+                                process and network monitors), "open", "pre_send", "transmit" (each message, with its
+                                edge callback) and "post_send". Works like case_timeout. Default None (no limits).
+        pacing (pacing.AdaptivePacing): If given, the delays after each test case and after each restart by a process
+                                monitor or without a restart method are learned from failures and from probe
+                                connections, instead of sleep_time, restart_sleep_time and a fixed 3 seconds.
+                                Default None.
+        latency (latency.LatencyTracker): If given, each request is sent unmutated a few times, after pre_send(), when
+                                the first fuzzing run starts to measure how long the target takes to answer it,
+                                and measuring goes on with the unmutated requests sent before the fuzzed one.
+                                fuzz_single_case() sends nothing extra. recv() then waits a multiple of the
+                                usual latency instead of the connection's timeout; see Target.set_recv_timeout().
+                                Fuzzed requests answered unusually slowly are logged and recorded in
+                                latency_outliers. Default None.
+        render_cache (bool):    Reuse the data rendered for a request that is sent unmutated before the fuzzed one
+                                as long as its mutation state doesn't change, instead of rendering it for every test
+                                case. An edge callback drops the cached data of the request it leads to. Only enable
+                                it if pre_send(), post_send(), request callbacks and edge callbacks change no other
+                                request, nor state a request reads when rendered. Hits and misses are counted in
+                                render_cache_stats. Default False.
 
         log_level (int):        DEPRECATED Unused. Logger settings are now configured in fuzz_data_logger.
                                 Was once used to set the log level.
@@ -211,6 +306,17 @@ class Session(pgraph.Graph):
                  ignore_connection_reset=False,
                  ignore_connection_aborted=False,
                  target=None,
+                 coordinator=None,
+                 library_stats=None,
+                 coverage_feedback=False,
+                 dedupe=None,
+                 health_check_interval=1,
+                 canary_interval=0,
+                 case_timeout=None,
+                 phase_timeouts=None,
+                 pacing=None,
+                 latency=None,
+                 render_cache=False,
                  ):
         self._ignore_connection_reset = ignore_connection_reset
         self._ignore_connection_aborted = ignore_connection_aborted
@@ -232,8 +338,6 @@ class Session(pgraph.Graph):
         else:
             self._fuzz_data_logger = fuzz_data_logger
         self._check_data_received_each_request = check_data_received_each_request
-        # Flag used to cancel fuzzing for a given primitive:
-        self._skip_after_cur_test_case = False
 
         self.web_interface_thread = self.build_webapp_thread(port=self.web_port)
 
@@ -243,9 +347,45 @@ class Session(pgraph.Graph):
         self.targets = []
         self.netmon_results = {}
         self.procmon_results = {}
+        self.differential_results = {}
         self.is_paused = False
         self.crashing_primitives = {}
         self.on_failure = event_hook.EventHook()
+        self._parent_session = None
+        self._prerendered = {}
+        self._coordinator = coordinator
+        self._schedule_position = None
+        self._scheduler = None
+        self._schedule_state = None
+        self.library_stats = library_stats
+        self._case_crashed = False
+        self._case_timed_out = False
+        self.coverage_feedback = coverage_feedback
+        self.coverage_results = {}
+        self._case_new_edges = 0
+        self.dedupe = dedupe
+        self._case_duplicate = False
+        self.health_check_interval = health_check_interval
+        self.bisection_results = {}
+        self._health_batch = None
+        self._case_culprit = None
+        self._case_exhausted = False
+        self.canary_interval = canary_interval
+        self.canary_results = {}
+        self._canary_baseline = None
+        self._canary_exact = False
+        self._canary_current_interval = canary_interval
+        self._canary_suspects = []
+        self.hang_results = {}
+        self._watchdog = watchdog.Watchdog(timeout=case_timeout, phase_timeouts=phase_timeouts)
+        self.pacing = pacing
+        self.latency = latency
+        self.latency_outliers = {}
+        self._latency_measured = False
+        self.minimized_crashes = {}
+        self.render_cache = render_cache
+        self.render_cache_stats = collections.Counter()
+        self._render_cache = {}
 
         # import settings if they exist.
         self.import_file()
@@ -284,6 +424,10 @@ class Session(pgraph.Graph):
         """
         Add a target to the session. Multiple targets can be added for parallel fuzzing.
 
+        With more than one target, fuzz() starts one worker per target. Workers lease test cases one at a time, so
+        every test case runs once, on whichever target is free. All targets should therefore be instances of the same
+        system under test.
+
         Args:
             target (Target): Target to add to session
         """
@@ -365,18 +509,33 @@ class Session(pgraph.Graph):
         if not self.session_filename:
             return
 
+        # with a scheduler, test cases don't run in index order; resume from the position in the schedule instead.
+        if self._schedule_position is None:
+            resume_index = self.total_mutant_index
+            schedule_state = None
+        else:
+            resume_index = self._schedule_position
+            schedule_state = self._scheduler.state()
+
         data = {
             "session_filename": self.session_filename,
-            "skip": self.total_mutant_index,
+            "skip": resume_index,
             "sleep_time": self.sleep_time,
             "restart_sleep_time": self.restart_sleep_time,
             "restart_interval": self.restart_interval,
             "web_port": self.web_port,
             "crash_threshold": self.crash_threshold,
             "total_num_mutations": self.total_num_mutations,
-            "total_mutant_index": self.total_mutant_index,
+            "total_mutant_index": resume_index,
+            "schedule_state": schedule_state,
             "netmon_results": self.netmon_results,
             "procmon_results": self.procmon_results,
+            "differential_results": self.differential_results,
+            "coverage_results": self.coverage_results,
+            "canary_results": self.canary_results,
+            "hang_results": self.hang_results,
+            "latency_outliers": self.latency_outliers,
+            "minimized_crashes": self.minimized_crashes,
             "is_paused": self.is_paused
         }
 
@@ -384,23 +543,282 @@ class Session(pgraph.Graph):
         fh.write(zlib.compress(cPickle.dumps(data, protocol=2)))
         fh.close()
 
-    def fuzz(self):
+    def fuzz(self, processes=1, pipeline_depth=0, broadcast=False, scheduler=None):
         """Fuzz the entire protocol tree.
 
         Iterates through and fuzzes all fuzz cases, skipping according to
         self.skip and restarting based on self.restart_interval.
 
+        With more than one target, test cases are spread over all targets in
+        parallel; see _fuzz_parallel(). With broadcast=True, every test case is
+        sent to all targets instead, and differences between them are flagged;
+        see _fuzz_broadcast().
+
+        With processes > 1, test cases are split between that many forked
+        worker processes, each with its own target; see _fuzz_processes().
+        Not available on Windows, which can't fork.
+
+        With a coordinator, only test cases leased from the coordinator are
+        fuzzed; see _fuzz_leased().
+
+        With pipeline_depth > 0, a background thread renders up to that many
+        test cases ahead while the current one waits on the target; see
+        _iterate_pipelined(). Only for a single target in this process,
+        without a scheduler.
+
+        With a scheduler, test cases run in the order it chooses instead of
+        exhausting each node before moving on to the next, e.g. interleaving
+        all primitives of all nodes with schedulers.RoundRobinScheduler; see
+        _iterate_scheduled(). A scheduler applies to sequential and broadcast
+        fuzzing. self.skip then counts test cases in schedule order, so resume
+        a campaign with the same scheduler.
+
         If you want the web server to be available, your program must persist
         after calling this method. helpers.pause_for_signal() is
         available to this end.
 
+        Args:
+            processes (int): Number of worker processes. Default 1 (fuzz in this process).
+            pipeline_depth (int): Number of test cases to render ahead. Bounds the memory used for rendered test
+                cases. Default 0 (render each test case right before sending it).
+            broadcast (bool): Send every test case to all targets and compare their responses. Default False.
+            scheduler (schedulers.Scheduler): Decides the order of test cases. Default None (fuzz each node in turn).
+
+        Returns:
+            None
+
+        Raises:
+            ValueError: If a scheduler is given with processes > 1, a coordinator, or several targets without
+                broadcast, or if pipeline_depth is given with anything but a single target in this process.
+        """
+        if scheduler is not None:
+            if self._coordinator is not None:
+                raise ValueError("A scheduler can't be used with a coordinator.")
+            if processes > 1:
+                raise ValueError("A scheduler can't be used with processes > 1.")
+            if len(self.targets) > 1 and not broadcast:
+                raise ValueError("A scheduler can't be used with several targets, except with broadcast=True.")
+        if pipeline_depth > 0 and (self._coordinator is not None or processes > 1 or broadcast
+                                   or len(self.targets) > 1 or scheduler is not None):
+            raise ValueError("pipeline_depth only works with a single target, without a coordinator, processes > 1, "
+                             "broadcast or a scheduler.")
+
+        self.total_mutant_index = 0
+        self.total_num_mutations = self.num_mutations()
+        self._schedule_position = None
+        self._scheduler = None
+
+        try:
+            if self._coordinator is not None:
+                self._fuzz_leased()
+            elif processes > 1:
+                self._fuzz_processes(processes)
+            elif broadcast:
+                self._fuzz_broadcast(scheduler=scheduler)
+            elif len(self.targets) > 1:
+                self._fuzz_parallel()
+            elif scheduler is not None:
+                self._main_fuzz_loop(self._iterate_scheduled(scheduler))
+            elif pipeline_depth > 0:
+                self._main_fuzz_loop(self._iterate_pipelined(pipeline_depth))
+            else:
+                self._main_fuzz_loop(self._iterate_protocol())
+        finally:
+            if self.library_stats is not None:
+                self.library_stats.save()
+            if self.dedupe is not None:
+                self.dedupe.save()
+
+    def fuzz_concurrent(self, connection_factory, concurrency=10):
+        """Fuzz the entire protocol tree, with up to concurrency test cases in flight at once.
+
+        Meant for network services that serve many clients at once: while one test case waits for a response,
+        others are sent. Every test case in flight runs on its own connection, made by connection_factory, and is
+        rendered up front when it starts, so each has its own payloads. Log data of each test case is written to
+        fuzz_data_logger in one piece once it finishes, and failures are recorded in procmon_results under its index.
+
+        Targets added to the session are not used: pre_send(), post_send() and process/network monitors all work on
+        a single blocking Target, and a crash could not be attributed to one of the test cases in flight anyway.
+        Edge callbacks are called when a test case is rendered, with sock=None.
+
+        Skipping, sleep_time and the crash threshold work as with fuzz(). On resume, every test case up to the saved
+        skip value has finished.
+
+        Args:
+            connection_factory (callable): Called without arguments to make each IAsyncTargetConnection, e.g.
+                lambda: AsyncSocketConnection(host, port).
+            concurrency (int): Maximum number of test cases in flight. Default 10.
+
         Returns:
             None
         """
         self.total_mutant_index = 0
         self.total_num_mutations = self.num_mutations()
 
-        self._main_fuzz_loop(self._iterate_protocol())
+        # web
+        self.server_init()
+
+        cases = self._iterate_protocol(need_target=False)
+        done = leases.LeaseTable(first_index=1, last_index=self.total_num_mutations)
+        done.skip(1, self.skip + 1)
+
+        @gen.coroutine
+        def run_workers():
+            yield [self._concurrent_worker(cases, connection_factory, done) for _ in range(concurrency)]
+
+        # tornado coroutines run on their own IOLoop; the web interface has IOLoop.instance().
+        io_loop = IOLoop()
+        try:
+            io_loop.run_sync(run_workers)
+        except KeyboardInterrupt:
+            self._fuzz_data_logger.log_error("SIGINT received ... exiting")
+            raise
+        except sex.BoofuzzTargetConnectionFailedError:
+            self._fuzz_data_logger.log_error(
+                "Cannot connect to target; target presumed down."
+                " Note: Normally a failure should be detected, and the target reset."
+                " This error may mean you have no restart method configured, or your error"
+                " detection is not working.")
+        finally:
+            io_loop.close(all_fds=True)
+            if self.fuzz_node is not None:
+                self.fuzz_node.reset()
+            self.total_mutant_index = done.watermark
+            self.export_file()
+
+    @gen.coroutine
+    def _concurrent_worker(self, cases, connection_factory, done):
+        """Run test cases from the shared iterator cases on one connection until none are left.
+
+        Args:
+            cases: Test case iterator (see _iterate_protocol()), shared by all workers.
+            connection_factory (callable): See fuzz_concurrent().
+            done (leases.LeaseTable): Test case indices finished so far.
+        """
+        connection = connection_factory()
+        for (path,) in cases:
+            index = self.total_mutant_index
+            mutant = self.fuzz_node.mutant
+
+            # render right away: the next test case mutates the same nodes.
+            fuzz_data_logger = self._fuzz_data_logger.worker_logger()
+            self._open_test_case(fuzz_data_logger, path)
+            steps = []
+            for e in path:
+                node = self.nodes[e.dst]
+                data = None
+                if e.callback:
+                    data = e.callback(self, node, e, None)
+                if not data:
+                    data = node.render()
+                if e is path[-1]:
+                    description = "Fuzzing Node '{0}'".format(node.name)
+                else:
+                    description = "Prep Node '{0}'".format(node.name)
+                steps.append((description, node, data))
+
+            while self.is_paused:
+                yield self._sleep(1)
+
+            try:
+                yield self._transmit_concurrent(connection, fuzz_data_logger, steps)
+            except sex.BoofuzzTargetConnectionFailedError:
+                raise
+            except Exception as e:
+                # fail the test case, not the campaign.
+                fuzz_data_logger.log_fail("Test case raised an unexpected error: {0!r}".format(e))
+            finally:
+                fuzz_data_logger.flush()
+
+            done.skip(index, index + 1)
+            self._process_concurrent_failures(index, mutant, fuzz_data_logger, done)
+
+            if self.sleep_time:
+                yield self._sleep(self.sleep_time)
+
+    @gen.coroutine
+    def _transmit_concurrent(self, connection, fuzz_data_logger, steps):
+        """Send the rendered steps of one test case on connection, with the checks of transmit().
+
+        Args:
+            connection (iasync_target_connection.IAsyncTargetConnection): Connection for the test case.
+            fuzz_data_logger (fuzz_logger.WorkerFuzzLogger): Logger of the test case.
+            steps (list of tuple): (test step description, node, rendered data) for each node on the path.
+        """
+        yield connection.open()
+        try:
+            for description, node, data in steps:
+                fuzz_data_logger.open_test_step(description)
+                fuzz_data_logger.log_send(data)
+                num_sent = yield connection.send(data)
+                fuzz_data_logger.log_info("{0} bytes sent".format(num_sent))
+
+                if self._check_data_received_each_request:
+                    fuzz_data_logger.log_info("Receiving...")
+                    received = yield connection.recv(RECV_MAX_BYTES)
+                    fuzz_data_logger.log_recv(received)
+                    node.callback(received)
+                    fuzz_data_logger.log_check("Verify some data was received from the target.")
+
+                    if not received:
+                        fuzz_data_logger.log_fail("Nothing received from target.")
+                    else:
+                        fuzz_data_logger.log_pass("Some data received from target.")
+        except sex.BoofuzzTargetConnectionReset:
+            if self._ignore_connection_reset:
+                fuzz_data_logger.log_info("Target connection reset.")
+            else:
+                fuzz_data_logger.log_fail("Target connection reset.")
+        except sex.BoofuzzTargetConnectionAborted as e:
+            message = ("Target connection lost (socket error: {0} {1}): You may have a network issue, or an issue "
+                       "with firewalls or anti-virus. Try disabling your firewall.".format(e.socket_errno,
+                                                                                           e.socket_errmsg))
+            if self._ignore_connection_aborted:
+                fuzz_data_logger.log_info(message)
+            else:
+                fuzz_data_logger.log_fail(message)
+        finally:
+            yield connection.close()
+
+    def _process_concurrent_failures(self, index, mutant, fuzz_data_logger, done):
+        """Record failures of a test case run by fuzz_concurrent(), like _process_failures() without the restart.
+
+        Args:
+            index (int): Test case index.
+            mutant: Primitive mutated by the test case.
+            fuzz_data_logger (fuzz_logger.WorkerFuzzLogger): Logger of the test case.
+            done (leases.LeaseTable): Test case indices finished so far; exhausted test cases are added.
+        """
+        crash_synopses = fuzz_data_logger.failed_test_cases.get(fuzz_data_logger.current_test_case_id, [])
+        if not crash_synopses:
+            return
+
+        self.crashing_primitives[mutant] = self.crashing_primitives.get(mutant, 0) + 1
+
+        if len(crash_synopses) > 1:
+            synopsis = "({0} reports) {1}".format(len(crash_synopses), "\n".join(crash_synopses))
+        else:
+            synopsis = "\n".join(crash_synopses)
+        self.procmon_results[index] = synopsis
+
+        # exhaust the primitive if test cases for it are still being started.
+        if self.crashing_primitives[mutant] >= self.crash_threshold \
+                and mutant is self.fuzz_node.mutant \
+                and not isinstance(mutant, (primitives.Group, blocks.Repeat)):
+            skipped = mutant.exhaust()
+            done.skip(self.total_mutant_index + 1, self.total_mutant_index + skipped + 1)
+            self.total_mutant_index += skipped
+            self.fuzz_node.mutant_index += skipped
+
+    @staticmethod
+    def _sleep(seconds):
+        """
+        Returns:
+            Future: Resolves to None after seconds, on the current IOLoop.
+        """
+        future = Future()
+        IOLoop.current().call_later(seconds, lambda: future.set_result(None))
+        return future
 
     def fuzz_single_node_by_path(self, node_names):
         """Fuzz a particular node via the path in node_names.
@@ -410,10 +828,11 @@ class Session(pgraph.Graph):
         """
         node_edges = self._path_names_to_edges(node_names=node_names)
 
-        self.total_mutant_index = 0
         self.total_num_mutations = self.nodes[node_edges[-1].dst].num_mutations()
+        # skip until we pass self.skip
+        self.total_mutant_index = min(self.skip, self.total_num_mutations)
 
-        self._main_fuzz_loop(self._iterate_single_node(node_edges))
+        self._main_fuzz_loop(self._iterate_single_node(node_edges, start=self.total_mutant_index + 1))
 
     def fuzz_by_name(self, name):
         """Fuzz a particular test case or node by name.
@@ -438,40 +857,340 @@ class Session(pgraph.Graph):
         self.total_mutant_index = 0
         self.total_num_mutations = 1
 
-        self._main_fuzz_loop(self._iterate_single_case_by_index(mutant_index))
+        self._main_fuzz_loop(self._iterate_single_case_by_index(mutant_index), measure_latency=False)
+
+    def minimize_crash(self, mutant_index, targets=None, max_chunks=256):
+        """Find a small message that crashes the target like the fuzzed message of a test case, by delta debugging.
+
+        The path to the test case is replayed with ever smaller fuzzed messages, checking each for a crash with the
+        process monitor. Reductions are tried in this order:
+
+        1. Primitives mutated together (e.g. by s_combinations) are reverted to their original values one at a time.
+        2. The value of each mutated primitive is cut to its shortest crashing prefix, then has chunks removed. The
+           request is rendered around it, so sizes and checksums stay right.
+        3. Chunks are removed from the rendered message itself.
+
+        Replays run concurrently on all targets given, each with its own process monitor. A target is only restarted
+        after a replay crashed it. Edge callbacks are not called, and replays are not logged.
+
+        Args:
+            mutant_index (int): Test case that crashed the target.
+            targets (list of Target): Targets to replay on. Default self.targets.
+            max_chunks (int): Most chunks a value or message is cut into for removal, see minimizer.ddmin(). Bounds the
+                number of replays on long messages; values of more than max_chunks bytes may be left with removable
+                bytes. None cuts down to single bytes. Default 256.
+
+        Returns:
+            str: The smallest crashing message found, also recorded in minimized_crashes, or None if the test case
+                doesn't crash the target when replayed.
+        """
+        if targets is None:
+            targets = self.targets
+        if not targets or not all(target.procmon for target in targets):
+            raise sex.BoofuzzError("Crash minimization needs a process monitor on every target.")
+
+        offsets = self._fuzz_case_offsets()
+        self._fuzz_data_logger.open_test_step("Minimizing test case #{0}".format(mutant_index))
+
+        with self._replaying(targets, offsets):
+            path = self._seek_case(mutant_index, offsets)
+            prep_payloads = [self.nodes[e.dst].render() for e in path[:-1]]
+            first_crashing = self._first_crashing_function(targets, mutant_index, prep_payloads)
+            message = self.fuzz_node.render()
+            num_bytes = len(message)
+
+            if first_crashing([message]) is None:
+                result = None
+            else:
+                self._minimize_fields(first_crashing, len(targets), max_chunks)
+                result = minimizer.ddmin(self.fuzz_node.render(), first_crashing, width=len(targets),
+                                         max_chunks=max_chunks)
+
+        if result is None:
+            self._fuzz_data_logger.log_info("Test case #{0} does not crash the target when replayed.".format(
+                mutant_index))
+            return None
+
+        self.minimized_crashes[mutant_index] = result
+        self._fuzz_data_logger.log_info("Test case #{0} minimized from {1} to {2} bytes.".format(
+            mutant_index, num_bytes, len(result)))
+        return result
+
+    def _minimize_fields(self, first_crashing, width, max_chunks):
+        """Reduce the mutated primitives of self.fuzz_node, keeping the rest of the request rendered around them.
+
+        Args:
+            first_crashing (callable): Tells which of a list of messages crashes first; see _first_crashing_function().
+            width (int): Number of candidates worth trying at once.
+            max_chunks (int): See minimize_crash().
+        """
+        request = self.fuzz_node
+        mutated = [item for item in request.walk()
+                   if isinstance(item, primitives.BasePrimitive) and item._value != item._original_value]
+
+        def render_with(primitive, value):
+            saved = primitive._value
+            primitive._value = value
+            rendered = request.render()
+            primitive._value = saved
+            return rendered
+
+        # revert primitives mutated together, one at a time, as long as the crash remains.
+        while len(mutated) > 1:
+            crashing = first_crashing([render_with(item, item._original_value) for item in mutated])
+            if crashing is None:
+                break
+            mutated[crashing]._value = mutated[crashing]._original_value
+            del mutated[crashing]
+
+        for item in mutated:
+            if not isinstance(item._value, str):
+                continue
+
+            def first_crashing_value(values, item=item):
+                return first_crashing([render_with(item, value) for value in values])
+
+            item._value = minimizer.shrink_length(item._value, first_crashing_value, width=width)
+            item._value = minimizer.ddmin(item._value, first_crashing_value, width=width, max_chunks=max_chunks)
+
+    def _first_crashing_function(self, targets, mutant_index, prep_payloads):
+        """
+        Args:
+            targets (list of Target): Targets to replay on, each with a process monitor.
+            mutant_index (int): Test case index to report to the process monitors.
+            prep_payloads (list of str): Messages to send before the fuzzed one.
+
+        Returns:
+            callable: Called with a list of fuzzed messages; replays them, up to one per target at a time, and returns
+                the position of the first that crashes the target, or None.
+        """
+        def replay(target, message):
+            return self._replay_messages(target, mutant_index, [prep_payloads + [message]])
+
+        def first_crashing(messages):
+            for start in range(0, len(messages), len(targets)):
+                batch = messages[start:start + len(targets)]
+                results = [False] * len(batch)
+                errors = []
+
+                def run(position):
+                    try:
+                        results[position] = replay(targets[position], batch[position])
+                    except Exception:
+                        errors.append(sys.exc_info())
+
+                if len(batch) == 1:
+                    run(0)
+                else:
+                    threads = [threading.Thread(target=run, args=(position,)) for position in range(len(batch))]
+                    for thread in threads:
+                        thread.start()
+                    for thread in threads:
+                        thread.join()
+
+                if errors:
+                    raise errors[0][0], errors[0][1], errors[0][2]
+
+                if any(results):
+                    return start + results.index(True)
+            return None
+
+        return first_crashing
+
+    def verify_crashes(self, repetitions=3, context=1, targets=None, report_filename=None):
+        """Replay every crash in procmon_results, e.g. loaded from a session file, to tell real bugs from noise.
+
+        Each crashing test case is replayed repetitions times on its own, and repetitions times right after the context
+        test cases before it. Each replay checks for a crash with the process monitor. Every crash is then classified
+        by verification.VerificationResult.classification as reproducible, flaky, order-dependent or not
+        reproducible.
+
+        Replays run in parallel, one per target. A target is only restarted after a replay crashed it. Edge callbacks
+        are not called, and replays are not logged.
+
+        Args:
+            repetitions (int): Number of replays of each kind per crash. Default 3.
+            context (int): Number of test cases to replay before the crashing one for the replays in context. Default
+                1. 0 skips replays in context.
+            targets (list of Target): Targets to replay on, each with a process monitor. Default self.targets.
+            report_filename (str): If given, a CSV report is written there; see verification.write_report().
+
+        Returns:
+            dict: verification.VerificationResult by test case index.
+        """
+        if targets is None:
+            targets = self.targets
+        if not targets or not all(target.procmon for target in targets):
+            raise sex.BoofuzzError("Crash verification needs a process monitor on every target.")
+
+        offsets = self._fuzz_case_offsets()
+        results = dict((mutant_index, verification.VerificationResult(mutant_index=mutant_index, synopsis=synopsis))
+                       for mutant_index, synopsis in self.procmon_results.items())
+        self._fuzz_data_logger.open_test_step("Verifying {0} crashes".format(len(results)))
+
+        with self._replaying(targets, offsets):
+            # render in this thread; replays only send.
+            jobs = Queue.Queue()
+            for mutant_index in sorted(results):
+                alone = [self._case_messages(mutant_index, offsets)]
+                in_context = [self._case_messages(index, offsets)
+                              for index in range(max(1, mutant_index - context), mutant_index)]
+                for _ in range(repetitions):
+                    jobs.put((mutant_index, False, alone))
+                    if in_context:
+                        jobs.put((mutant_index, True, in_context + alone))
+
+            lock = threading.Lock()
+            errors = []
+
+            def work(target):
+                while True:
+                    try:
+                        mutant_index, with_context, messages = jobs.get_nowait()
+                    except Queue.Empty:
+                        return
+                    try:
+                        crashed = self._replay_messages(target, mutant_index, messages)
+                    except Exception:
+                        errors.append(sys.exc_info())
+                        return
+                    with lock:
+                        result = results[mutant_index]
+                        if with_context:
+                            result.runs_in_context += 1
+                            result.crashes_in_context += crashed
+                        else:
+                            result.runs_alone += 1
+                            result.crashes_alone += crashed
+
+            threads = [threading.Thread(target=work, args=(target,)) for target in targets]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            if errors:
+                raise errors[0][0], errors[0][1], errors[0][2]
+
+        for mutant_index in sorted(results):
+            self._fuzz_data_logger.log_info("Test case #{0}: {1}".format(mutant_index,
+                                                                          results[mutant_index].classification))
+        if report_filename is not None:
+            verification.write_report(results, report_filename)
+        return results
+
+    @contextlib.contextmanager
+    def _replaying(self, targets, offsets):
+        """Context manager for replaying test cases outside of fuzzing: logs of the session and of targets go
+        nowhere, and the session is put back into the test case it was in afterwards.
+
+        Args:
+            targets (list of Target): Targets to replay on.
+            offsets (list): Result of _fuzz_case_offsets().
+        """
+        previous_index = self.total_mutant_index if self.fuzz_node is not None else None
+        saved_logger = self._fuzz_data_logger
+        self._fuzz_data_logger = fuzz_logger.FuzzLogger()
+        for target in targets:
+            target.set_fuzz_data_logger(self._fuzz_data_logger)
+
+        try:
+            yield
+        finally:
+            self._fuzz_data_logger = saved_logger
+            for target in targets:
+                target.set_fuzz_data_logger(saved_logger)
+            if previous_index is not None:
+                self._seek_case(previous_index, offsets)
+            elif self.fuzz_node is not None:
+                self.fuzz_node.reset()
+                self.fuzz_node = None
+
+    def _case_messages(self, mutant_index, offsets):
+        """
+        Returns:
+            list of str: Messages of a test case, rendered without edge callbacks.
+        """
+        path = self._seek_case(mutant_index, offsets)
+        return [self._render_node(self.nodes[e.dst]) for e in path]
+
+    def _replay_messages(self, target, mutant_index, cases):
+        """Send the messages of one or more test cases, each on its own connection, and ask the process monitor
+        whether the target crashed. A crashed target is restarted.
+
+        Args:
+            target (Target): Target to replay on, with a process monitor.
+            mutant_index (int): Test case index to report to the process monitor.
+            cases (list of list of str): Messages of each test case.
+
+        Returns:
+            bool: True if the target crashed.
+        """
+        target.procmon.pre_send(mutant_index)
+        try:
+            for messages in cases:
+                target.open()
+                try:
+                    for message in messages:
+                        target.send(message)
+                        if self._check_data_received_each_request:
+                            target.recv(RECV_MAX_BYTES)
+                finally:
+                    target.close()
+                self._sleep_between_cases(self._fuzz_data_logger)
+        except (sex.BoofuzzTargetConnectionFailedError,
+                sex.BoofuzzTargetConnectionReset,
+                sex.BoofuzzTargetConnectionAborted):
+            pass
+
+        crashed = not target.procmon.post_send()
+        if crashed:
+            self.restart_target(target)
+        return crashed
 
-    def _main_fuzz_loop(self, fuzz_case_iterator):
+    def _main_fuzz_loop(self, fuzz_case_iterator, fuzz_current_case=None, measure_latency=True):
         """Execute main fuzz logic; takes an iterator of test cases.
 
         Preconditions: `self.total_mutant_index` and `self.total_num_mutations` are set properly.
 
         Args:
             fuzz_case_iterator (Iterable): An iterator that walks through fuzz cases.
+            fuzz_current_case (callable): Called with the items of fuzz_case_iterator to run each test case.
+                Default _fuzz_current_case().
+            measure_latency (bool): Measure the latency baseline first, if self.latency is set and it has not been
+                measured yet. Default True.
 
         Returns:
             None
         """
+        if fuzz_current_case is None:
+            fuzz_current_case = self._fuzz_current_case
+            if self.health_check_interval > 1:
+                self._health_batch = []
 
         # web
         self.server_init()
 
         try:
+            if self.canary_interval:
+                self._start_canaries(self.targets[0])
+
+            if self.latency is not None and measure_latency and not self._latency_measured:
+                self._measure_latency_baseline(self.targets[0])
+                self._latency_measured = True
+
             num_cases_actually_fuzzed = 0
             for fuzz_args in fuzz_case_iterator:
-                # skip until we pass self.skip
-                if self.total_mutant_index <= self.skip:
-                    continue
+                self._check_restart_interval(num_cases_actually_fuzzed)
 
-                # Check restart interval
-                if num_cases_actually_fuzzed \
-                        and self.restart_interval \
-                        and num_cases_actually_fuzzed % self.restart_interval == 0:
-                    self._fuzz_data_logger.open_test_step("restart interval of %d reached" % self.restart_interval)
-                    self.restart_target(self.targets[0])
-
-                self._fuzz_current_case(*fuzz_args)
+                fuzz_current_case(*fuzz_args)
 
                 num_cases_actually_fuzzed += 1
+
+                if self.canary_interval and not self._case_duplicate:
+                    self._count_canary(self.targets[0])
+
+            self._flush_health_batch()
         except KeyboardInterrupt:
             # TODO: should wait for the end of the ongoing test case, and stop gracefully netmon and procmon
             self.export_file()
@@ -488,133 +1207,805 @@ class Session(pgraph.Graph):
                 " This error may mean you have no restart method configured, or your error"
                 " detection is not working.")
             self.export_file()
+        finally:
+            self._health_batch = None
 
-    def import_file(self):
+    def _check_restart_interval(self, num_cases_actually_fuzzed):
+        """Restart the targets if the restart interval is reached.
+
+        Args:
+            num_cases_actually_fuzzed (int): Number of test cases run on the targets so far.
         """
-        Load various object values from disk.
+        if num_cases_actually_fuzzed \
+                and self.restart_interval \
+                and num_cases_actually_fuzzed % self.restart_interval == 0:
+            # a crash in the pending batch would go unnoticed after the restart.
+            self._flush_health_batch()
+            self._fuzz_data_logger.open_test_step("restart interval of %d reached" % self.restart_interval)
+            for target in self.targets:
+                self.restart_target(target)
+
+    def _start_canaries(self, target):
+        """Capture the canary baseline, if not done yet, and start counting test cases towards the next canary.
 
-        @see: export_file()
+        Args:
+            target (Target): Target to send the canary to.
+
+        Raises:
+            sex.BoofuzzTargetConnectionFailedError: If the target doesn't take the baseline canary.
         """
-        if self.session_filename is None:
+        self._canary_current_interval = self.canary_interval
+        self._canary_suspects = []
+        if self._canary_baseline is not None:
             return
 
-        try:
-            with open(self.session_filename, "rb") as f:
-                data = cPickle.loads(zlib.decompress(f.read()))
-        except (IOError, zlib.error, cPickle.UnpicklingError):
-            return
+        self._fuzz_data_logger.open_test_step("Canary baseline")
+        first = self._send_canary(target)
+        second = self._send_canary(target)
+        if first is None or second is None:
+            raise sex.BoofuzzTargetConnectionFailedError("Canary baseline could not be sent.")
 
-        # update the skip variable to pick up fuzzing from last test case.
-        self.skip = data["total_mutant_index"]
-        self.session_filename = data["session_filename"]
-        self.sleep_time = data["sleep_time"]
-        self.restart_sleep_time = data["restart_sleep_time"]
-        self.restart_interval = data["restart_interval"]
-        self.web_port = data["web_port"]
-        self.crash_threshold = data["crash_threshold"]
-        self.total_num_mutations = data["total_num_mutations"]
-        self.total_mutant_index = data["total_mutant_index"]
-        self.netmon_results = data["netmon_results"]
-        self.procmon_results = data["procmon_results"]
-        self.is_paused = data["is_paused"]
+        self._canary_baseline = first
+        self._canary_exact = first == second
+        self._fuzz_data_logger.log_info("Canary response is {0}; comparing {1}.".format(
+            "stable" if self._canary_exact else "unstable",
+            "them byte for byte" if self._canary_exact else "only whether any data is received"))
 
-    # noinspection PyMethodMayBeStatic
-    def log(self, msg, level=1):
-        raise Exception("Depreciated!")
+    def _count_canary(self, target):
+        """Count the current test case towards the next canary and send the canary when it is due.
 
-    def num_mutations(self, this_node=None, path=()):
+        Args:
+            target (Target): Target to send the canary to.
         """
-        Number of total mutations in the graph. The logic of this routine is identical to that of fuzz(). See fuzz()
-        for inline comments. The member variable self.total_num_mutations is updated appropriately by this routine.
+        self._canary_suspects.append(self.total_mutant_index)
+        if len(self._canary_suspects) < self._canary_current_interval:
+            return
+
+        suspects = self._canary_suspects
+        self._canary_suspects = []
+
+        self._fuzz_data_logger.open_test_step("Canary")
+        if self._canary_matches(self._send_canary(target)):
+            self._fuzz_data_logger.log_pass("Canary answered like the baseline.")
+            self._canary_current_interval = min(self.canary_interval, self._canary_current_interval * 2)
+            return
+
+        self._fuzz_data_logger.log_fail("Canary failed; suspect test cases #{0}-#{1}.".format(suspects[0],
+                                                                                           suspects[-1]))
+        self.canary_results[self.total_mutant_index] = suspects
+        self._canary_current_interval = max(1, self._canary_current_interval // 2)
+
+        # a crash in the pending batch would go unnoticed after the restart.
+        self._flush_health_batch()
+        self.restart_target(target)
+
+    def _send_canary(self, target):
+        """Send the first request connected to the root with original values and receive its response.
 
         Args:
-            this_node (request (node)): Current node that is being fuzzed. Default None.
-            path (list): Nodes along the path to the current one being fuzzed. Default [].
+            target (Target): Target to send the canary to.
 
         Returns:
-            int: Total number of mutations in this session.
+            str: Data received, or None if the connection failed.
         """
+        node = self.nodes[min(edge.dst for edge in self.edges_from(self.root.id))]
 
-        if this_node is None:
-            this_node = self.root
-            self.total_num_mutations = 0
+        try:
+            target.open()
+            try:
+                target.send(node.original_value)
+                return target.recv(RECV_MAX_BYTES)
+            finally:
+                target.close()
+        except (sex.BoofuzzTargetConnectionFailedError,
+                sex.BoofuzzTargetConnectionReset,
+                sex.BoofuzzTargetConnectionAborted) as e:
+            self._fuzz_data_logger.log_info("Canary connection failed: {0}".format(e))
+            return None
+
+    def _canary_matches(self, response):
+        """
+        Returns:
+            bool: Whether the response to a canary matches the baseline.
+        """
+        if response is None:
+            return False
+        if self._canary_exact:
+            return response == self._canary_baseline
+        return bool(response) or not self._canary_baseline
 
-        if isinstance(path, tuple):
-            path = list(path)
+    def _fuzz_broadcast(self, scheduler=None):
+        """Fuzz the entire protocol tree, sending every test case to all targets and comparing the outcomes.
 
-        for edge in self.edges_from(this_node.id):
-            next_node = self.nodes[edge.dst]
-            self.total_num_mutations += next_node.num_mutations()
+        Meant for differential fuzzing of several implementations of the same protocol. Each test case is rendered
+        once, then run on every target at the same time, each in its own thread on a copy of the session (see
+        _worker_session()). Log data of each target is written as a test step "Target <n>" of the one test case.
 
-            if edge.src != self.root.id:
-                path.append(edge)
+        If the received data or the crash status (any failure) differ between targets, the test case fails with
+        "Targets differ" and is recorded in self.differential_results, keyed by test case index, as a dict with the
+        "responses" (list per target of data received after each node) and "crashed" (list per target of bool).
 
-            self.num_mutations(next_node, path)
+        Preconditions: `self.total_num_mutations` is set properly.
 
-        # finished with the last node on the path, pop it off the path stack.
-        if path:
-            path.pop()
+        Args:
+            scheduler (schedulers.Scheduler): Decides the order of test cases. Default None (fuzz each node in turn).
+        """
+        workers = [self._worker_session(target) for target in self.targets]
+        offsets = self._fuzz_case_offsets()
 
-        return self.total_num_mutations
+        if scheduler is None:
+            fuzz_case_iterator = self._iterate_protocol()
+        else:
+            fuzz_case_iterator = self._iterate_scheduled(scheduler)
 
-    def pause(self):
-        """
-        If that pause flag is raised, enter an endless loop until it is lowered.
-        """
-        while 1:
-            if self.is_paused:
-                time.sleep(1)
-            else:
-                break
+        self._main_fuzz_loop(fuzz_case_iterator,
+                             fuzz_current_case=lambda path: self._fuzz_current_case_broadcast(path, workers, offsets))
 
-    def poll_pedrpc(self, target):
-        """
-        Poll the PED-RPC endpoints (netmon, procmon etc...) for the target.
+    def _fuzz_current_case_broadcast(self, path, workers, offsets):
+        """Run the current test case on every target of a broadcast campaign. See _fuzz_broadcast().
 
         Args:
-            target (Target): Session target whose PED-RPC services we are polling
+            path (list of Connection): Path to take to get to the target node.
+            workers (list of Session): Session copy of each target, from _worker_session().
+            offsets (list): Result of Session._fuzz_case_offsets().
         """
-        # kill the pcap thread and see how many bytes the sniffer recorded.
-        if target.netmon:
-            captured_bytes = target.netmon.post_send()
-            self._fuzz_data_logger.log_info(
-                "netmon captured %d bytes for test case #%d" % (captured_bytes, self.total_mutant_index))
-            self.netmon_results[self.total_mutant_index] = captured_bytes
+        self.pause()  # only pauses conditionally
 
-        # check if our fuzz crashed the target. procmon.post_send() returns False if the target crashes.
-        if target.procmon:
-            self._fuzz_data_logger.open_test_step("Contact process monitor")
-            self._fuzz_data_logger.log_check("procmon.post_send()")
-            if target.procmon.post_send():
-                self._fuzz_data_logger.log_pass("No crash detected.")
-            else:
-                self._fuzz_data_logger.log_fail(
-                    "procmon detected crash on test case #{0}: {1}".format(self.total_mutant_index,
-                                                                           target.procmon.get_crash_synopsis()))
+        self._open_test_case(self._fuzz_data_logger, path)
+        test_case_id = self._fuzz_data_logger.current_test_case_id
 
-    def _process_failures(self, target):
-        """Process any failure sin self.crash_synopses.
+        # render once for all targets. nodes after an edge with a callback are rendered by each target.
+        rendered = dict((e.dst, self._render_node(self.nodes[e.dst])) for e in path if not e.callback)
 
-        If self.crash_synopses contains any entries, perform these failure-related actions:
-         - log failure summary if needed
-         - save failures to self.procmon_results (for website)
-         - exhaust node if crash threshold is reached
-         - target restart
+        outcomes = [None] * len(workers)
 
-        Should be called after each fuzz test case.
+        def run(i):
+            outcomes[i] = self._broadcast_to_target(i, workers[i], path, rendered, test_case_id, offsets)
 
-        Args:
-            target (Target): Target to restart if failure occurred.
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(len(workers))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
 
-        Returns:
-            None
-        """
-        crash_synopses = self._fuzz_data_logger.failed_test_cases.get(self.total_mutant_index, [])
-        if len(crash_synopses) > 0:
-            self._fuzz_data_logger.open_test_step("Failure summary")
+        for i, outcome in enumerate(outcomes):
+            if isinstance(outcome, tuple):
+                raise outcome[0], outcome[1], outcome[2]
+            outcome["fuzz_data_logger"].flush()
 
-            # retrieve the primitive that caused the crash and increment it's individual crash count.
+        crash_synopses = []
+        for i, outcome in enumerate(outcomes):
+            crash_synopses.extend("Target {0}: {1}".format(i, synopsis) for synopsis in outcome["crash_synopses"])
+
+        responses = [outcome["responses"] for outcome in outcomes]
+        crashed = [bool(outcome["crash_synopses"]) for outcome in outcomes]
+        self._fuzz_data_logger.open_test_step("Compare targets")
+        self._fuzz_data_logger.log_check("Responses and crash status are the same on every target.")
+        if len(set(map(tuple, responses))) > 1 or len(set(crashed)) > 1:
+            self.differential_results[self.total_mutant_index] = {"responses": responses, "crashed": crashed}
+            self._fuzz_data_logger.log_fail("Targets differ. Crashed: {0}.".format(crashed))
+        else:
+            self._fuzz_data_logger.log_pass("Targets agree.")
+
+        if crash_synopses:
+            self._fuzz_data_logger.open_test_step("Failure summary")
             self.crashing_primitives[self.fuzz_node.mutant] = self.crashing_primitives.get(self.fuzz_node.mutant, 0) + 1
+            self.procmon_results[self.total_mutant_index] = "\n".join(crash_synopses)
+            self._fuzz_data_logger.log_info(crash_synopses[0])
+
+            if self.crashing_primitives[self.fuzz_node.mutant] >= self.crash_threshold \
+                    and not isinstance(self.fuzz_node.mutant, (primitives.Group, blocks.Repeat)):
+                skipped = self.fuzz_node.mutant.exhaust()
+                self._fuzz_data_logger.open_test_step(
+                    "Crash threshold reached for this primitive, exhausting %d mutants." % skipped
+                )
+                self.total_mutant_index += skipped
+                self.fuzz_node.mutant_index += skipped
+                self._case_exhausted = True
+
+            for worker, crash in zip(workers, crashed):
+                if crash:
+                    self.restart_target(worker.targets[0])
+
+        self.export_file()
+
+    def _broadcast_to_target(self, number, worker, path, rendered, test_case_id, offsets):
+        """Run the current test case on the target of worker. Called in a thread by _fuzz_current_case_broadcast().
+
+        Args:
+            number (int): Number of the target.
+            worker (Session): Session copy of the target, from _worker_session().
+            path (list of Connection): Path to take to get to the target node.
+            rendered (dict): Data rendered for each node on the path, by node id.
+            test_case_id (str): Current test case in this session's fuzz_data_logger.
+            offsets (list): Result of Session._fuzz_case_offsets().
+
+        Returns:
+            dict: "fuzz_data_logger" (WorkerFuzzLogger with the buffered log data), "responses" (tuple of data
+                received after each node) and "crash_synopses" (failures logged for this target), or sys.exc_info()
+                if an exception was raised.
+        """
+        fuzz_data_logger = self._fuzz_data_logger.worker_logger(test_case_id=test_case_id)
+        try:
+            worker._fuzz_data_logger = fuzz_data_logger
+            target = worker.targets[0]
+            target.set_fuzz_data_logger(fuzz_data_logger=fuzz_data_logger)
+
+            # seek the target's own nodes too, for edge callbacks and nodes they render.
+            worker._seek_case(self.total_mutant_index, offsets)
+            worker._prerendered = rendered
+
+            fuzz_data_logger.open_test_step("Target {0}".format(number))
+            if target.procmon:
+                target.procmon.pre_send(self.total_mutant_index)
+            if target.netmon:
+                target.netmon.pre_send(self.total_mutant_index)
+
+            target.open()
+            worker.pre_send(target)
+
+            responses = []
+            for e in path:
+                node = worker.nodes[e.dst]
+                if e is path[-1]:
+                    fuzz_data_logger.open_test_step("Target {0}: Fuzzing Node '{1}'".format(number, node.name))
+                else:
+                    fuzz_data_logger.open_test_step("Target {0}: Prep Node '{1}'".format(number, node.name))
+                worker.last_recv = None
+                worker.transmit(target, node, e)
+                responses.append(worker.last_recv)
+
+            fuzz_data_logger.open_test_step("Target {0}: Calling post_send function:".format(number))
+            try:
+                worker.post_send(target=target, fuzz_data_logger=fuzz_data_logger, session=worker, sock=target)
+            except Exception as e:
+                raise sex.BoofuzzError("Custom post_send method raised uncaught Exception.", e), None, sys.exc_info()[2]
+
+            target.close()
+
+            fuzz_data_logger.open_test_step("Target {0}: Sleep between tests.".format(number))
+            self._sleep_between_cases(fuzz_data_logger)
+
+            worker.poll_pedrpc(target)
+
+            return {
+                "fuzz_data_logger": fuzz_data_logger,
+                "responses": tuple(responses),
+                "crash_synopses": fuzz_data_logger.failures,
+            }
+        except Exception:
+            fuzz_data_logger.flush()
+            return sys.exc_info()
+
+    def _fuzz_parallel(self):
+        """Fuzz the entire protocol tree with one worker thread per target.
+
+        Test case indices are leased to the workers one at a time from a LeaseTable, so faster targets get through
+        more test cases. Each worker runs on its own copy of the session (see _worker_session()); failures, procmon
+        and netmon results and log data all end up in this session and its fuzz_data_logger.
+
+        Since test cases finish out of order, total_mutant_index (and the skip value saved by export_file()) is the
+        highest index up to which every test case has finished.
+
+        Preconditions: `self.total_num_mutations` is set properly.
+        """
+        self._check_fuzz_preconditions()
+
+        # web
+        self.server_init()
+
+        offsets = self._fuzz_case_offsets()
+        lease_table = leases.LeaseTable(first_index=self.skip + 1, last_index=self.total_num_mutations)
+        workers = [_TargetWorker(session=self, target=target, lease_table=lease_table, offsets=offsets)
+                   for target in self.targets]
+
+        for worker in workers:
+            worker.start()
+
+        try:
+            for worker in workers:
+                while worker.is_alive():
+                    # join with a timeout so that KeyboardInterrupt gets through.
+                    worker.join(1)
+                    self.total_mutant_index = lease_table.watermark
+                    self.export_file()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.stop()
+            for worker in workers:
+                worker.join()
+            self.total_mutant_index = lease_table.watermark
+            self.export_file()
+            self._fuzz_data_logger.log_error("SIGINT received ... exiting")
+            raise
+
+        self.total_mutant_index = lease_table.watermark
+        self.export_file()
+
+        for worker in workers:
+            if worker.exc_info is not None:
+                raise worker.exc_info[0], worker.exc_info[1], worker.exc_info[2]
+
+    def _fuzz_leased(self, poll_interval=1):
+        """Fuzz test cases leased from the campaign coordinator until the whole campaign is done.
+
+        After each lease, crash synopses and netmon results of its test cases are reported to the coordinator. If
+        the crash threshold exhausts a primitive, the rest of its test cases are reported done as well.
+
+        Preconditions: `self.total_num_mutations` is set properly.
+
+        Args:
+            poll_interval (float): Seconds to wait before asking again while other workers hold the last leases.
+
+        Raises:
+            sex.SullyRuntimeError: If the coordinator's campaign has a different number of test cases.
+        """
+        self._check_fuzz_preconditions()
+
+        owner = "{0}:{1}".format(socket.gethostname(), os.getpid())
+        if not self._coordinator.register(owner, self.total_num_mutations):
+            raise sex.SullyRuntimeError(
+                "Coordinator campaign does not have {0} test cases; workers must fuzz the same protocol".format(
+                    self.total_num_mutations))
+
+        # web
+        self.server_init()
+
+        offsets = self._fuzz_case_offsets()
+        num_cases_actually_fuzzed = 0
+        lease_id = None
+        try:
+            while True:
+                lease = self._coordinator.lease(owner)
+                if lease is None:
+                    if self._coordinator.status()["done"]:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                lease_id, start, stop = lease
+                done_to = start - 1
+                for index in range(start, stop):
+                    # the crash threshold was reached and mutations were exhausted.
+                    if index <= done_to:
+                        continue
+
+                    path = self._seek_case(index, offsets)
+                    self._check_restart_interval(num_cases_actually_fuzzed)
+                    self._fuzz_current_case(path)
+                    num_cases_actually_fuzzed += 1
+                    done_to = self.total_mutant_index
+
+                results = {
+                    "done_to": done_to,
+                    "procmon_results": dict((index, synopsis) for index, synopsis in self.procmon_results.items()
+                                            if start <= index <= done_to),
+                    "netmon_results": dict((index, num_bytes) for index, num_bytes in self.netmon_results.items()
+                                           if start <= index <= done_to),
+                }
+                self._coordinator.complete(lease_id, start, stop, results)
+                lease_id = None
+        except KeyboardInterrupt:
+            self._release_lease(lease_id)
+            self._fuzz_data_logger.log_error("SIGINT received ... exiting")
+            raise
+        except sex.BoofuzzRestartFailedError:
+            self._release_lease(lease_id)
+            self._fuzz_data_logger.log_error("Restarting the target failed, exiting.")
+            raise
+        except sex.BoofuzzTargetConnectionFailedError:
+            self._release_lease(lease_id)
+            self._fuzz_data_logger.log_error(
+                "Cannot connect to target; target presumed down."
+                " Note: Normally a failure should be detected, and the target reset."
+                " This error may mean you have no restart method configured, or your error"
+                " detection is not working.")
+        finally:
+            if self.fuzz_node is not None:
+                self.fuzz_node.reset()
+            self.export_file()
+
+    def _release_lease(self, lease_id):
+        """Give a lease back to the coordinator so another worker can take it over right away."""
+        if lease_id is not None:
+            self._coordinator.release(lease_id)
+
+    def _fuzz_processes(self, num_shards):
+        """Fuzz the entire protocol tree with forked worker processes.
+
+        Worker process i (the shard) fuzzes every test case index congruent to i + 1 modulo num_shards, on target
+        i. Shards can't share a target, as their restarts and process monitors would interfere. Each shard logs to its
+        own text log and saves its own checkpoint (see _shard_filename()). After each test case it sends a result to
+        this process, which merges failures, errors and passes into the fuzz_data_logger summary data, and crashes
+        into procmon_results and netmon_results, so the web interface and failure_summary() show the whole campaign.
+
+        The shards are forked copies of this session, with its connections, threads and loggers. On Windows,
+        multiprocessing would have to pickle the session instead, which it can't, so processes > 1 is refused there.
+
+        On resume, each shard carries on from its own checkpoint, so use the same number of processes. The checkpoint
+        of this session holds the highest index up to which every test case has finished.
+
+        Preconditions: `self.total_num_mutations` is set properly.
+
+        Args:
+            num_shards (int): Number of worker processes.
+
+        Raises:
+            ValueError: If there are fewer targets than num_shards, or on Windows.
+            sex.BoofuzzRestartFailedError: If restarting a target failed in any shard.
+            sex.BoofuzzError: If a shard stopped on any other uncaught exception.
+        """
+        self._check_fuzz_preconditions()
+        if os.name == "nt":
+            raise ValueError("processes > 1 needs fork(), which Windows doesn't have.")
+        if num_shards > len(self.targets):
+            raise ValueError("{0} processes need as many targets; the session has {1}.".format(num_shards,
+                                                                                                 len(self.targets)))
+
+        offsets = self._fuzz_case_offsets()
+        done = leases.LeaseTable(first_index=1, last_index=self.total_num_mutations)
+        done.skip(1, self.skip + 1)
+
+        results = multiprocessing.Queue()
+        shards = [multiprocessing.Process(target=self._fuzz_shard, args=(shard, num_shards, offsets, results),
+                                          name="boofuzz-shard-{0}".format(shard))
+                  for shard in range(num_shards)]
+        for shard in shards:
+            shard.start()
+
+        # web; started after forking so the shards don't inherit a running IOLoop.
+        self.server_init()
+
+        errors = []
+        try:
+            while any(shard.is_alive() for shard in shards):
+                try:
+                    self._merge_shard_result(results.get(timeout=1), num_shards, done, offsets, errors)
+                except Queue.Empty:
+                    pass
+        except KeyboardInterrupt:
+            # shards save their checkpoint on SIGINT.
+            for shard in shards:
+                if shard.is_alive():
+                    os.kill(shard.pid, signal.SIGINT)
+            for shard in shards:
+                shard.join()
+            self._drain_shard_results(results, num_shards, done, offsets, errors)
+            self._fuzz_data_logger.log_error("SIGINT received ... exiting")
+            raise
+
+        self._drain_shard_results(results, num_shards, done, offsets, errors)
+
+        for exception_type, message in errors:
+            if exception_type == sex.BoofuzzRestartFailedError.__name__:
+                raise sex.BoofuzzRestartFailedError(message)
+        if errors:
+            raise sex.BoofuzzError(errors[0][1])
+
+    def _drain_shard_results(self, results, num_shards, done, offsets, errors):
+        """Merge the shard results left in results after every shard has exited, then save the checkpoint."""
+        while True:
+            try:
+                self._merge_shard_result(results.get(timeout=0.1), num_shards, done, offsets, errors)
+            except Queue.Empty:
+                break
+
+        self.total_mutant_index = done.watermark
+        self.export_file()
+
+    def _merge_shard_result(self, result, num_shards, done, offsets, errors):
+        """Merge the result of one test case, or the error, sent by a shard. See _shard_result()."""
+        if "error" in result:
+            errors.append(result["error"])
+            self._fuzz_data_logger.log_error("Shard {0} stopped: {1}".format(result["shard"], result["error"][1]))
+            return
+
+        index = result["index"]
+        test_case_id = result["test_case_id"]
+
+        fuzz_data_logger = self._fuzz_data_logger
+        if test_case_id is not None:
+            fuzz_data_logger.all_test_cases.append(test_case_id)
+        for summary, key in ((fuzz_data_logger.failed_test_cases, "failures"),
+                             (fuzz_data_logger.error_test_cases, "errors"),
+                             (fuzz_data_logger.passed_test_cases, "passes")):
+            if result[key]:
+                summary[test_case_id] = result[key]
+
+        if result["procmon"] is not None:
+            self.procmon_results[index] = result["procmon"]
+            fuzz_data_logger.log_info("Shard {0}: failure on test case {1}: {2}".format(
+                result["shard"], test_case_id, result["procmon"].split("\n")[0]))
+        if result["netmon"] is not None:
+            self.netmon_results[index] = result["netmon"]
+
+        # the shard skips its remaining test cases of a primitive that reached the crash threshold.
+        for skipped in range(index, result["done_to"] + 1, num_shards):
+            done.skip(skipped, skipped + 1)
+
+        # for the web interface.
+        self._seek_case(index, offsets)
+        self.total_mutant_index = done.watermark
+        self.export_file()
+
+    def _fuzz_shard(self, shard, num_shards, offsets, results):
+        """Worker process body for _fuzz_processes(): fuzz one shard of the test cases.
+
+        Args:
+            shard (int): Number of this shard, 0 <= shard < num_shards.
+            num_shards (int): Number of shards.
+            offsets (list): Result of Session._fuzz_case_offsets().
+            results (multiprocessing.Queue): Queue on which to send results, see _shard_result().
+        """
+        parent_skip = self.skip
+        self.targets = [self.targets[shard]]
+        log_file = open(self._shard_filename(shard) + ".log", "a")
+        self._fuzz_data_logger = fuzz_logger.FuzzLogger(fuzz_loggers=[
+            fuzz_logger_text.FuzzLoggerText(file_handle=log_file)])
+        self.targets[0].set_fuzz_data_logger(fuzz_data_logger=self._fuzz_data_logger)
+
+        if self.session_filename is not None:
+            self.session_filename = self._shard_filename(shard)
+            self.import_file()
+        self.skip = max(self.skip, parent_skip)
+
+        def next_index(after):
+            """First index of this shard greater than after."""
+            return after + 1 + (shard - after) % num_shards
+
+        try:
+            num_cases_actually_fuzzed = 0
+            index = next_index(self.skip)
+            while index <= self.total_num_mutations:
+                path = self._seek_case(index, offsets)
+                self._check_restart_interval(num_cases_actually_fuzzed)
+                self._fuzz_current_case(path)
+                num_cases_actually_fuzzed += 1
+
+                results.put(self._shard_result(shard, index))
+                index = next_index(self.total_mutant_index)
+        except KeyboardInterrupt:
+            self.export_file()
+        except Exception as e:
+            if isinstance(e, sex.BoofuzzTargetConnectionFailedError):
+                message = "Cannot connect to target; target presumed down."
+            else:
+                message = traceback.format_exc()
+            self._fuzz_data_logger.log_error(message)
+            self.export_file()
+            results.put({"shard": shard, "error": (type(e).__name__, message)})
+        finally:
+            log_file.close()
+
+    def _shard_result(self, shard, index):
+        """Result of the test case just run by a shard, to be sent to the parent process.
+
+        Returns:
+            dict: Test case index and id, summary data of the test case, procmon and netmon results, and done_to, the
+                index of the last test case the shard is done with (greater than index if the crash threshold was
+                reached). The id is None if the test case was skipped as a duplicate.
+        """
+        test_case_id = None if self._case_duplicate else self._fuzz_data_logger.current_test_case_id
+        return {
+            "shard": shard,
+            "index": index,
+            "done_to": self.total_mutant_index,
+            "test_case_id": test_case_id,
+            "failures": self._fuzz_data_logger.failed_test_cases.get(test_case_id),
+            "errors": self._fuzz_data_logger.error_test_cases.get(test_case_id),
+            "passes": self._fuzz_data_logger.passed_test_cases.get(test_case_id),
+            "procmon": self.procmon_results.get(index),
+            "netmon": self.netmon_results.get(index),
+        }
+
+    def _shard_filename(self, shard):
+        """Base name of the checkpoint and log files of a shard, next to the session file if there is one.
+
+        Args:
+            shard (int): Shard number.
+
+        Returns:
+            str: "<session_filename>.shard<shard>", or "boofuzz.shard<shard>" without a session file.
+        """
+        if self.session_filename is None:
+            return "boofuzz.shard{0}".format(shard)
+        return "{0}.shard{1}".format(self.session_filename, shard)
+
+    def _copy_with_own_nodes(self):
+        """Create a shallow copy of this session with its own deep copy of the nodes, to render independently.
+
+        Returns:
+            Session: Session copy. fuzz_node is None.
+        """
+        session = copy.copy(self)
+
+        # don't copy the session itself along with bound method callbacks.
+        session.nodes = copy.deepcopy(self.nodes, {id(self): self})
+        session.root = session.nodes[self.root.id]
+        session.fuzz_node = None
+        session._render_cache = {}
+
+        return session
+
+    def _worker_session(self, target):
+        """Create a copy of this session that fuzzes only target, for use by one worker thread.
+
+        The copy has its own nodes (and thereby its own rendering state), fuzz_node, crash counts and a
+        WorkerFuzzLogger. Everything else, including netmon_results and procmon_results, is shared with this
+        session. The copy does not save the session file.
+
+        Args:
+            target (Target): Target for the worker.
+
+        Returns:
+            Session: Session copy for the worker.
+        """
+        worker = self._copy_with_own_nodes()
+        worker.targets = [target]
+        worker.crashing_primitives = {}
+        worker.session_filename = None
+        worker.last_recv = None
+        worker.last_send = None
+        worker._parent_session = self
+        worker._fuzz_data_logger = self._fuzz_data_logger.worker_logger()
+        target.set_fuzz_data_logger(fuzz_data_logger=worker._fuzz_data_logger)
+
+        return worker
+
+    def import_file(self):
+        """
+        Load various object values from disk.
+
+        @see: export_file()
+        """
+        if self.session_filename is None:
+            return
+
+        try:
+            with open(self.session_filename, "rb") as f:
+                data = cPickle.loads(zlib.decompress(f.read()))
+        except (IOError, zlib.error, cPickle.UnpicklingError):
+            return
+
+        # update the skip variable to pick up fuzzing from last test case.
+        self.skip = data["total_mutant_index"]
+        self._schedule_state = data.get("schedule_state")
+        self.session_filename = data["session_filename"]
+        self.sleep_time = data["sleep_time"]
+        self.restart_sleep_time = data["restart_sleep_time"]
+        self.restart_interval = data["restart_interval"]
+        self.web_port = data["web_port"]
+        self.crash_threshold = data["crash_threshold"]
+        self.total_num_mutations = data["total_num_mutations"]
+        self.total_mutant_index = data["total_mutant_index"]
+        self.netmon_results = data["netmon_results"]
+        self.procmon_results = data["procmon_results"]
+        self.differential_results = data.get("differential_results", {})
+        self.coverage_results = data.get("coverage_results", {})
+        self.canary_results = data.get("canary_results", {})
+        self.hang_results = data.get("hang_results", {})
+        self.latency_outliers = data.get("latency_outliers", {})
+        self.minimized_crashes = data.get("minimized_crashes", {})
+        self.is_paused = data["is_paused"]
+
+    # noinspection PyMethodMayBeStatic
+    def log(self, msg, level=1):
+        raise Exception("Depreciated!")
+
+    def num_mutations(self, this_node=None, path=()):
+        """
+        Number of total mutations in the graph. The logic of this routine is identical to that of fuzz(). See fuzz()
+        for inline comments. The member variable self.total_num_mutations is updated appropriately by this routine.
+
+        Args:
+            this_node (request (node)): Current node that is being fuzzed. Default None.
+            path (list): Nodes along the path to the current one being fuzzed. Default [].
+
+        Returns:
+            int: Total number of mutations in this session.
+        """
+
+        if this_node is None:
+            this_node = self.root
+            self.total_num_mutations = 0
+
+        if isinstance(path, tuple):
+            path = list(path)
+
+        for edge in self.edges_from(this_node.id):
+            next_node = self.nodes[edge.dst]
+            self.total_num_mutations += next_node.num_mutations()
+
+            if edge.src != self.root.id:
+                path.append(edge)
+
+            self.num_mutations(next_node, path)
+
+        # finished with the last node on the path, pop it off the path stack.
+        if path:
+            path.pop()
+
+        return self.total_num_mutations
+
+    def pause(self):
+        """
+        If that pause flag is raised, enter an endless loop until it is lowered.
+
+        Worker copies of a session (see _worker_session()) follow the pause flag of the session they were copied
+        from.
+        """
+        session = self if self._parent_session is None else self._parent_session
+        while 1:
+            if session.is_paused:
+                time.sleep(1)
+            else:
+                break
+
+    def poll_pedrpc(self, target):
+        """
+        Poll the PED-RPC endpoints (netmon, procmon etc...) for the target.
+
+        Args:
+            target (Target): Session target whose PED-RPC services we are polling
+        """
+        # kill the pcap thread and see how many bytes the sniffer recorded.
+        if target.netmon:
+            captured_bytes = target.netmon.post_send()
+            self._fuzz_data_logger.log_info(
+                "netmon captured %d bytes for test case #%d" % (captured_bytes, self.total_mutant_index))
+            self.netmon_results[self.total_mutant_index] = captured_bytes
+
+        # check if our fuzz crashed the target. procmon.post_send() returns False if the target crashes.
+        if target.procmon:
+            self._fuzz_data_logger.open_test_step("Contact process monitor")
+            if self.coverage_feedback:
+                self._fuzz_data_logger.log_check("procmon.post_send_with_coverage()")
+                alive, new_edges = target.procmon.post_send_with_coverage()
+                if new_edges:
+                    self._case_new_edges += new_edges
+                    self.coverage_results[self.total_mutant_index] = self._case_new_edges
+                    self._fuzz_data_logger.log_info(
+                        "procmon: {0} new edges on test case #{1}".format(new_edges, self.total_mutant_index))
+            else:
+                self._fuzz_data_logger.log_check("procmon.post_send()")
+                alive = target.procmon.post_send()
+            if alive:
+                self._fuzz_data_logger.log_pass("No crash detected.")
+            else:
+                self._case_crashed = True
+                self._fuzz_data_logger.log_fail(
+                    "procmon detected crash on test case #{0}: {1}".format(self.total_mutant_index,
+                                                                           target.procmon.get_crash_synopsis()))
+
+    def _process_failures(self, target):
+        """Process any failure sin self.crash_synopses.
+
+        If self.crash_synopses contains any entries, perform these failure-related actions:
+         - log failure summary if needed
+         - save failures to self.procmon_results (for website)
+         - exhaust node if crash threshold is reached
+         - target restart
+
+        Should be called after each fuzz test case.
+
+        Args:
+            target (Target): Target to restart if failure occurred.
+
+        Returns:
+            None
+        """
+        crash_synopses = self._fuzz_data_logger.failed_test_cases.get(self._fuzz_data_logger.current_test_case_id, [])
+        if len(crash_synopses) > 0:
+            self._fuzz_data_logger.open_test_step("Failure summary")
+
+            # a batched health check may have found an earlier test case to be the culprit.
+            if self._case_culprit is None:
+                index, mutant = self.total_mutant_index, self.fuzz_node.mutant
+            else:
+                index, mutant = self._case_culprit
+
+            # retrieve the primitive that caused the crash and increment it's individual crash count.
+            self.crashing_primitives[mutant] = self.crashing_primitives.get(mutant, 0) + 1
 
             # print crash synopsis
             if len(crash_synopses) > 1:
@@ -622,21 +2013,21 @@ class Session(pgraph.Graph):
                 synopsis = "({0} reports) {1}".format(len(crash_synopses), "\n".join(crash_synopses))
             else:
                 synopsis = "\n".join(crash_synopses)
-            self.procmon_results[self.total_mutant_index] = synopsis
-            self._fuzz_data_logger.log_info(self.procmon_results[self.total_mutant_index].split("\n")[0])
+            self.procmon_results[index] = synopsis
+            self._fuzz_data_logger.log_info(self.procmon_results[index].split("\n")[0])
 
-            # if the user-supplied crash threshold is reached, exhaust this node.
-            if self.crashing_primitives[self.fuzz_node.mutant] >= self.crash_threshold:
+            # if the user-supplied crash threshold is reached, exhaust this node. only the current primitive can be.
+            if mutant is self.fuzz_node.mutant and self.crashing_primitives[mutant] >= self.crash_threshold:
                 # as long as we're not a group and not a repeat.
                 if not isinstance(self.fuzz_node.mutant, primitives.Group):
                     if not isinstance(self.fuzz_node.mutant, blocks.Repeat):
-                        skipped = self.fuzz_node.mutant.num_mutations() - self.fuzz_node.mutant.mutant_index
-                        self._skip_after_cur_test_case = True
+                        skipped = self.fuzz_node.mutant.exhaust()
                         self._fuzz_data_logger.open_test_step(
                             "Crash threshold reached for this primitive, exhausting %d mutants." % skipped
                         )
                         self.total_mutant_index += skipped
                         self.fuzz_node.mutant_index += skipped
+                        self._case_exhausted = True
 
             self.restart_target(target)
 
@@ -717,10 +2108,16 @@ class Session(pgraph.Graph):
             if not target.procmon.restart_target():
                 raise sex.BoofuzzRestartFailedError()
 
-            self._fuzz_data_logger.log_info("giving the process 3 seconds to settle in ")
-            time.sleep(3)
+            if self.pacing is not None:
+                self._wait_for_target(target)
+            else:
+                self._fuzz_data_logger.log_info("giving the process 3 seconds to settle in ")
+                time.sleep(3)
 
         # otherwise all we can do is wait a while for the target to recover on its own.
+        elif self.pacing is not None:
+            self._fuzz_data_logger.log_info("no reset handler available... waiting for the target to recover")
+            self._wait_for_target(target)
         else:
             self._fuzz_data_logger.log_info(
                 "no reset handler available... sleeping for %d seconds" % self.restart_sleep_time
@@ -730,6 +2127,31 @@ class Session(pgraph.Graph):
         # pass specified target parameters to the PED-RPC server to re-establish connections.
         target.pedrpc_connect()
 
+    def _wait_for_target(self, target):
+        """Wait until the target accepts connections again, as learned by self.pacing.
+
+        Args:
+            target (Target): Target that was restarted.
+
+        @raise sex.BoofuzzRestartFailedError if the target doesn't come back within pacing.restart_timeout.
+        """
+        def probe():
+            try:
+                target.open()
+            except (sex.BoofuzzTargetConnectionFailedError,
+                    sex.BoofuzzTargetConnectionReset,
+                    sex.BoofuzzTargetConnectionAborted):
+                return False
+            target.close()
+            return True
+
+        elapsed = self.pacing.wait_for_restart(probe)
+        if elapsed is None:
+            self._fuzz_data_logger.log_error(
+                "target did not accept connections within {0} seconds".format(self.pacing.restart_timeout))
+            raise sex.BoofuzzRestartFailedError()
+        self._fuzz_data_logger.log_info("target accepted connections after {0:.3f} seconds".format(elapsed))
+
     def server_init(self):
         """Called by fuzz() to initialize variables, web interface, etc.
         """
@@ -752,25 +2174,33 @@ class Session(pgraph.Graph):
         # if the edge has a callback, process it. the callback has the option to render the node, modify it and return.
         if edge.callback:
             data = edge.callback(self, node, edge, sock)
+            self._render_cache.pop(node.id, None)
 
-        # if no data was returned by the callback, render the node here.
+        # if no data was returned by the callback, render the node here. a callback may have changed the node, so
+        # data rendered ahead of time (see _iterate_pipelined()) is only used without one.
         if not data:
-            data = node.render()
+            if not edge.callback and node.id in self._prerendered:
+                data = self._prerendered[node.id]
+            else:
+                data = self._render_node(node)
 
         try:
             # Try to send payload down-range
-            self.targets[0].send(data)
+            sock.send(data)
             self.last_send = data
 
             if self._check_data_received_each_request:
                 # Receive data
-                # TODO: Remove magic number (10000)
-                self.last_recv = self.targets[0].recv(10000)
+                if self.latency is None:
+                    self.last_recv = sock.recv(RECV_MAX_BYTES)
+                else:
+                    self.last_recv = self._timed_recv(sock, node)
                 node.callback(self.last_recv)
                 self._fuzz_data_logger.log_check("Verify some data was received from the target.")
 
                 if not self.last_recv:
                     # Assume a crash?
+                    self._case_timed_out = True
                     self._fuzz_data_logger.log_fail("Nothing received from target.")
                 else:
 
@@ -793,6 +2223,76 @@ class Session(pgraph.Graph):
                                                 .format(e.socket_errno, e.socket_errmsg))
             pass
 
+    def _timed_recv(self, sock, node):
+        """Receive the answer to a node with the timeout learned by self.latency, and learn from its latency.
+
+        Unmutated nodes add a sample; the fuzzed node is checked for being an outlier.
+
+        Args:
+            sock (Target): Target to receive from.
+            node (pgraph.Node): Node that was sent.
+
+        Returns:
+            str: Data received.
+        """
+        sock.set_recv_timeout(self.latency.timeout(node.name))
+        start = time.time()
+        data = sock.recv(RECV_MAX_BYTES)
+        latency = time.time() - start
+        if not data:
+            return data
+
+        if node is not self.fuzz_node:
+            self.latency.record(node.name, latency)
+        elif self.latency.is_outlier(node.name, latency):
+            self._fuzz_data_logger.log_info("Slow answer: {0:.6f} seconds, usually at most {1:.6f}".format(
+                latency, self.latency.percentile_latency(node.name)))
+            self.latency_outliers[self.total_mutant_index] = (node.name, latency)
+        return data
+
+    def _measure_latency_baseline(self, target):
+        """Send every node with its original values a few times, each along the shortest path to it, and record how
+        long the target takes to answer. pre_send() is called on each connection; edge callbacks are not called.
+
+        Args:
+            target (Target): Target to measure.
+        """
+        self._fuzz_data_logger.open_test_step("Measuring response latency")
+
+        # breadth-first, so that each node is reached by a shortest path.
+        paths = []
+        seen = {self.root.id}
+        queue = collections.deque([[]])
+        while queue:
+            path = queue.popleft()
+            for edge in sorted(self.edges_from(path[-1].dst if path else self.root.id), key=lambda e: e.dst):
+                if edge.dst not in seen:
+                    seen.add(edge.dst)
+                    paths.append(path + [edge])
+                    queue.append(path + [edge])
+
+        for path in paths:
+            node = self.nodes[path[-1].dst]
+            for _ in range(self.latency.baseline_samples):
+                target.open()
+                try:
+                    self.pre_send(target)
+                    for edge in path:
+                        target.send(self.nodes[edge.dst].original_value)
+                        start = time.time()
+                        data = target.recv(RECV_MAX_BYTES)
+                        if data and edge is path[-1]:
+                            self.latency.record(node.name, time.time() - start)
+                finally:
+                    target.close()
+
+            if self.latency.timeout(node.name) is None:
+                self._fuzz_data_logger.log_info(
+                    "'{0}' did not answer often enough to learn a timeout".format(node.name))
+            else:
+                self._fuzz_data_logger.log_info("'{0}' gets a receive timeout of {1:.6f} seconds".format(
+                    node.name, self.latency.timeout(node.name)))
+
     def build_webapp_thread(self, port=26000):
         app.session = self
         http_server = HTTPServer(WSGIContainer(app))
@@ -801,35 +2301,44 @@ class Session(pgraph.Graph):
         flask_thread.daemon = True
         return flask_thread
 
-    def _iterate_protocol(self):
+    def _iterate_protocol(self, need_target=True):
         """
         Iterates over fuzz cases and mutates appropriately.
         On each iteration, one may call fuzz_current_case to do the
         actual fuzzing.
 
+        Test cases up to and including self.skip are not replayed; the first node left to fuzz is moved straight to
+        the next test case with seek().
+
+        :param need_target: See _check_fuzz_preconditions().
+        :type need_target: bool
+
         :raise sex.SullyRuntimeError:
         """
-        # we can't fuzz if we don't have at least one target and one request.
-        if not self.targets:
-            raise sex.SullyRuntimeError("No targets specified in session")
-
-        if not self.edges_from(self.root.id):
-            raise sex.SullyRuntimeError("No requests specified in session")
+        self._check_fuzz_preconditions(need_target=need_target)
 
         self._reset_fuzz_state()
 
-        for x in self._iterate_protocol_recursive(this_node=self.root, path=[]):
-            yield x
+        for path, first_index, num_mutations in self._fuzz_case_offsets():
+            if first_index + num_mutations - 1 <= self.skip:
+                continue
 
-    def _iterate_protocol_recursive(self, this_node, path):
+            start = max(1, self.skip - first_index + 2)
+            self.total_mutant_index = first_index + start - 2
+
+            for x in self._iterate_single_node(path, start=start):
+                yield x
+
+    def _iterate_fuzz_paths(self, this_node, path):
         """
-        Recursively iterates over fuzz nodes. Used by _fuzz_case_iterator.
+        Recursively walks the fuzz paths of the session graph in fuzzing order.
 
         Args:
             this_node (node.Node): Current node that is being fuzzed.
             path (list of Connection): List of edges along the path to the current one being fuzzed.
 
-        :raise sex.SullyRuntimeError:
+        Yields:
+            list of Connection: Path to each node to fuzz. A fresh list every time.
         """
         # step through every edge from the current node.
         for edge in self.edges_from(this_node.id):
@@ -838,46 +2347,223 @@ class Session(pgraph.Graph):
             # given nodes we don't want any ambiguity.
             path.append(edge)
 
-            for x in self._iterate_single_node(path):
-                yield x
+            yield list(path)
 
             # recursively fuzz the remainder of the nodes in the session graph.
-            for x in self._iterate_protocol_recursive(self.fuzz_node, path):
+            for x in self._iterate_fuzz_paths(self.nodes[edge.dst], path):
                 yield x
 
         # finished with the last node on the path, pop it off the path stack.
         if path:
             path.pop()
 
-    def _iterate_single_node(self, path):
+    def _fuzz_case_offsets(self):
+        """
+        List every fuzz path with the range of global test case indices it covers, in fuzzing order.
+
+        Returns:
+            list of tuple: (path, index of first test case on path, number of test cases on path) for each path.
+        """
+        offsets = []
+        first_index = 1
+
+        for path in self._iterate_fuzz_paths(self.root, []):
+            num_mutations = self.nodes[path[-1].dst].num_mutations()
+            offsets.append((path, first_index, num_mutations))
+            first_index += num_mutations
+
+        return offsets
+
+    def _mutation_ranges(self, offsets):
+        """
+        List the range of global test case indices of every (path, primitive) pair, in fuzzing order.
+
+        Args:
+            offsets (list): Result of _fuzz_case_offsets().
+
+        Returns:
+            list of schedulers.MutationRange: One range per run of mutations of a single primitive.
+        """
+        ranges = []
+        for path, first_index, _ in offsets:
+            message_path = "->".join([self.nodes[e.dst].name for e in path])
+            for start, num_mutations, mutant in self.nodes[path[-1].dst].mutation_ranges():
+                ranges.append(schedulers.MutationRange(
+                    first_index=first_index + start - 1,
+                    num_mutations=num_mutations,
+                    path=path,
+                    mutant=mutant,
+                    name="{0}.{1}".format(message_path, mutant.name if mutant.name else "no-name")))
+
+        return ranges
+
+    def _seek_case(self, test_case_index, offsets=None):
+        """
+        Put the session and the node under test into the state of a given test case, without replaying earlier ones.
+
+        Uses the per-path prefix sums from _fuzz_case_offsets() to find the node, then seeks the node to its local
+        mutant index; the cost does not depend on how far into the campaign the test case is.
+
+        Args:
+            test_case_index (int): Global test case index, 1 <= test_case_index <= self.num_mutations().
+            offsets (list): Optional result of _fuzz_case_offsets(), to avoid recomputing it for every call.
+
+        Returns:
+            list of Connection: Path to the node under test.
+
+        Raises:
+            sex.SullyRuntimeError: If test_case_index is not a test case of this session.
+        """
+        if offsets is None:
+            offsets = self._fuzz_case_offsets()
+
+        first_indices = [first_index for _, first_index, _ in offsets]
+        position = bisect.bisect_right(first_indices, test_case_index) - 1
+        if position < 0 or test_case_index < 1:
+            raise sex.SullyRuntimeError("Test case {0} does not exist".format(test_case_index))
+
+        path, first_index, num_mutations = offsets[position]
+        if test_case_index >= first_index + num_mutations:
+            raise sex.SullyRuntimeError("Test case {0} does not exist".format(test_case_index))
+
+        node = self.nodes[path[-1].dst]
+        if self.fuzz_node is not None and self.fuzz_node is not node:
+            self.fuzz_node.reset()
+
+        self.fuzz_node = node
+        self.fuzz_node.seek(test_case_index - first_index + 1)
+        self.total_mutant_index = test_case_index
+
+        return path
+
+    def _iterate_single_node(self, path, start=1):
         """Iterate fuzz cases for the last node in path.
 
         Args:
             path (list of Connection): Nodes along the path to the current one being fuzzed.
+            start (int): Mutant index of the node to start at. Default 1.
 
         Raises:
             sex.SullyRuntimeError:
         """
         self.fuzz_node = self.nodes[path[-1].dst]
+        # Jump to the mutation before the first one wanted; mutate() then carries on from there.
+        self.fuzz_node.seek(start - 1)
         # Loop through and yield all possible mutations of the fuzz node.
         # Note: when mutate() returns False, the node has been reverted to the default (valid) state.
         while self.fuzz_node.mutate():
             self.total_mutant_index += 1
             yield (path,)
 
-            if self._skip_after_cur_test_case:
-                self._skip_after_cur_test_case = False
-                break
         self.fuzz_node.reset()
 
+    def _iterate_pipelined(self, depth):
+        """Iterate over fuzz cases like _iterate_protocol(), rendering them ahead of time in a background thread.
+
+        A _CaseRenderer thread renders every node on the path of upcoming test cases on its own copy of the nodes,
+        into a queue of at most depth test cases. For each test case taken from the queue, the node under test is
+        seeked to it, for logging and failure handling, and transmit() sends the rendered data instead of rendering
+        again. Rendering thus overlaps with waiting on the target.
+
+        Args:
+            depth (int): Maximum number of rendered test cases waiting in the queue.
+
+        :raise sex.SullyRuntimeError:
+        """
+        self._check_fuzz_preconditions()
+
+        self._reset_fuzz_state()
+
+        offsets = self._fuzz_case_offsets()
+        renderer = _CaseRenderer(session=self, offsets=offsets, first_index=self.skip + 1,
+                                 last_index=self.total_num_mutations, depth=depth)
+        renderer.start()
+        try:
+            for index, path, rendered in renderer:
+                # skip test cases exhausted by the crash threshold.
+                if index <= self.total_mutant_index:
+                    continue
+
+                self._seek_case(index, offsets)
+                self._prerendered = dict(zip([e.dst for e in path], rendered))
+                yield (path,)
+                self._prerendered = {}
+                renderer.skip_to(self.total_mutant_index)
+        finally:
+            self._prerendered = {}
+            renderer.stop()
+            if self.fuzz_node is not None:
+                self.fuzz_node.reset()
+
+    def _iterate_scheduled(self, scheduler):
+        """Iterate over fuzz cases in the order chosen by a scheduler.
+
+        The scheduler is started with the _mutation_ranges() of the protocol and yields global test case indices;
+        each one is seeked to with _seek_case(), so any order costs the same as sequential iteration. After each test
+        case the scheduler gets feedback on whether it failed; if the crash threshold exhausted the primitive under
+        test, the rest of its range is dropped from the schedule.
+
+        The first self.skip test cases of the schedule are not run; the scheduler skips them with the state saved
+        along with self.skip, if any. self._schedule_position counts test cases in schedule order and is what
+        export_file() saves for resuming, with the state of the scheduler.
+
+        Args:
+            scheduler (schedulers.Scheduler): Decides the order of test cases.
+
+        :raise sex.SullyRuntimeError:
+        """
+        self._check_fuzz_preconditions()
+
+        self._reset_fuzz_state()
+
+        offsets = self._fuzz_case_offsets()
+        scheduler.start(self._mutation_ranges(offsets))
+        scheduler.skip(self.skip, state=self._schedule_state)
+        self._scheduler = scheduler
+        self._schedule_position = self.skip
+        try:
+            for index in scheduler:
+                self._schedule_position += 1
+
+                path = self._seek_case(index, offsets)
+                self._case_exhausted = False
+                yield (path,)
+
+                if not self._case_duplicate:
+                    failed = self._fuzz_data_logger.current_test_case_id in self._fuzz_data_logger.failed_test_cases
+                    scheduler.feedback(index, failed, response=self.last_recv, new_edges=self._case_new_edges)
+                # set by _process_failures() when the crash threshold exhausts the primitive, even on its last mutation.
+                if self._case_exhausted:
+                    scheduler.exhaust(index)
+                    # the test case was saved before; save the exhausted range along with it.
+                    self.export_file()
+        finally:
+            scheduler.stop()
+            if self.fuzz_node is not None:
+                self.fuzz_node.reset()
+
     def _iterate_single_case_by_index(self, test_case_index):
-        fuzz_index = 1
-        for fuzz_args in self._iterate_protocol():
-            if fuzz_index >= test_case_index:
-                self.total_mutant_index = 1
-                yield fuzz_args
-                break
-            fuzz_index += 1
+        self._check_fuzz_preconditions()
+
+        path = self._seek_case(test_case_index)
+        self.total_mutant_index = 1
+        yield (path,)
+
+        self.fuzz_node.reset()
+
+    def _check_fuzz_preconditions(self, need_target=True):
+        """
+        :param need_target: Whether the session needs a target. fuzz_concurrent() brings its own connections.
+        :type need_target: bool
+
+        :raise sex.SullyRuntimeError: If the session has no target or no request to fuzz.
+        """
+        # we can't fuzz if we don't have at least one target and one request.
+        if need_target and not self.targets:
+            raise sex.SullyRuntimeError("No targets specified in session")
+
+        if not self.edges_from(self.root.id):
+            raise sex.SullyRuntimeError("No requests specified in session")
 
     def _path_names_to_edges(self, node_names):
         """Take a list of node names and return a list of edges describing that path.
@@ -916,60 +2602,322 @@ class Session(pgraph.Graph):
 
         self.pause()  # only pauses conditionally
 
-        message_path = "->".join([self.nodes[e.dst].name for e in path])
+        self._case_duplicate = self._is_duplicate(path)
+        if self._case_duplicate:
+            return
 
-        if self.fuzz_node.mutant.name:
-            primitive_under_test = self.fuzz_node.mutant.name
-        else:
-            primitive_under_test = 'no-name'
+        self._open_test_case(self._fuzz_data_logger, path)
 
-        test_case_name = "{0}.{1}.{2}".format(message_path, primitive_under_test, self.fuzz_node.mutant_index)
+        health_check_due = False
+        try:
+            with self._watchdog.case():
+                health_check_due = self._send_current_case(target, path)
+        except sex.BoofuzzWatchdogTimeout as e:
+            self._abort_hung_case(target, e)
 
-        self._fuzz_data_logger.open_test_case("{0}: {1}".format(self.total_mutant_index, test_case_name))
+        # bisection restarts the target and replays the batch, which the test case deadline does not cover.
+        if health_check_due and self._health_batch:
+            self._end_health_batch(target)
 
-        self._fuzz_data_logger.log_info(
-            "Type: %s. Default value: %s. Case %d of %d overall." % (
-                type(self.fuzz_node.mutant).__name__,
-                self.fuzz_node.mutant.original_value,
-                self.total_mutant_index,
-                self.total_num_mutations))
+        if self.pacing is not None:
+            self.pacing.record_case(
+                ok=self._fuzz_data_logger.current_test_case_id not in self._fuzz_data_logger.failed_test_cases)
 
-        if target.procmon:
-            target.procmon.pre_send(self.total_mutant_index)
+        self._record_library_stats()
 
-        if target.netmon:
-            target.netmon.pre_send(self.total_mutant_index)
+        self._process_failures(target=target)
+
+        self.export_file()
 
-        target.open()
+    def _send_current_case(self, target, path):
+        """Send the current test case and check the health of the target, under the watchdog of _fuzz_current_case().
 
-        self.pre_send(target)
+        With batched health checks, the test case is only added to the batch.
+
+        Args:
+            target (Target): Target to fuzz.
+            path(list of Connection): Path to take to get to the target node.
+
+        Returns:
+            bool: True if the batch of health checks is due, to be ended by _end_health_batch().
+        """
+        # with batched health checks, the monitors are only told about the first test case of a batch.
+        if not self._health_batch:
+            with self._watchdog.phase("monitor"):
+                if target.procmon:
+                    target.procmon.pre_send(self.total_mutant_index)
+
+                if target.netmon:
+                    target.netmon.pre_send(self.total_mutant_index)
+
+        with self._watchdog.phase("open"):
+            target.open()
+
+        with self._watchdog.phase("pre_send"):
+            self.pre_send(target)
 
         for e in path[:-1]:
             node = self.nodes[e.dst]
             self._fuzz_data_logger.open_test_step("Prep Node '{0}'".format(node.name))
-            self.transmit(target, node, e)
+            with self._watchdog.phase("transmit"):
+                self.transmit(target, node, e)
 
         self._fuzz_data_logger.open_test_step("Fuzzing Node '{0}'".format(self.fuzz_node.name))
-        self.transmit(target, self.fuzz_node, path[-1])
+        with self._watchdog.phase("transmit"):
+            self.transmit(target, self.fuzz_node, path[-1])
 
         self._fuzz_data_logger.open_test_step("Calling post_send function:")
         try:
-            self.post_send(target=target, fuzz_data_logger=self._fuzz_data_logger, session=self, sock=target)
+            with self._watchdog.phase("post_send"):
+                self.post_send(target=target, fuzz_data_logger=self._fuzz_data_logger, session=self, sock=target)
         except Exception as e:
             raise sex.BoofuzzError("Custom post_send method raised uncaught Exception.", e), None, sys.exc_info()[2]
 
         target.close()
 
         self._fuzz_data_logger.open_test_step("Sleep between tests.")
-        self._fuzz_data_logger.log_info("sleeping for %f seconds" % self.sleep_time)
-        time.sleep(self.sleep_time)
+        self._sleep_between_cases(self._fuzz_data_logger)
 
-        self.poll_pedrpc(target)
+        if self._health_batch is not None:
+            self._health_batch.append(self.total_mutant_index)
+            # a failure restarts the target, so check its health first.
+            return len(self._health_batch) >= self.health_check_interval \
+                or self._fuzz_data_logger.current_test_case_id in self._fuzz_data_logger.failed_test_cases
 
-        self._process_failures(target=target)
+        with self._watchdog.phase("monitor"):
+            self.poll_pedrpc(target)
+        return False
+
+    def _sleep_between_cases(self, fuzz_data_logger):
+        """Give the target time to recover after a test case: sleep_time, or the delay learned by self.pacing.
+
+        Args:
+            fuzz_data_logger (ifuzz_logger.IFuzzLogger): Logger of the test case.
+        """
+        sleep_time = self.sleep_time if self.pacing is None else self.pacing.case_delay
+        fuzz_data_logger.log_info("sleeping for %f seconds" % sleep_time)
+        time.sleep(sleep_time)
+
+    def _abort_hung_case(self, target, timeout):
+        """Fail the current test case as a hang and close the connections it may have left in the middle of a call.
+
+        Args:
+            target (Target): Target of the test case.
+            timeout (sex.BoofuzzWatchdogTimeout): The expired deadline.
+        """
+        self._fuzz_data_logger.open_test_step("Watchdog")
+        self._fuzz_data_logger.log_fail("Test case hung: {0} took longer than {1} seconds.".format(timeout.phase,
+                                                                                                 timeout.timeout))
+        self._case_timed_out = True
+        self.hang_results[self.total_mutant_index] = timeout.phase
 
+        try:
+            target.close()
+        except Exception as e:
+            self._fuzz_data_logger.log_info("Closing the target connection failed: {0}".format(e))
+
+        for monitor in (target.procmon, target.netmon):
+            if isinstance(monitor, pedrpc.Client):
+                monitor.close()
+
+        # the monitors may have missed the start or end of the batch; start a new one.
+        if self._health_batch is not None:
+            self._health_batch = []
+
+    def _flush_health_batch(self):
+        """Check the health of the target after the test cases of a pending batch, if any, and process a crash.
+
+        The crash is logged in the last test case, which is still open.
+        """
+        if not self._health_batch:
+            return
+
+        target = self.targets[0]
+        self._end_health_batch(target)
+        self._process_failures(target=target)
         self.export_file()
 
+    def _end_health_batch(self, target):
+        """Poll the monitors after a batch of test cases; if the target crashed, find the culprit by bisection.
+
+        The crash is logged in the current test case, as by poll_pedrpc(). If bisection finds the culprit,
+        _process_failures() attributes the crash to it.
+
+        Args:
+            target (Target): Target of the batch.
+        """
+        batch = self._health_batch
+        self._health_batch = []
+
+        self._fuzz_data_logger.open_test_step("Health check after test cases #{0}-#{1}".format(batch[0], batch[-1]))
+        self.poll_pedrpc(target)
+        if not self._case_crashed or len(batch) == 1:
+            return
+
+        self._case_culprit = self._bisect_crash(target, batch)
+        self.bisection_results[batch[-1]] = self._case_culprit[0] if self._case_culprit else None
+        if self._case_culprit is None:
+            self._fuzz_data_logger.log_info(
+                "Bisection: no single test case of #{0}-#{1} triggers the crash.".format(batch[0], batch[-1]))
+        else:
+            self._fuzz_data_logger.log_info("Bisection: test case #{0} triggers the crash.".format(
+                self._case_culprit[0]))
+
+    def _bisect_crash(self, target, batch):
+        """Find the test case of a batch that crashes the target by replaying halves of it on a restarted target.
+
+        Replays are not logged, apart from what the target itself logs. The session is left at the current test case.
+
+        Args:
+            target (Target): Target that crashed.
+            batch (list of int): Indices of the test cases run since the last health check.
+
+        Returns:
+            tuple: Index and mutant of the test case that crashes the target on its own, or None if no single test
+                case does.
+        """
+        self._fuzz_data_logger.open_test_step("Bisecting test cases #{0}-#{1}".format(batch[0], batch[-1]))
+
+        offsets = self._fuzz_case_offsets()
+        current = self.total_mutant_index
+        saved = (self._fuzz_data_logger, self._prerendered, self.last_send, self.last_recv, self._case_timed_out)
+        self._fuzz_data_logger = fuzz_logger.FuzzLogger()
+        self._prerendered = {}
+
+        culprit = None
+        try:
+            low, high = 0, len(batch)
+            while high - low > 1:
+                middle = (low + high) // 2
+                if self._replay_crashes(target, batch[low:middle], offsets):
+                    high = middle
+                elif self._replay_crashes(target, batch[middle:high], offsets):
+                    low = middle
+                else:
+                    break
+            else:
+                self._seek_case(batch[low], offsets)
+                culprit = (batch[low], self.fuzz_node.mutant)
+
+            self.restart_target(target)
+        finally:
+            self._fuzz_data_logger, self._prerendered, self.last_send, self.last_recv, self._case_timed_out = saved
+            self._seek_case(current, offsets)
+
+        return culprit
+
+    def _replay_crashes(self, target, indices, offsets):
+        """Restart the target, replay test cases on it and ask the process monitor whether it crashed.
+
+        Args:
+            target (Target): Target to replay on.
+            indices (list of int): Indices of the test cases, in order.
+            offsets (list): Result of _fuzz_case_offsets().
+
+        Returns:
+            bool: True if the target crashed.
+        """
+        self.restart_target(target)
+        target.procmon.pre_send(indices[0])
+
+        try:
+            for index in indices:
+                path = self._seek_case(index, offsets)
+                target.open()
+                self.pre_send(target)
+                for e in path:
+                    self.transmit(target, self.nodes[e.dst], e)
+                self.post_send(target=target, fuzz_data_logger=self._fuzz_data_logger, session=self, sock=target)
+                target.close()
+                self._sleep_between_cases(self._fuzz_data_logger)
+        except sex.BoofuzzTargetConnectionFailedError:
+            pass
+
+        return not target.procmon.post_send()
+
+    def _is_duplicate(self, path):
+        """Check the messages of the current test case against self.dedupe, adding them if they are new.
+
+        Args:
+            path (list of Connection): Path to take to get to the target node.
+
+        Returns:
+            bool: True if an earlier test case sent the same messages, False if not or if dedupe is off.
+        """
+        if self.dedupe is None or any(e.callback for e in path):
+            return False
+
+        payloads = []
+        for e in path:
+            if e.dst in self._prerendered:
+                payloads.append(self._prerendered[e.dst])
+            else:
+                payloads.append(self.nodes[e.dst].render())
+
+        return not self.dedupe.add(dedupe.payload_digest(payloads))
+
+    def _record_library_stats(self):
+        """Count the outcome of the current test case in self.library_stats, if the mutant is a primitive."""
+        if self.library_stats is None or not isinstance(self.fuzz_node.mutant, primitives.BasePrimitive):
+            return
+
+        failed = self._fuzz_data_logger.current_test_case_id in self._fuzz_data_logger.failed_test_cases
+        self.library_stats.record(self.fuzz_node.mutant, self.fuzz_node.mutant._value,
+                                  failed=failed, crashed=self._case_crashed, timed_out=self._case_timed_out)
+
+    def _open_test_case(self, fuzz_data_logger, path):
+        """Open the current test case in fuzz_data_logger and log what it mutates.
+
+        Args:
+            fuzz_data_logger (ifuzz_logger.IFuzzLogger): Logger to open the test case in.
+            path (list of Connection): Path to take to get to the target node.
+        """
+        message_path = "->".join([self.nodes[e.dst].name for e in path])
+
+        self._case_crashed = False
+        self._case_timed_out = False
+        self._case_new_edges = 0
+        self._case_culprit = None
+
+        if self.fuzz_node.mutant.name:
+            primitive_under_test = self.fuzz_node.mutant.name
+        else:
+            primitive_under_test = 'no-name'
+
+        test_case_name = "{0}.{1}.{2}".format(message_path, primitive_under_test, self.fuzz_node.mutant_index)
+
+        fuzz_data_logger.open_test_case("{0}: {1}".format(self.total_mutant_index, test_case_name))
+
+        fuzz_data_logger.log_info(
+            "Type: %s. Default value: %s. Case %d of %d overall." % (
+                type(self.fuzz_node.mutant).__name__,
+                self.fuzz_node.mutant.original_value,
+                self.total_mutant_index,
+                self.total_num_mutations))
+
+    def _render_node(self, node):
+        """Render a node, reusing the data rendered for it before if it isn't the node under test and its mutation
+        state hasn't changed since. See render_cache.
+
+        Args:
+            node (Request): Node to render.
+
+        Returns:
+            str: Rendered node.
+        """
+        if not self.render_cache or node is self.fuzz_node:
+            return node.render()
+
+        version, data = self._render_cache.get(node.id, (None, None))
+        if version == node.version:
+            self.render_cache_stats["hits"] += 1
+            return data
+
+        self.render_cache_stats["misses"] += 1
+        data = node.render()
+        self._render_cache[node.id] = (node.version, data)
+        return data
+
     def _reset_fuzz_state(self):
         """
         Restart the object's fuzz state.
@@ -977,5 +2925,151 @@ class Session(pgraph.Graph):
         :return: None
         """
         self.total_mutant_index = 0
+        self._render_cache = {}
         if self.fuzz_node:
             self.fuzz_node.reset()
+
+
+class _TargetWorker(threading.Thread):
+    """Thread fuzzing test cases leased from a LeaseTable on one target.
+
+    Args:
+        session (Session): Session to fuzz. The worker runs on a copy made by Session._worker_session().
+        target (Target): Target to fuzz.
+        lease_table (leases.LeaseTable): Source of test case indices.
+        offsets (list): Result of Session._fuzz_case_offsets().
+    """
+
+    def __init__(self, session, target, lease_table, offsets):
+        super(_TargetWorker, self).__init__(name="boofuzz-target-{0}".format(session.targets.index(target)))
+        self.daemon = True
+        self.exc_info = None
+
+        self._parent_session = session
+        self._session = session._worker_session(target)
+        self._lease_table = lease_table
+        self._offsets = offsets
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Stop after the current test case."""
+        self._stop_event.set()
+
+    def run(self):
+        fuzz_data_logger = self._session._fuzz_data_logger
+        try:
+            self._fuzz_leases()
+        except sex.BoofuzzRestartFailedError:
+            fuzz_data_logger.log_error("Restarting the target failed, worker {0} exiting.".format(self.name))
+            self.exc_info = sys.exc_info()
+        except sex.BoofuzzTargetConnectionFailedError:
+            fuzz_data_logger.log_error(
+                "Cannot connect to target; target presumed down. Worker {0} exiting.".format(self.name))
+        except Exception:
+            self.exc_info = sys.exc_info()
+        finally:
+            fuzz_data_logger.flush()
+            if self._session.fuzz_node is not None:
+                self._session.fuzz_node.reset()
+
+    def _fuzz_leases(self):
+        num_cases_actually_fuzzed = 0
+        while not self._stop_event.is_set():
+            lease = self._lease_table.lease(owner=self.name)
+            if lease is None:
+                if not self._lease_table.active_leases:
+                    return
+                # another worker may yet give its lease back.
+                time.sleep(0.1)
+                continue
+
+            try:
+                for index in range(lease.start, lease.stop):
+                    if self._lease_table.is_done(index):
+                        continue
+
+                    path = self._session._seek_case(index, self._offsets)
+                    # for the web interface.
+                    self._parent_session.fuzz_node = self._session.fuzz_node
+
+                    self._session._check_restart_interval(num_cases_actually_fuzzed)
+                    self._session._fuzz_current_case(path)
+                    num_cases_actually_fuzzed += 1
+                    self._session._fuzz_data_logger.flush()
+
+                    # the crash threshold was reached and mutations were exhausted.
+                    if self._session.total_mutant_index > index:
+                        self._lease_table.skip(index + 1, self._session.total_mutant_index + 1)
+            except BaseException:
+                self._lease_table.release(lease.id)
+                raise
+
+            self._lease_table.complete(lease.id)
+
+
+class _CaseRenderer(threading.Thread):
+    """Thread rendering test cases ahead of the fuzz loop, into a bounded queue. See Session._iterate_pipelined().
+
+    Iterating over the renderer yields (test case index, path, list of rendered data for each node on the path)
+    tuples in test case order.
+
+    Args:
+        session (Session): Session to render test cases of. Rendering happens on a copy with its own nodes.
+        offsets (list): Result of Session._fuzz_case_offsets().
+        first_index (int): First test case index to render.
+        last_index (int): Last test case index to render.
+        depth (int): Maximum number of rendered test cases in the queue.
+    """
+
+    def __init__(self, session, offsets, first_index, last_index, depth):
+        super(_CaseRenderer, self).__init__(name="boofuzz-renderer")
+        self.daemon = True
+
+        self._session = session._copy_with_own_nodes()
+        self._offsets = offsets
+        self._next_index = first_index
+        self._last_index = last_index
+        self._queue = Queue.Queue(maxsize=depth)
+        self._skip_to = first_index - 1
+        self._stop_event = threading.Event()
+
+    def skip_to(self, index):
+        """Don't render test cases up to and including index, if not rendered yet."""
+        self._skip_to = index
+
+    def stop(self):
+        """Stop rendering."""
+        self._stop_event.set()
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, tuple) and len(item) == 3 and isinstance(item[1], BaseException):
+                raise item[0], item[1], item[2]
+            yield item
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                index = max(self._next_index, self._skip_to + 1)
+                if index > self._last_index:
+                    break
+                self._next_index = index + 1
+
+                path = self._session._seek_case(index, self._offsets)
+                rendered = [self._session._render_node(self._session.nodes[e.dst]) for e in path]
+                self._put((index, path, rendered))
+        except Exception:
+            self._put(sys.exc_info())
+            return
+        self._put(None)
+
+    def _put(self, item):
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except Queue.Full:
+                pass
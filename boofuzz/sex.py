@@ -27,6 +27,17 @@ class BoofuzzTargetConnectionAborted(BoofuzzError):
     socket_errmsg = attr.ib()
 
 
+@attr.s
+class BoofuzzWatchdogTimeout(BaseException):
+    """
+    Raised when a test case, or a phase of it, runs past its deadline. See `Session(case_timeout=...)`.
+
+    Not an Exception, so that the `except Exception` clauses of callbacks and PED-RPC calls don't swallow it.
+    """
+    phase = attr.ib()
+    timeout = attr.ib()
+
+
 class SullyRuntimeError(Exception):
     pass
 
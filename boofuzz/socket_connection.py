@@ -76,6 +76,7 @@ class SocketConnection(itarget_connection.ITargetConnection):
         self._udp_broadcast = udp_broadcast
 
         self._sock = None
+        self._recv_timeout = None
 
         if self.proto not in self._PROTOCOLS:
             raise sex.SullyRuntimeError("INVALID PROTOCOL SPECIFIED: %s" % self.proto)
@@ -142,6 +143,9 @@ class SocketConnection(itarget_connection.ITargetConnection):
         Returns:
             Received data.
         """
+        if self._recv_timeout is not None:
+            self._sock.settimeout(self._recv_timeout)
+
         try:
             if self.proto in ['tcp', 'ssl']:
                 data = self._sock.recv(max_bytes)
@@ -169,9 +173,24 @@ class SocketConnection(itarget_connection.ITargetConnection):
                 raise_(sex.BoofuzzTargetConnectionReset, None, sys.exc_info()[2])
             else:
                 raise
+        finally:
+            if self._recv_timeout is not None:
+                self._sock.settimeout(self.timeout)
 
         return data
 
+    def set_recv_timeout(self, timeout):
+        """
+        Set how long recv() waits for data, overriding self.timeout.
+
+        Args:
+            timeout (float): Timeout in seconds, or None to use self.timeout again.
+
+        Returns:
+            None
+        """
+        self._recv_timeout = timeout
+
     def send(self, data):
         """
         Send data to the target. Only valid after calling open!
@@ -0,0 +1,80 @@
+import csv
+
+import attr
+
+# classifications of a recorded crash, from most to least actionable.
+REPRODUCIBLE = "reproducible"
+FLAKY = "flaky"
+ORDER_DEPENDENT = "order-dependent"
+NOT_REPRODUCIBLE = "not reproducible"
+
+REPORT_FIELDS = ["test_case", "classification", "crashes_alone", "runs_alone", "crashes_in_context",
+                 "runs_in_context", "synopsis"]
+
+
+@attr.s
+class VerificationResult(object):
+    """
+    Outcome of replaying one recorded crash, see Session.verify_crashes().
+
+    Attributes:
+        mutant_index (int): Test case that crashed the target during the campaign.
+        crashes_alone (int): Number of replays of the test case on its own that crashed the target.
+        runs_alone (int): Number of replays of the test case on its own.
+        crashes_in_context (int): Number of replays of the test case after the ones before it that crashed the target.
+        runs_in_context (int): Number of replays of the test case after the ones before it.
+        synopsis (str): Crash synopsis recorded during the campaign.
+    """
+    mutant_index = attr.ib()
+    crashes_alone = attr.ib(default=0)
+    runs_alone = attr.ib(default=0)
+    crashes_in_context = attr.ib(default=0)
+    runs_in_context = attr.ib(default=0)
+    synopsis = attr.ib(default="")
+
+    @property
+    def classification(self):
+        """
+        REPRODUCIBLE if every replay of the test case on its own crashed the target, FLAKY if some did,
+        ORDER_DEPENDENT if none did but some replays after the test cases before it did, and NOT_REPRODUCIBLE
+        otherwise.
+        """
+        if self.runs_alone and self.crashes_alone == self.runs_alone:
+            return REPRODUCIBLE
+        if self.crashes_alone:
+            return FLAKY
+        if self.crashes_in_context:
+            return ORDER_DEPENDENT
+        return NOT_REPRODUCIBLE
+
+
+def write_report(results, filename):
+    """
+    Write verification results to a CSV file, one row per test case in order of test case index.
+
+    Args:
+        results (dict): VerificationResult by test case index, as returned by Session.verify_crashes().
+        filename (str): File to write.
+    """
+    with open(filename, "wb") as f:
+        writer = csv.writer(f)
+        writer.writerow(REPORT_FIELDS)
+        for mutant_index in sorted(results):
+            result = results[mutant_index]
+            writer.writerow([mutant_index, result.classification, result.crashes_alone, result.runs_alone,
+                             result.crashes_in_context, result.runs_in_context,
+                             result.synopsis.split("\n")[0]])
+
+
+def read_report(filename):
+    """
+    Read a report written by write_report().
+
+    Returns:
+        list of dict: Rows of the report, keyed by REPORT_FIELDS, with test_case as an int.
+    """
+    with open(filename, "rb") as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        row["test_case"] = int(row["test_case"])
+    return rows
@@ -0,0 +1,122 @@
+import contextlib
+import signal
+import threading
+import time
+
+from . import sex
+
+# phases of a test case that can have their own timeout.
+PHASES = ("monitor", "open", "pre_send", "transmit", "post_send")
+
+
+class Watchdog(object):
+    """
+    Deadline for each test case, and optionally for each phase of it, enforced with SIGALRM.
+
+    When a deadline expires, sex.BoofuzzWatchdogTimeout is raised wherever the test case is at that moment, even in a
+    blocking socket call, an edge callback or a PED-RPC call. Signals are only delivered to the main thread, so the
+    watchdog does nothing in other threads or on platforms without SIGALRM.
+
+    Args:
+        timeout (float): Seconds a test case may take. Default None (no limit).
+        phase_timeouts (dict): Seconds each phase may take, by name; see PHASES. Each phase still ends at the test case
+            deadline. Default None (no limits).
+    """
+
+    def __init__(self, timeout=None, phase_timeouts=None):
+        if phase_timeouts is None:
+            phase_timeouts = {}
+        unknown = set(phase_timeouts) - set(PHASES)
+        if unknown:
+            raise ValueError("Unknown test case phases: {0}".format(", ".join(sorted(unknown))))
+
+        self.timeout = timeout
+        self.phase_timeouts = dict(phase_timeouts)
+
+        self._phase = None
+        self._deadline = None
+        self._phase_deadline = None
+        self._phase_timeout = None
+        self._expired = False
+
+    @property
+    def enabled(self):
+        """
+        Whether deadlines are set and can be enforced in the current thread.
+        """
+        return bool(self.timeout or self.phase_timeouts) \
+            and hasattr(signal, "SIGALRM") \
+            and isinstance(threading.current_thread(), threading._MainThread)
+
+    @contextlib.contextmanager
+    def case(self):
+        """
+        Context manager enforcing the deadline of a test case.
+
+        Raises:
+            sex.BoofuzzWatchdogTimeout: If the test case, or one of its phases, runs past its deadline.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        previous_handler = signal.signal(signal.SIGALRM, self._alarm)
+        self._phase = "test case"
+        self._deadline = time.time() + self.timeout if self.timeout else None
+        self._phase_deadline = None
+        self._phase_timeout = None
+        self._expired = False
+        self._arm()
+        try:
+            yield
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+            self._phase = None
+            self._deadline = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Context manager enforcing the timeout of a phase, if it has one. Does nothing outside case().
+
+        Args:
+            name (str): One of PHASES.
+        """
+        if self._phase is None:
+            yield
+            return
+
+        outer = self._phase, self._phase_deadline, self._phase_timeout
+        self._phase = name
+        if name in self.phase_timeouts:
+            self._phase_timeout = self.phase_timeouts[name]
+            self._phase_deadline = time.time() + self._phase_timeout
+        self._arm()
+        try:
+            yield
+        finally:
+            self._phase, self._phase_deadline, self._phase_timeout = outer
+            self._arm()
+
+    def _arm(self):
+        """
+        Set the timer for the earliest deadline in force.
+        """
+        # once the watchdog went off, the test case is being aborted; don't interrupt the clean-up.
+        if self._expired:
+            return
+
+        deadlines = [deadline for deadline in (self._deadline, self._phase_deadline) if deadline is not None]
+        if deadlines:
+            signal.setitimer(signal.ITIMER_REAL, max(min(deadlines) - time.time(), 0.001))
+        else:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    def _alarm(self, signum, frame):
+        self._expired = True
+        if self._phase_deadline is not None and (self._deadline is None or self._phase_deadline <= self._deadline):
+            timeout = self._phase_timeout
+        else:
+            timeout = self.timeout
+        raise sex.BoofuzzWatchdogTimeout(phase=self._phase, timeout=timeout)
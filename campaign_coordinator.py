@@ -0,0 +1,44 @@
+import getopt
+import sys
+
+from boofuzz import coordinator
+
+USAGE = "USAGE: campaign_coordinator.py"\
+        "\n    [-f|--state_file FILENAME]   file to save campaign progress to, and resume from"\
+        "\n    [-P|--port PORT]             TCP port to bind this coordinator to (default 26003)"\
+        "\n    [-s|--lease_size NUM]        number of test cases per lease (default 100)"\
+        "\n    [-t|--lease_timeout SECONDS] hand out leases not completed in time again (default 600)"\
+        "\n\nWorkers are Sessions created with coordinator=pedrpc.Client(host, port)."
+
+ERR = lambda msg: sys.stderr.write("ERR> " + msg + "\n") or sys.exit(1)
+
+
+if __name__ == "__main__":
+    # parse command line options.
+    opts = None
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "f:P:s:t:", ["state_file=", "port=", "lease_size=", "lease_timeout="])
+    except getopt.GetoptError:
+        ERR(USAGE)
+
+    state_file = None
+    PORT = 26003
+    lease_size = 100
+    lease_timeout = 600
+    for opt, arg in opts:
+        if opt in ("-f", "--state_file"):
+            state_file = arg
+        if opt in ("-P", "--port"):
+            PORT = int(arg)
+        if opt in ("-s", "--lease_size"):
+            lease_size = int(arg)
+        if opt in ("-t", "--lease_timeout"):
+            lease_timeout = float(arg)
+
+    # spawn the PED-RPC servlet.
+    servlet = coordinator.CampaignCoordinator("0.0.0.0", PORT,
+                                              state_filename=state_file,
+                                              lease_size=lease_size,
+                                              lease_timeout=lease_timeout)
+    print "Campaign coordinator listening on 0.0.0.0:%d" % PORT
+    servlet.serve_forever()
@@ -6,6 +6,7 @@ import time
 import threading
 import subprocess
 
+from boofuzz import coverage
 from boofuzz import pedrpc
 
 '''
@@ -21,11 +22,13 @@ Replicated methods:
     - alive
     - log
     - post_send
+    - post_send_with_coverage
     - pre_send
     - start_target
     - stop_target
     - set_start_commands
     - set_stop_commands
+    - set_coverage
 
 Limitations
     - Cannot attach to an already running process
@@ -44,7 +47,8 @@ USAGE = "USAGE: process_monitor_unix.py"\
         "\n    [-P|--port PORT]             TCP port to bind this agent too"\
         "\n    [-l|--log_level LEVEL]       log level (default 1), increase for more verbosity"\
         "\n    [-d|--coredump_dir dir]      directory where coredumps are moved to "\
-        "\n                                 (you may need to adjust ulimits to create coredumps)"
+        "\n                                 (you may need to adjust ulimits to create coredumps)"\
+        "\n    [--coverage]                 pass an AFL-style coverage bitmap to the target"
 
 ERR   = lambda msg: sys.stderr.write("ERR> " + msg + "\n") or sys.exit(1)
 
@@ -67,9 +71,9 @@ class DebuggerThread:
         self.exit_status = None
         self.alive = False
 
-    def spawn_target(self):
+    def spawn_target(self, env=None):
         print self.tokens
-        self.pid = subprocess.Popen(self.tokens).pid
+        self.pid = subprocess.Popen(self.tokens, env=env).pid
         self.alive = True
 
     def start_monitoring(self):
@@ -121,6 +125,7 @@ class NIXProcessMonitorPedrpcServer(pedrpc.Server):
         self.stop_commands  = []
         self.proc_name      = None
         self.coredump_dir   = coredump_dir
+        self.coverage       = None
         self.log("Process Monitor PED-RPC server initialized:")
         self.log("Listening on %s:%s" % (host, port))
         self.log("awaiting requests...")
@@ -184,6 +189,26 @@ class NIXProcessMonitorPedrpcServer(pedrpc.Server):
 
         return self.dbg.is_alive()
 
+    def post_send_with_coverage(self):
+        """
+        Like post_send(), but also reports the coverage of the test case. See set_coverage().
+
+        @rtype:  tuple
+        @return: (True if the target is still active, False otherwise;
+                  number of edges the test case hit for the first time or with a new hit count class, 0 without
+                  coverage)
+        """
+
+        alive = self.post_send()
+
+        if self.coverage is None:
+            return alive, 0
+
+        new_edges = self.coverage.update()
+        if new_edges:
+            self.log("test %d: %d new edges, %d in total" % (self.test_number, new_edges, self.coverage.edges), 5)
+        return alive, new_edges
+
     def _get_coredump_path(self):
         """
         This method returns the path to the coredump file if one was created
@@ -209,6 +234,9 @@ class NIXProcessMonitorPedrpcServer(pedrpc.Server):
         self.log("pre_send(%d)" % test_number, 10)
         self.test_number = test_number
 
+        if self.coverage is not None:
+            self.coverage.reset()
+
     def start_target(self):
         """
         Start up the target process by issuing the commands in self.start_commands.
@@ -219,8 +247,12 @@ class NIXProcessMonitorPedrpcServer(pedrpc.Server):
 
         self.log("starting target process")
 
+        env = None
+        if self.coverage is not None:
+            env = dict(os.environ, **self.coverage.environment())
+
         self.dbg = DebuggerThread(self.start_commands[0])
-        self.dbg.spawn_target()
+        self.dbg.spawn_target(env=env)
         # prevent blocking by spawning off another thread to waitpid
         t = threading.Thread(target=self.dbg.start_monitoring)
         t.daemon = True
@@ -275,6 +307,24 @@ class NIXProcessMonitorPedrpcServer(pedrpc.Server):
 
         self.stop_commands = stop_commands
 
+    def set_coverage(self, enabled):
+        """
+        Enable or disable coverage feedback. When enabled, the target is started with an AFL-style shared memory
+        coverage bitmap (__AFL_SHM_ID in its environment) that is cleared before each test case and diffed by
+        post_send_with_coverage(). Takes effect at the next start of the target.
+
+        @type  enabled: bool
+        @param enabled: Whether to collect coverage
+        """
+
+        self.log("updating coverage to: %s" % enabled)
+
+        if enabled and self.coverage is None:
+            self.coverage = coverage.CoverageMap()
+        elif not enabled and self.coverage is not None:
+            self.coverage.close()
+            self.coverage = None
+
     def set_proc_name(self, proc_name):
         self.log("updating target process name to '%s'" % proc_name)
 
@@ -295,7 +345,8 @@ if __name__ == "__main__":
     # parse command line options.
     opts = None
     try:
-        opts, args = getopt.getopt(sys.argv[1:], "c:P:l:d:", ["crash_bin=", "port=", "log_level=", "coredump_dir="])
+        opts, args = getopt.getopt(sys.argv[1:], "c:P:l:d:",
+                                   ["crash_bin=", "port=", "log_level=", "coredump_dir=", "coverage"])
     except getopt.GetoptError:
         ERR(USAGE)
 
@@ -303,6 +354,7 @@ if __name__ == "__main__":
     PORT = None
     crash_bin = None
     coredump_dir = None
+    collect_coverage = False
     for opt, arg in opts:
         if opt in ("-c", "--crash_bin"):
             crash_bin  = arg
@@ -312,6 +364,8 @@ if __name__ == "__main__":
             log_level  = int(arg)
         if opt in ("-d", "--coredump_dir"):
             coredump_dir = arg
+        if opt == "--coverage":
+            collect_coverage = True
 
     if not crash_bin:
         ERR(USAGE)
@@ -325,6 +379,7 @@ if __name__ == "__main__":
     # spawn the PED-RPC servlet.
 
     servlet = NIXProcessMonitorPedrpcServer("0.0.0.0", PORT, crash_bin, coredump_dir, log_level)
+    servlet.set_coverage(collect_coverage)
     servlet.serve_forever()
 
 
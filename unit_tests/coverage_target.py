@@ -0,0 +1,50 @@
+"""
+Stand-in for a target built with AFL-style coverage instrumentation, for process_monitor_unix tests.
+
+Usage: coverage_target.py FD
+       coverage_target.py --hit EDGE...
+
+Attaches to the coverage map named by __AFL_SHM_ID in the environment, like instrumented code does; it doesn't import
+boofuzz, so that it starts quickly. With FD, accepts TCP connections on the listening socket FD, inherited from the
+parent, and for every message counts one edge per pair of adjacent bytes before answering "ok". With --hit, counts
+one hit of each EDGE and exits.
+"""
+import ctypes
+import ctypes.util
+import os
+import socket
+import sys
+
+MAP_SIZE = 1 << 16
+
+
+def attach():
+    libc = ctypes.CDLL(ctypes.util.find_library("c"))
+    libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+    libc.shmat.restype = ctypes.c_void_p
+    return (ctypes.c_ubyte * MAP_SIZE).from_address(libc.shmat(int(os.environ["__AFL_SHM_ID"]), None, 0))
+
+
+def hit(trace, edge):
+    edge %= MAP_SIZE
+    trace[edge] = (trace[edge] + 1) & 0xff
+
+
+def serve(trace, fd):
+    server = socket.fromfd(fd, socket.AF_INET, socket.SOCK_STREAM)
+    while True:
+        connection, _ = server.accept()
+        data = connection.recv(4096)
+        for previous, current in zip("\x00" + data, data):
+            hit(trace, ord(previous) << 8 | ord(current))
+        connection.sendall("ok")
+        connection.close()
+
+
+if __name__ == "__main__":
+    if sys.argv[1] == "--hit":
+        trace = attach()
+        for argument in sys.argv[2:]:
+            hit(trace, int(argument))
+    else:
+        serve(attach(), int(sys.argv[1]))
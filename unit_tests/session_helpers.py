@@ -0,0 +1,77 @@
+"""Protocol definitions and fake connections shared by the session tests."""
+import time
+
+# pytest is required as an extras_require:
+# noinspection PyPackageRequirements
+import mock
+
+from boofuzz import *
+
+
+def define_requests(greeting="hello", tail=False):
+    """Clear the defined requests and define "first" (a greeting and a space) and "second" (an opcode and a verb).
+
+    Args:
+        greeting (str): Default value of the greeting in "first".
+        tail (bool): Add a "tail" string to "second".
+    """
+    blocks.REQUESTS = {}
+    blocks.CURRENT = None
+
+    s_initialize("first")
+    s_string(greeting, max_len=16, name="greeting")
+    s_delim(" ", name="space")
+    s_initialize("second")
+    s_byte(1, name="opcode")
+    s_group("verb", values=["GET", "PUT"])
+    if tail:
+        s_string("tail", max_len=16, name="tail")
+
+
+def make_connection(response):
+    """Mock connection which records what is sent and answers every request with response."""
+    connection = mock.MagicMock(spec=ITargetConnection)
+    connection.sent = []
+
+    def send(data):
+        connection.sent.append(data)
+        time.sleep(0.001)
+        return len(data)
+
+    connection.send.side_effect = send
+    connection.recv.return_value = response
+    return connection
+
+
+class ScriptedConnection(ITargetConnection):
+    """Connection which answers every request, except requests containing silent_on."""
+
+    def __init__(self, silent_on):
+        self._silent_on = silent_on
+        self._last_sent = ""
+
+    def close(self):
+        pass
+
+    def open(self):
+        pass
+
+    def recv(self, max_bytes):
+        if self._silent_on in self._last_sent:
+            return ""
+        return "ok"
+
+    def send(self, data):
+        self._last_sent = data
+        return len(data)
+
+    @property
+    def info(self):
+        return "scripted"
+
+
+def replay(request, mutant_index):
+    """Reset request and call mutate() mutant_index times."""
+    request.reset()
+    for _ in range(mutant_index):
+        assert request.mutate()
@@ -0,0 +1,71 @@
+import unittest
+
+# pytest is required as an extras_require:
+# noinspection PyPackageRequirements
+import mock
+
+from boofuzz import *
+
+from .session_helpers import define_requests, make_connection
+
+
+class TestBroadcast(unittest.TestCase):
+    def setUp(self):
+        define_requests()
+
+        self.logger = FuzzLogger()
+        self.session = Session(web_port=0, fuzz_data_logger=self.logger, restart_sleep_time=0, crash_threshold=10000,
+                               render_cache=True)
+        self.session.connect(s_get("first"))
+        self.session.connect(s_get("first"), s_get("second"))
+
+        # the reference answers everything; the other implementation doesn't answer PUT.
+        self.reference = make_connection("ok")
+        self.other = make_connection("ok")
+        self.other.recv.side_effect = lambda max_bytes: "" if "PUT" in self.other.sent[-1] else "ok"
+        self.session.add_target(Target(connection=self.reference))
+        self.session.add_target(Target(connection=self.other))
+
+    def test_render_once_send_to_all(self):
+        """
+        Given: A session with two targets.
+        When: Calling fuzz() with broadcast=True.
+        Then: Each node of each test case is rendered once or taken from the render cache, and both targets receive
+              every test case.
+        """
+        with mock.patch.object(Request, "render", autospec=True, side_effect=Request.render) as render:
+            self.session.fuzz(broadcast=True)
+
+        self.assertEqual(len(self.reference.sent), render.call_count + self.session.render_cache_stats["hits"])
+        self.assertEqual(self.reference.sent, self.other.sent)
+        self.assertEqual(self.session.num_mutations(), len(self.logger.all_test_cases))
+
+    def test_differences_flagged(self):
+        """
+        Given: A session with two targets, one of which fails on some test cases.
+        When: Calling fuzz() with broadcast=True.
+        Then: Exactly the test cases failing on that target are recorded in differential_results and procmon_results,
+              with responses side by side.
+        """
+        self.session.fuzz(broadcast=True)
+
+        offsets = self.session._fuzz_case_offsets()
+        expected = set()
+        for index in range(1, self.session.num_mutations() + 1):
+            path = self.session._seek_case(index, offsets)
+            if any("PUT" in self.session.nodes[e.dst].render() for e in path):
+                expected.add(index)
+
+        self.assertTrue(expected)
+        self.assertEqual(expected, set(self.session.differential_results))
+        self.assertEqual(expected, set(self.session.procmon_results))
+        for index in expected:
+            result = self.session.differential_results[index]
+            self.assertEqual([False, True], result["crashed"])
+            self.assertIn("ok", result["responses"][0])
+            self.assertIn("", result["responses"][1])
+            self.assertTrue(self.session.procmon_results[index].startswith("Target 1: "))
+
+
+if __name__ == '__main__':
+    unittest.main()
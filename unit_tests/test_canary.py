@@ -0,0 +1,83 @@
+import unittest
+
+from boofuzz import *
+
+from .session_helpers import make_connection
+
+
+def make_wedging_connection(trigger):
+    """Mock connection which stops answering after it receives trigger, until restart() is called."""
+    connection = make_connection("")
+    connection.wedged = False
+
+    def send(data):
+        connection.sent.append(data)
+        if data == trigger:
+            connection.wedged = True
+        return len(data)
+
+    def restart(**kwargs):
+        connection.wedged = False
+
+    connection.send.side_effect = send
+    connection.recv.side_effect = lambda max_bytes: "" if connection.wedged else "200 OK"
+    connection.restart = restart
+    return connection
+
+
+class TestCanary(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        s_initialize("request")
+        s_byte(0, name="opcode")
+
+    def run_session(self, connection, canary_interval):
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), check_data_received_each_request=False,
+                          target=Target(connection=connection), canary_interval=canary_interval)
+        session.on_failure += connection.restart
+        session.connect(s_get("request"))
+        session.fuzz()
+        return session
+
+    def test_wedged_target(self):
+        """
+        Given: A session with canaries every 8 test cases, and a target that silently stops answering after one of
+               them.
+        When: Fuzzing.
+        Then: One canary fails, the wedging test case is among its suspects, the target is restarted and the interval
+              shrinks, and later canaries pass.
+        """
+        connection = make_wedging_connection("v")
+        session = self.run_session(connection, canary_interval=8)
+
+        self.assertEqual(1, len(session.canary_results))
+        suspects = list(session.canary_results.values())[0]
+        self.assertLessEqual(len(suspects), 8)
+        rendered = []
+        for index in suspects:
+            session._seek_case(index, session._fuzz_case_offsets())
+            rendered.append(session.fuzz_node.render())
+        self.assertIn("v", rendered)
+
+        self.assertFalse(connection.wedged)
+        self.assertEqual(8, session._canary_current_interval)
+        self.assertEqual(["\x00"] * 2, connection.sent[:2])
+
+    def test_healthy_target(self):
+        """
+        Given: A session with canaries and a target that always answers.
+        When: Fuzzing.
+        Then: No canary fails and the canaries compare responses byte for byte.
+        """
+        connection = make_wedging_connection(None)
+        session = self.run_session(connection, canary_interval=8)
+
+        self.assertEqual({}, session.canary_results)
+        self.assertTrue(session._canary_exact)
+        self.assertEqual("200 OK", session._canary_baseline)
+
+
+if __name__ == '__main__':
+    unittest.main()
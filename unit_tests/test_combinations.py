@@ -0,0 +1,97 @@
+import itertools
+import unittest
+
+from boofuzz import *
+
+from .session_helpers import replay
+
+
+class TestCombinations(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        s_initialize("combinations-test")
+        s_byte(0x41, name="byte")
+        s_delim(":", name="delim")
+        with s_block("body"):
+            s_word(0x1234, name="word")
+            s_string("name", max_len=16, name="string")
+        s_group("verb", values=["GET", "PUT", "POST"])
+
+    def covered(self, combinations, columns):
+        """Set of value combinations of the given columns over all rows."""
+        return set(tuple(combinations.row(i)[column] for column in columns)
+                   for i in range(combinations.num_mutations()))
+
+    def test_pairwise_coverage(self):
+        """
+        Given: A request with pairwise combinations of all its primitives.
+        When: Looking at the rows of the covering array.
+        Then: Every pair of values of every two primitives appears, with far fewer rows than the cartesian product.
+        """
+        s_combinations(name="pairs")
+        combinations = s_get("combinations-test").names["pairs"]
+
+        levels = [len(self.covered(combinations, [column])) for column in range(len(combinations.primitives))]
+        self.assertEqual([min(primitive.num_mutations(), 10) for primitive in combinations.primitives], levels)
+
+        for i, j in itertools.combinations(range(len(combinations.primitives)), 2):
+            self.assertEqual(levels[i] * levels[j], len(self.covered(combinations, [i, j])))
+
+        self.assertEqual(11 ** 2, combinations.num_mutations())
+
+    def test_three_wise_coverage(self):
+        """
+        Given: Combinations of strength 3 of a subset of primitives, with few values each.
+        When: Looking at the rows of the covering array.
+        Then: Every triple of values appears.
+        """
+        s_combinations(strength=3, max_values=4, primitives=["byte", "word", "string", "verb"], name="triples")
+        combinations = s_get("combinations-test").names["triples"]
+
+        for columns in itertools.combinations(range(4), 3):
+            self.assertEqual(reduce(lambda a, b: a * b, [combinations._levels[c] for c in columns]),
+                             len(self.covered(combinations, columns)))
+
+        self.assertEqual(5 ** 3, combinations.num_mutations())
+
+    def test_mutations(self):
+        """
+        Given: A request with combinations.
+        When: Mutating and seeking it.
+        Then: num_mutations() includes the combinations, each combination changes several primitives at once, seek()
+              matches replay and the request renders its original value afterwards.
+        """
+        request = s_get("combinations-test")
+        num_single = request.num_mutations()
+        s_combinations(name="pairs")
+        combinations = request.names["pairs"]
+        self.assertEqual(num_single + combinations.num_mutations(), request.num_mutations())
+
+        replay(request, num_single + 2)
+        self.assertIs(combinations, request.mutant)
+        rendered = request.render()
+        for primitive, position in zip(combinations.primitives, combinations.row(1)):
+            self.assertEqual(primitive._render(primitive._mutation_value(position)), primitive.render())
+
+        request.seek(num_single + 2)
+        self.assertEqual(rendered, request.render())
+
+        while request.mutate():
+            pass
+        self.assertEqual(request.original_value, request.render())
+
+    def test_inside_block(self):
+        """
+        Given: An open block.
+        When: Adding combinations.
+        Then: SullyRuntimeError is raised.
+        """
+        s_block_start("open")
+        with self.assertRaises(SullyRuntimeError):
+            s_combinations()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import multiprocessing
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+from boofuzz import *
+from boofuzz import coordinator
+
+from .session_helpers import ScriptedConnection, define_requests
+
+
+def free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def make_session(coordinator_client=None):
+    session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), restart_sleep_time=0, crash_threshold=10000,
+                      target=Target(connection=ScriptedConnection(silent_on="PUT")),
+                      coordinator=coordinator_client)
+    session.connect(s_get("first"))
+    session.connect(s_get("first"), s_get("second"))
+    return session
+
+
+def run_worker(port):
+    define_requests()
+    make_session(coordinator_client=pedrpc.Client("127.0.0.1", port)).fuzz()
+
+
+class TestCampaignCoordinator(unittest.TestCase):
+    def setUp(self):
+        define_requests()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.state_filename = os.path.join(self.tmp_dir, "campaign")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_workers_share_campaign(self):
+        """
+        Given: A coordinator on localhost.
+        When: Two worker Sessions in separate processes fuzz through it.
+        Then: The campaign is done and the coordinator has the same crash synopses as a Session fuzzing on its own.
+        """
+        sequential = make_session()
+        sequential.fuzz()
+
+        port = free_port()
+        server = coordinator.CampaignCoordinator("127.0.0.1", port, state_filename=self.state_filename, lease_size=7)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+
+        workers = [multiprocessing.Process(target=run_worker, args=(port,)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        client = pedrpc.Client("127.0.0.1", port)
+        status = client.status()
+        self.assertTrue(status["done"])
+        self.assertEqual(sequential.num_mutations(), status["watermark"])
+        self.assertEqual(sequential.procmon_results, client.crash_synopses())
+
+    def test_resume_after_restart(self):
+        """
+        Given: A coordinator with a completed lease and an active lease, saving its state.
+        When: A new coordinator is started on the same state file.
+        Then: The completed lease stays done and the active lease is handed out again.
+        """
+        server = coordinator.CampaignCoordinator("127.0.0.1", free_port(), state_filename=self.state_filename,
+                                                 lease_size=10)
+        self.assertTrue(server.register("worker", 100))
+        lease_id, start, stop = server.lease("worker")
+        server.complete(lease_id, start, stop, {"done_to": stop - 1, "procmon_results": {3: "crash"},
+                                                "netmon_results": {}})
+        _, active_start, _ = server.lease("worker")
+
+        restarted = coordinator.CampaignCoordinator("127.0.0.1", free_port(), state_filename=self.state_filename)
+
+        self.assertFalse(restarted.register("other", 99))
+        self.assertEqual({3: "crash"}, restarted.crash_synopses())
+        self.assertEqual(10, restarted.status()["watermark"])
+        self.assertEqual(active_start, restarted.lease("other")[1])
+
+    def test_saved_on_completion(self):
+        """
+        Given: A coordinator saving its state.
+        When: Leasing, then completing a lease, and completing before any worker registered.
+        Then: Only completion saves the state, and completing without a campaign does nothing.
+        """
+        server = coordinator.CampaignCoordinator("127.0.0.1", free_port(), state_filename=self.state_filename)
+        server.complete(1, 1, 11, {"done_to": 10, "procmon_results": {}, "netmon_results": {}})
+        self.assertFalse(os.path.exists(self.state_filename))
+
+        server.register("worker", 100)
+        os.remove(self.state_filename)
+        lease_id, start, stop = server.lease("worker")
+        self.assertFalse(os.path.exists(self.state_filename))
+
+        server.complete(lease_id, start, stop, {"done_to": stop - 1, "procmon_results": {}, "netmon_results": {}})
+        self.assertTrue(os.path.exists(self.state_filename))
+
+
+if __name__ == '__main__':
+    unittest.main()
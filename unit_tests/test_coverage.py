@@ -0,0 +1,103 @@
+import os
+import socket
+import subprocess
+import sys
+import unittest
+
+import mock
+
+import process_monitor_unix
+from boofuzz import *
+from boofuzz.coverage import CoverageMap
+
+TARGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "coverage_target.py")
+
+class TestCoverageMap(unittest.TestCase):
+    def setUp(self):
+        self.coverage = CoverageMap()
+
+    def tearDown(self):
+        self.coverage.close()
+
+    def run_target(self, *edges):
+        """Run the stand-in target to hit edges in self.coverage, after clearing the trace."""
+        self.coverage.reset()
+        env = dict(os.environ, **self.coverage.environment())
+        subprocess.check_call([sys.executable, TARGET, "--hit"] + [str(edge) for edge in edges], env=env)
+
+    def test_new_edges(self):
+        """
+        Given: A CoverageMap shared with other processes.
+        When: Processes hit edges in it.
+        Then: update() counts edges never hit before, and edges hit a number of times never seen before.
+        """
+        self.run_target(5, 7, 7, 1 << 16 | 9)
+        self.assertEqual(3, self.coverage.update())
+        self.assertEqual(3, self.coverage.edges)
+
+        self.run_target(5, 7, 7, 9)
+        self.assertEqual(0, self.coverage.update())
+
+        self.run_target(5, 7, 7, 7, 7, 11)
+        self.assertEqual(2, self.coverage.update())
+        self.assertEqual(4, self.coverage.edges)
+
+    def test_attach(self):
+        """
+        Given: An environment without a coverage map.
+        When: Attaching to the map named in it.
+        Then: None is returned.
+        """
+        self.assertIsNone(CoverageMap.attach(environ={}))
+
+
+class TestProcessMonitorCoverage(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(5)
+
+        sleep_patch = mock.patch("process_monitor_unix.time.sleep")
+        sleep_patch.start()
+        self.addCleanup(sleep_patch.stop)
+
+        self.procmon = process_monitor_unix.NIXProcessMonitorPedrpcServer("127.0.0.1", 0, os.devnull, None, level=0)
+
+    def tearDown(self):
+        if self.procmon.dbg is not None:
+            self.procmon.stop_target()
+        self.procmon.set_coverage(False)
+        self.listener.close()
+
+    def test_session_records_coverage(self):
+        """
+        Given: A session with coverage feedback, and a process monitor that starts a stand-in instrumented target with
+               coverage.
+        When: Fuzzing.
+        Then: The first test case and some, but not all, of the others are recorded as finding new edges, at least as
+              many as the process monitor saw.
+        """
+        s_initialize("coverage")
+        s_static("GET ")
+        s_string("hello", max_len=8, name="greeting")
+
+        target = Target(connection=SocketConnection("127.0.0.1", self.listener.getsockname()[1], proto="tcp"),
+                        procmon=self.procmon,
+                        procmon_options={"start_commands": [[sys.executable, TARGET, str(self.listener.fileno())]],
+                                         "coverage": True})
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), restart_sleep_time=0, target=target,
+                          coverage_feedback=True)
+        session.connect(s_get("coverage"))
+        session.fuzz()
+
+        self.assertIn(1, session.coverage_results)
+        self.assertLess(len(session.coverage_results), session.num_mutations())
+        self.assertGreater(self.procmon.coverage.edges, 0)
+        self.assertGreaterEqual(sum(session.coverage_results.values()), self.procmon.coverage.edges)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from boofuzz import *
+from boofuzz.dedupe import BloomFilter, DigestSet, payload_digest
+
+from .session_helpers import make_connection
+
+
+class TestBloomFilter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, "bloom")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_add(self):
+        """
+        Given: A BloomFilter filled to capacity.
+        When: Adding digests again, and looking up digests never added.
+        Then: Few digests are taken for duplicates while filling it, every digest added before is a duplicate, and few
+              of the others are.
+        """
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        added = [bloom.add(payload_digest([str(i)])) for i in range(1000)]
+        self.assertGreater(added.count(True), 990)
+        self.assertEqual(added.count(True), len(bloom))
+
+        self.assertFalse(any([bloom.add(payload_digest([str(i)])) for i in range(1000)]))
+        self.assertEqual(2000 - len(bloom), bloom.num_duplicates)
+
+        false_positives = [payload_digest([str(i)]) in bloom for i in range(1000, 2000)]
+        self.assertLess(false_positives.count(True), 30)
+
+    def test_persisted(self):
+        """
+        Given: A BloomFilter with a file name.
+        When: Saving it, then loading it in a new BloomFilter with other parameters.
+        Then: The new filter knows the same digests and keeps the saved parameters.
+        """
+        bloom = BloomFilter(filename=self.filename, capacity=100)
+        bloom.add(payload_digest(["a", "b"]))
+        bloom.save()
+
+        loaded = BloomFilter(filename=self.filename, capacity=5000)
+
+        self.assertEqual(100, loaded.capacity)
+        self.assertEqual(1, len(loaded))
+        self.assertFalse(loaded.add(payload_digest(["a", "b"])))
+        self.assertTrue(loaded.add(payload_digest(["ab"])))
+
+
+class TestSessionDedupe(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        s_initialize("first")
+        s_static("A")
+        s_initialize("second")
+        s_string("x", max_len=1, name="short")
+        s_delim(" ", name="space")
+
+    def run_session(self, dedupe, callback=None):
+        logger = FuzzLogger()
+        connection = make_connection("ok")
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0,
+                          target=Target(connection=connection), dedupe=dedupe)
+        session.connect(s_get("first"))
+        session.connect(s_get("first"), s_get("second"), callback=callback)
+        session.fuzz()
+        return session, logger, connection
+
+    def test_duplicates_skipped(self):
+        """
+        Given: A session with a DigestSet, and a primitive whose library entries are truncated to few values.
+        When: Fuzzing.
+        Then: Each distinct sequence of messages is sent once, and the skipped test cases are counted.
+        """
+        dedupe = DigestSet()
+        session, logger, connection = self.run_session(dedupe)
+
+        self.assertGreater(dedupe.num_duplicates, 0)
+        self.assertEqual(session.num_mutations(), len(logger.all_test_cases) + dedupe.num_duplicates)
+        # "A" is sent before every "second" message.
+        messages = [message for message in connection.sent if message != "A"]
+        self.assertEqual(len(set(messages)), len(messages))
+
+    def test_across_campaigns(self):
+        """
+        Given: A campaign run with a BloomFilter saved to a file.
+        When: Running the same campaign with the saved filter.
+        Then: No test case is sent.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        filename = os.path.join(tmp_dir, "bloom")
+
+        self.run_session(BloomFilter(filename=filename, capacity=10000))
+        dedupe = BloomFilter(filename=filename)
+        session, logger, connection = self.run_session(dedupe)
+
+        self.assertEqual([], logger.all_test_cases)
+        self.assertEqual(session.num_mutations(), dedupe.num_duplicates)
+
+    def test_callback(self):
+        """
+        Given: A session with a DigestSet and an edge callback.
+        When: Fuzzing.
+        Then: Test cases on paths through the callback are all sent.
+        """
+        dedupe = DigestSet()
+        session, logger, _ = self.run_session(dedupe, callback=lambda *args: None)
+
+        self.assertEqual(session.num_mutations(), len(logger.all_test_cases))
+        self.assertEqual(0, dedupe.num_duplicates)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from boofuzz.fingerprints import ResponseClassIndex, fingerprint, status_token
+
+
+class TestFingerprints(unittest.TestCase):
+    def test_status_token(self):
+        """
+        Given: Responses of different protocols.
+        When: Calling status_token().
+        Then: The status code is found on the first line, or else the first word is used.
+        """
+        self.assertEqual("404", status_token("HTTP/1.1 404 Not Found\r\nServer: x\r\n\r\n"))
+        self.assertEqual("550", status_token("550 Requested action not taken.\r\n"))
+        self.assertEqual("-ERR", status_token("-ERR unknown command\r\n"))
+        self.assertEqual("", status_token(""))
+
+    def test_response_classes(self):
+        """
+        Given: A ResponseClassIndex.
+        When: Adding fingerprints of responses.
+        Then: Responses that differ only slightly fall in the same class; a different status, length or failure
+              status starts a new class.
+        """
+        response = "HTTP/1.1 400 Bad Request\r\nDate: Mon, 01 Jan 2018 12:00:01 GMT\r\n\r\n<html>name too long</html>"
+        index = ResponseClassIndex()
+
+        self.assertTrue(index.add(fingerprint(response)))
+        self.assertFalse(index.add(fingerprint(response.replace("12:00:01", "12:00:07"))))
+        self.assertTrue(index.add(fingerprint(response.replace("400", "500"))))
+        self.assertTrue(index.add(fingerprint(response * 2)))
+        self.assertTrue(index.add(fingerprint(response, failed=True)))
+        self.assertTrue(index.add(fingerprint(None)))
+        self.assertEqual(5, len(index))
+
+
+if __name__ == '__main__':
+    unittest.main()
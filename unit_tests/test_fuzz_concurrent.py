@@ -0,0 +1,132 @@
+import SocketServer
+import threading
+import time
+import unittest
+
+from boofuzz import *
+
+from .session_helpers import ScriptedConnection, define_requests
+
+
+class SlowServer(SocketServer.ThreadingTCPServer):
+    """
+    Answers each request after a delay, closes the connection on requests containing close_on and doesn't answer
+    requests containing silent_on. Counts concurrent connections.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 32
+
+    def __init__(self, close_on, silent_on):
+        SocketServer.ThreadingTCPServer.__init__(self, ("127.0.0.1", 0), SlowHandler)
+        self.close_on = close_on
+        self.silent_on = silent_on
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.max_connections = 0
+
+
+class SlowHandler(SocketServer.BaseRequestHandler):
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+            self.server.max_connections = max(self.server.max_connections, self.server.connections)
+        try:
+            while True:
+                data = self.request.recv(100000)
+                if not data or self.server.close_on is not None and self.server.close_on in data:
+                    return
+                if self.server.silent_on is not None and self.server.silent_on in data:
+                    continue
+                time.sleep(0.005)
+                self.request.sendall("ok")
+        finally:
+            with self.server.lock:
+                self.server.connections -= 1
+
+
+class TestFuzzConcurrent(unittest.TestCase):
+    def setUp(self):
+        define_requests()
+        self.start_server(close_on="PUT")
+
+    def start_server(self, close_on=None, silent_on=None):
+        self.server = SlowServer(close_on=close_on, silent_on=silent_on)
+        server_thread = threading.Thread(target=self.server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def make_session(self, logger, target=None):
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0, crash_threshold=10000,
+                          target=target)
+        session.connect(s_get("first"))
+        session.connect(s_get("first"), s_get("second"))
+        return session
+
+    def test_concurrent_matches_sequential(self):
+        """
+        Given: A session and a target that handles many connections, but fails on some test cases.
+        When: Calling fuzz_concurrent() with concurrency 8.
+        Then: Several test cases are in flight at once, every test case runs once, and the failures in the
+              FuzzLogger and procmon_results are the same as with fuzz().
+        """
+        sequential_logger = FuzzLogger()
+        sequential = self.make_session(sequential_logger, Target(connection=ScriptedConnection(silent_on="PUT")))
+        sequential.fuzz()
+
+        logger = FuzzLogger()
+        session = self.make_session(logger)
+        port = self.server.server_address[1]
+        session.fuzz_concurrent(lambda: AsyncSocketConnection("127.0.0.1", port, timeout=2), concurrency=8)
+
+        self.assertGreater(self.server.max_connections, 1)
+        self.assertEqual(sorted(sequential_logger.all_test_cases), sorted(logger.all_test_cases))
+        self.assertEqual(sequential_logger.failed_test_cases, logger.failed_test_cases)
+        self.assertEqual(sequential.procmon_results, session.procmon_results)
+        self.assertEqual(session.num_mutations(), session.total_mutant_index)
+
+    def test_silent_target(self):
+        """
+        Given: A session and a target that doesn't answer the first request of a path, but stays connected.
+        When: Calling fuzz_concurrent() with a receive timeout shorter than the target's silence.
+        Then: Every test case runs, and the same test cases fail as with fuzz().
+        """
+        self.tearDown()
+        self.start_server(silent_on="hello")
+
+        sequential_logger = FuzzLogger()
+        sequential = self.make_session(sequential_logger, Target(connection=ScriptedConnection(silent_on="hello")))
+        sequential.fuzz()
+
+        logger = FuzzLogger()
+        session = self.make_session(logger)
+        port = self.server.server_address[1]
+        session.fuzz_concurrent(lambda: AsyncSocketConnection("127.0.0.1", port, timeout=0.2), concurrency=8)
+
+        self.assertFalse(logger.error_test_cases)
+        self.assertEqual(sorted(sequential_logger.all_test_cases), sorted(logger.all_test_cases))
+        self.assertEqual(sequential_logger.failed_test_cases, logger.failed_test_cases)
+
+    def test_connection_failed(self):
+        """
+        Given: A session and no listening target.
+        When: Calling fuzz_concurrent().
+        Then: The campaign stops with an error logged.
+        """
+        logger = FuzzLogger()
+        session = self.make_session(logger)
+        port = self.server.server_address[1]
+        self.server.shutdown()
+        self.server.server_close()
+
+        session.fuzz_concurrent(lambda: AsyncSocketConnection("127.0.0.1", port, timeout=2), concurrency=2)
+
+        self.assertTrue(logger.error_test_cases)
+
+
+if __name__ == '__main__':
+    unittest.main()
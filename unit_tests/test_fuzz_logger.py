@@ -246,6 +246,31 @@ class TestFuzzLogger(unittest.TestCase):
         self.logger.log_error(description='uh oh!')
         self.assertEqual(['a', 'b', 'c', 'd'], self.logger.all_test_cases)
 
+    def test_worker_logger(self):
+        """
+        Given: A WorkerFuzzLogger from a FuzzLogger with multiple IFuzzLoggerBackends.
+        When: Logging a failing test case through it, then calling flush().
+        Then: Summary data of the FuzzLogger is updated right away, but the backends are only called by flush().
+        """
+        worker = self.logger.worker_logger()
+
+        worker.open_test_case(test_case_id='a')
+        worker.log_send(data=self.some_data)
+        worker.log_fail(description=self.some_text)
+
+        self.assertEqual(['a'], self.logger.all_test_cases)
+        self.assertEqual({'a': [self.some_text]}, self.logger.failed_test_cases)
+        self.assertEqual('a', worker.current_test_case_id)
+        self.assertFalse(self.mock_logger_1.method_calls)
+
+        worker.flush()
+
+        expected = [mock.call.open_test_case(test_case_id='a'),
+                    mock.call.log_send(data=self.some_data),
+                    mock.call.log_fail(description=self.some_text)]
+        self.assertEqual(expected, self.mock_logger_1.method_calls)
+        self.assertEqual(expected, self.mock_logger_2.method_calls)
+
 
 if __name__ == '__main__':
     unittest.main()
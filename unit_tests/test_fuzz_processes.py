@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+# pytest is required as an extras_require:
+# noinspection PyPackageRequirements
+import mock
+
+from boofuzz import *
+
+from .session_helpers import ScriptedConnection, define_requests
+
+
+class TestFuzzProcesses(unittest.TestCase):
+    def setUp(self):
+        define_requests()
+
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_session(self, num_targets=1, **kwargs):
+        logger = FuzzLogger()
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0, crash_threshold=10000,
+                          session_filename=os.path.join(self.tmp_dir, "session"))
+        for _ in range(num_targets):
+            session.add_target(Target(connection=ScriptedConnection(silent_on="PUT")))
+        session.connect(s_get("first"))
+        session.connect(s_get("first"), s_get("second"))
+        session.fuzz(**kwargs)
+        return session, logger
+
+    @unittest.skipIf(os.name == "nt", "Windows can't fork")
+    def test_shards_merged(self):
+        """
+        Given: A session with three targets that fail on some test cases.
+        When: Calling fuzz() with processes=3.
+        Then: The test cases, failures and procmon_results of the session are the same as when fuzzing in one
+              process, and each shard wrote its own log and checkpoint.
+        """
+        sequential, sequential_logger = self.run_session()
+        os.remove(sequential.session_filename)
+
+        sharded, sharded_logger = self.run_session(num_targets=3, processes=3)
+
+        self.assertEqual(sorted(sequential_logger.all_test_cases), sorted(sharded_logger.all_test_cases))
+        self.assertEqual(sequential_logger.failed_test_cases, sharded_logger.failed_test_cases)
+        self.assertEqual(sequential.procmon_results, sharded.procmon_results)
+        self.assertTrue(sharded.procmon_results)
+        self.assertEqual(sharded.num_mutations(), sharded.total_mutant_index)
+        for shard in range(3):
+            self.assertTrue(os.path.getsize(os.path.join(self.tmp_dir, "session.shard{0}.log".format(shard))))
+            self.assertTrue(os.path.exists(os.path.join(self.tmp_dir, "session.shard{0}".format(shard))))
+
+    def test_more_processes_than_targets(self):
+        """
+        Given: A session with two targets.
+        When: Calling fuzz() with processes=3.
+        Then: ValueError is raised before any shard starts, as two shards would share a target.
+        """
+        with self.assertRaises(ValueError):
+            self.run_session(num_targets=2, processes=3)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, "session.shard0.log")))
+
+    def test_windows(self):
+        """
+        Given: A session with two targets, on Windows.
+        When: Calling fuzz() with processes=2.
+        Then: ValueError is raised before any shard starts, as the session can't be pickled for the shards.
+        """
+        with mock.patch("boofuzz.sessions.os.name", "nt"):
+            with self.assertRaises(ValueError):
+                self.run_session(num_targets=2, processes=2)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, "session.shard0.log")))
+
+
+if __name__ == '__main__':
+    unittest.main()
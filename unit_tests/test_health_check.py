@@ -0,0 +1,96 @@
+import time
+import unittest
+
+from boofuzz import *
+
+from .session_helpers import make_connection
+
+
+class FakeProcmon(object):
+    """Process monitor of a target that crashes when it receives trigger, until restarted."""
+
+    def __init__(self, connection, trigger, restart_delay=0):
+        self.connection = connection
+        self.trigger = trigger
+        self.restart_delay = restart_delay
+        self.num_post_sends = 0
+        self._num_sent = 0
+
+    def alive(self):
+        return True
+
+    def pre_send(self, test_case_index):
+        pass
+
+    def post_send(self):
+        self.num_post_sends += 1
+        crashed = self.trigger in self.connection.sent[self._num_sent:]
+        return not crashed
+
+    def restart_target(self):
+        time.sleep(self.restart_delay)
+        self._num_sent = len(self.connection.sent)
+        return True
+
+    def get_crash_synopsis(self):
+        return "crashed on {0!r}".format(self.trigger)
+
+
+class TestHealthCheck(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        s_initialize("request")
+        s_byte(0, name="opcode")
+
+    def run_session(self, health_check_interval, restart_delay=0, case_timeout=None):
+        connection = make_connection("ok")
+        procmon = FakeProcmon(connection, "v", restart_delay=restart_delay)
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), crash_threshold=10,
+                          health_check_interval=health_check_interval, case_timeout=case_timeout,
+                          target=Target(connection=connection, procmon=procmon))
+        session.on_failure += lambda logger: procmon.restart_target()
+        session.connect(s_get("request"))
+        session.fuzz()
+        return session, procmon
+
+    def test_bisection(self):
+        """
+        Given: A session checking the health of the target every 16 test cases, and a target that crashes on one of
+               them.
+        When: Fuzzing.
+        Then: The process monitor is polled far less often than once per test case, and the crash is attributed to the
+              test case that triggers it, as without batching.
+        """
+        session, procmon = self.run_session(health_check_interval=16)
+        expected, _ = self.run_session(health_check_interval=1)
+
+        self.assertEqual(1, len(expected.procmon_results))
+        culprit = list(expected.procmon_results)[0]
+
+        self.assertLess(procmon.num_post_sends, session.total_mutant_index / 2)
+        self.assertEqual([culprit], list(session.procmon_results))
+        self.assertEqual([culprit], list(session.bisection_results.values()))
+        self.assertGreater(list(session.bisection_results)[0], culprit)
+        self.assertEqual({s_get("request").names["opcode"]: 1}, session.crashing_primitives)
+        self.assertEqual(expected.total_mutant_index, session.total_mutant_index)
+
+    def test_bisection_outside_case_timeout(self):
+        """
+        Given: A session with a test case timeout, checking the health of the target every 16 test cases, and a target
+               that crashes on one of them and takes longer than the timeout to restart a few times.
+        When: Fuzzing.
+        Then: Bisection is not interrupted as a hang, and attributes the crash to the test case that triggers it.
+        """
+        session, _ = self.run_session(health_check_interval=16, restart_delay=0.1, case_timeout=0.25)
+        expected, _ = self.run_session(health_check_interval=1)
+
+        culprit = list(expected.procmon_results)[0]
+        self.assertEqual({}, session.hang_results)
+        self.assertEqual([culprit], list(session.procmon_results))
+        self.assertEqual([culprit], list(session.bisection_results.values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
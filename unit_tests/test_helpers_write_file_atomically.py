@@ -0,0 +1,40 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+# pytest is required as an extras_require:
+# noinspection PyPackageRequirements
+import mock
+
+from boofuzz import helpers
+
+
+class TestWriteFileAtomically(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, "state")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_replace(self):
+        """
+        Given: An existing file.
+        When: Writing it atomically, as on Windows and elsewhere.
+        Then: The file is replaced and no temporary file is left.
+        """
+        for os_name in ("nt", "posix"):
+            with open(self.filename, "wb") as f:
+                f.write("old")
+
+            with mock.patch.object(os, "name", os_name):
+                helpers.write_file_atomically(self.filename, "new")
+
+            with open(self.filename, "rb") as f:
+                self.assertEqual("new", f.read())
+            self.assertEqual(["state"], os.listdir(self.tmp_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from boofuzz import *
+from boofuzz.incremental import CampaignHistory, IncrementalScheduler
+from boofuzz.schedulers import RandomScheduler
+
+from .session_helpers import define_requests, make_connection
+
+
+class TestCampaignHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, "history")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_persisted(self):
+        """
+        Given: A CampaignHistory with some library entries of two primitives.
+        When: Saving it, then loading it in a new CampaignHistory.
+        Then: The same entries are covered, kept as merged ranges.
+        """
+        history = CampaignHistory(filename=self.filename)
+        for library_index in [3, 1, 2, 7, 0, 5, 6]:
+            history.add("a", library_index)
+        history.add("b", 10)
+        history.save()
+
+        loaded = CampaignHistory(filename=self.filename)
+
+        self.assertEqual([(0, 4), (5, 8)], loaded.covered("a"))
+        self.assertEqual([(10, 11)], loaded.covered("b"))
+        self.assertEqual([], loaded.covered("c"))
+        self.assertTrue(loaded.is_covered("a", 6))
+        self.assertFalse(loaded.is_covered("a", 4))
+        self.assertEqual(8, len(loaded))
+
+
+class TestIncrementalScheduler(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, "history")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_campaign(self, scheduler=None, greeting="hello"):
+        """Define the requests, then fuzz them with an IncrementalScheduler on the history in self.filename."""
+        define_requests(greeting)
+        logger = FuzzLogger()
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0,
+                          target=Target(connection=make_connection("ok")))
+        session.connect(s_get("first"))
+        session.connect(s_get("first"), s_get("second"))
+        incremental = IncrementalScheduler(CampaignHistory(filename=self.filename), scheduler=scheduler)
+        session.fuzz(scheduler=incremental)
+        return session, logger, incremental
+
+    def test_unchanged(self):
+        """
+        Given: A campaign that ran to the end.
+        When: Running it again with the same definitions.
+        Then: No test case runs.
+        """
+        session, logger, _ = self.run_campaign()
+        self.assertEqual(session.num_mutations(), len(logger.all_test_cases))
+
+        _, logger, incremental = self.run_campaign()
+
+        self.assertEqual([], logger.all_test_cases)
+        self.assertEqual(session.num_mutations(), incremental.num_skipped)
+
+    def test_changed_primitive(self):
+        """
+        Given: A campaign that ran to the end.
+        When: Running it again after changing the default value of one primitive.
+        Then: Only the test cases of that primitive run.
+        """
+        self.run_campaign()
+
+        _, logger, _ = self.run_campaign(greeting="howdy")
+
+        greeting = s_get("first").names["greeting"]
+        self.assertEqual(greeting.num_mutations(), len(logger.all_test_cases))
+        self.assertTrue(all(".greeting." in test_case_id for test_case_id in logger.all_test_cases))
+
+    def test_interrupted(self):
+        """
+        Given: A campaign that ran only some of its test cases.
+        When: Running it again, with one library sorted in another order.
+        Then: Exactly the test cases that didn't run before run now.
+        """
+        first_session, first_logger, _ = self.run_campaign(scheduler=RandomScheduler(seed=1, num_samples=40))
+        self.assertEqual(40, len(first_logger.all_test_cases))
+        first_cases = set(test_case_id.split(": ")[1] for test_case_id in first_logger.all_test_cases)
+
+        define_requests()
+        s_get("first").names["greeting"].sort_library(key=len)
+        session, logger, incremental = self.run_campaign()
+
+        self.assertEqual(first_session.num_mutations() - 40, len(logger.all_test_cases))
+        self.assertEqual(40, incremental.num_skipped)
+        self.assertTrue(first_cases.isdisjoint(test_case_id.split(": ")[1] for test_case_id in logger.all_test_cases))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+import time
+import unittest
+
+# pytest is required as an extras_require:
+# noinspection PyPackageRequirements
+import mock
+
+from boofuzz import *
+from boofuzz.latency import LatencyTracker
+
+from .session_helpers import make_connection
+
+
+def make_timed_connection(slow, silent):
+    """
+    Mock connection which answers after 1 ms, after 5 ms to the message slow, and not at all to the message silent,
+    honoring set_recv_timeout().
+    """
+    connection = make_connection("")
+    connection.recv_timeout = None
+
+    def set_recv_timeout(timeout):
+        connection.recv_timeout = timeout
+
+    def recv(max_bytes):
+        if connection.sent[-1] == silent:
+            time.sleep(5 if connection.recv_timeout is None else connection.recv_timeout)
+            return ""
+        time.sleep(0.005 if connection.sent[-1] == slow else 0.001)
+        return "ok"
+
+    connection.set_recv_timeout.side_effect = set_recv_timeout
+    connection.recv.side_effect = recv
+    return connection
+
+
+class ConnectionWithoutRecvTimeout(object):
+    """Connection written before ITargetConnection.set_recv_timeout(), answering every request."""
+
+    def __init__(self):
+        self.sent = []
+
+    def close(self):
+        pass
+
+    def open(self):
+        pass
+
+    def recv(self, max_bytes):
+        return "ok"
+
+    def send(self, data):
+        self.sent.append(data)
+        return len(data)
+
+    @property
+    def info(self):
+        return "without set_recv_timeout"
+
+
+class TestLatencyTracker(unittest.TestCase):
+    def test_timeout(self):
+        """
+        Given: A LatencyTracker.
+        When: Recording latencies of a request.
+        Then: There is no timeout until there are enough samples, then the timeout is the percentile latency times
+              the factor, but at least the floor, and latencies well above the percentile are outliers.
+        """
+        tracker = LatencyTracker(factor=4, percentile=90, minimum_samples=10, floor=0.01)
+        for i in range(1, 10):
+            tracker.record("request", i / 1000.0)
+        self.assertIsNone(tracker.timeout("request"))
+        self.assertFalse(tracker.is_outlier("request", 10))
+
+        tracker.record("request", 0.1)
+        self.assertEqual(0.009, tracker.percentile_latency("request"))
+        self.assertAlmostEqual(0.036, tracker.timeout("request"))
+        self.assertFalse(tracker.is_outlier("request", 0.018))
+        self.assertTrue(tracker.is_outlier("request", 0.019))
+
+        for _ in range(10):
+            tracker.record("fast", 0.0001)
+        self.assertEqual(0.01, tracker.timeout("fast"))
+
+
+class TestSessionLatency(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        s_initialize("hello")
+        s_static("HELLO")
+        s_initialize("request")
+        s_group("verb", values=["GET", "SLOW", "SILENT", "PUT"])
+
+    def test_learned_timeout(self):
+        """
+        Given: A session with a LatencyTracker, and a target that usually answers within milliseconds.
+        When: Fuzzing.
+        Then: A request the target doesn't answer costs a few milliseconds instead of the connection timeout, a slow
+              answer is recorded as an outlier, and the unmutated request sent first keeps adding samples.
+        """
+        logger = FuzzLogger()
+        tracker = LatencyTracker(floor=0.001)
+        connection = make_timed_connection(slow="SLOW", silent="SILENT")
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0, latency=tracker,
+                          target=Target(connection=connection))
+        session.connect(s_get("hello"))
+        session.connect(s_get("hello"), s_get("request"))
+        start = time.time()
+        session.fuzz()
+
+        self.assertLess(time.time() - start, 2)
+        self.assertEqual({2: ("request", session.latency_outliers[2][1])}, session.latency_outliers)
+        self.assertEqual(["3: hello->request.verb.3"], list(logger.failed_test_cases))
+        self.assertEqual(5 + 4, len(tracker._samples["hello"]))
+
+    def test_baseline_once_after_pre_send(self):
+        """
+        Given: A session with a LatencyTracker and a pre_send() handshake.
+        When: Fuzzing a node after a full fuzzing run.
+        Then: The baseline is measured only during the first run, and each baseline connection starts with pre_send().
+        """
+        connection = make_timed_connection(slow="none", silent="none")
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), restart_sleep_time=0,
+                          latency=LatencyTracker(floor=0.001), target=Target(connection=connection))
+        session.pre_send = mock.MagicMock()
+        session.connect(s_get("hello"))
+        session.connect(s_get("hello"), s_get("request"))
+        session.fuzz()
+        baseline_connections = 5 + 5
+        self.assertEqual(baseline_connections + 4, session.pre_send.call_count)
+        self.assertEqual(5 * 1 + 5 * 2 + 4 * 2, len(connection.sent))
+
+        # the web interface thread cannot be started twice.
+        session.server_init = mock.MagicMock()
+        session.fuzz_single_node_by_path(["hello", "request"])
+
+        self.assertEqual(baseline_connections + 4 + 4, session.pre_send.call_count)
+        self.assertEqual(5 * 1 + 5 * 2 + 4 * 2 + 4 * 2, len(connection.sent))
+
+    def test_no_baseline_for_single_case(self):
+        """
+        Given: A session with a LatencyTracker.
+        When: Running a single test case.
+        Then: Only the test case is sent to the target.
+        """
+        connection = make_timed_connection(slow="none", silent="none")
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), restart_sleep_time=0,
+                          latency=LatencyTracker(floor=0.001), target=Target(connection=connection))
+        session.connect(s_get("hello"))
+        session.connect(s_get("hello"), s_get("request"))
+
+        session.fuzz_single_case(2)
+
+        self.assertEqual(["HELLO", "SLOW"], connection.sent)
+
+    def test_connection_without_recv_timeout(self):
+        """
+        Given: A session with a LatencyTracker, and a connection which has no set_recv_timeout().
+        When: Fuzzing.
+        Then: Every test case is sent, and the connection keeps its own timeout.
+        """
+        connection = ConnectionWithoutRecvTimeout()
+        logger = FuzzLogger()
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0,
+                          latency=LatencyTracker(floor=0.001), target=Target(connection=connection))
+        session.connect(s_get("hello"))
+        session.connect(s_get("hello"), s_get("request"))
+
+        session.fuzz()
+
+        self.assertEqual(["GET", "SLOW", "SILENT", "PUT"], connection.sent[-7::2])
+        self.assertEqual({}, logger.failed_test_cases)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import cPickle
+import unittest
+
+from boofuzz import leases
+
+
+class TestLeaseTable(unittest.TestCase):
+    def test_leases_cover_range_once(self):
+        """
+        Given: A LeaseTable.
+        When: Leasing and completing until no lease is left.
+        Then: Every index is leased exactly once, the table is done and the watermark is the last index.
+        """
+        table = leases.LeaseTable(first_index=5, last_index=24, lease_size=3)
+
+        leased = []
+        lease = table.lease()
+        while lease is not None:
+            leased.extend(range(lease.start, lease.stop))
+            table.complete(lease.id)
+            lease = table.lease()
+
+        self.assertEqual(range(5, 25), leased)
+        self.assertTrue(table.done)
+        self.assertEqual(24, table.watermark)
+
+    def test_release_and_skip(self):
+        """
+        Given: A LeaseTable with some indices skipped.
+        When: A lease is released and more leases are taken.
+        Then: The released lease is handed out again first, skipped indices are never handed out and the watermark
+              stops before the first index not done.
+        """
+        table = leases.LeaseTable(first_index=1, last_index=10, lease_size=2)
+        table.skip(5, 8)
+
+        first = table.lease()
+        second = table.lease()
+        table.release(first.id)
+
+        again = table.lease()
+        self.assertEqual((1, 3), (again.start, again.stop))
+
+        table.complete(again.id)
+        self.assertEqual(2, table.watermark)
+        table.complete(second.id)
+        self.assertEqual(7, table.watermark)
+
+        third = table.lease()
+        self.assertEqual((8, 10), (third.start, third.stop))
+        table.complete(third.id)
+        self.assertEqual(9, table.watermark)
+        self.assertFalse(table.done)
+
+    def test_expired_lease_reissued(self):
+        """
+        Given: A LeaseTable with a lease timeout of 0.
+        When: Taking a lease and then another one.
+        Then: The expired first lease is handed out again.
+        """
+        table = leases.LeaseTable(first_index=1, last_index=10, lease_timeout=0)
+
+        first = table.lease(owner="a")
+        second = table.lease(owner="b")
+
+        self.assertEqual(first.start, second.start)
+        self.assertEqual(["b"], [lease.owner for lease in table.active_leases])
+
+    def test_pickle_reissues_active_leases(self):
+        """
+        Given: A LeaseTable with a lease out and one completed.
+        When: Pickling and unpickling it.
+        Then: Completed indices stay done and the active lease is handed out again.
+        """
+        table = leases.LeaseTable(first_index=1, last_index=10)
+        table.complete(table.lease().id)
+        active = table.lease()
+
+        restored = cPickle.loads(cPickle.dumps(table, protocol=2))
+
+        self.assertEqual(1, restored.watermark)
+        lease = restored.lease()
+        self.assertEqual(active.start, lease.start)
+        self.assertNotEqual(active.id, lease.id)
+
+    def test_pickle_keeps_lease_ids_unique(self):
+        """
+        Given: A LeaseTable whose newest leases expired or were released, with their workers possibly still running.
+        When: Pickling and unpickling it, leasing again, and completing the expired lease.
+        Then: New leases get ids never issued before, and completing the expired lease does not complete them.
+        """
+        table = leases.LeaseTable(first_index=1, last_index=10, lease_size=2, lease_timeout=60)
+        issued = [table.lease() for _ in range(3)]
+        expired = issued[-1]
+        expired.expires = 0
+        issued.append(table.lease())
+        self.assertEqual(expired.start, issued[-1].start)
+        table.release(issued[-1].id)
+
+        restored = cPickle.loads(cPickle.dumps(table, protocol=2))
+        new_leases = [restored.lease() for _ in range(3)]
+        restored.complete(expired.id)
+
+        self.assertFalse(set(lease.id for lease in issued) & set(lease.id for lease in new_leases))
+        self.assertEqual(sorted(new_leases, key=lambda lease: lease.start), restored.active_leases)
+        self.assertEqual(0, restored.num_done)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from boofuzz import *
+from boofuzz.library_stats import LibraryStats
+
+from .session_helpers import ScriptedConnection
+
+
+class TestLibraryStats(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, "library-stats")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_persisted(self):
+        """
+        Given: LibraryStats with a file name and some recorded test cases.
+        When: Saving, then loading them in a new LibraryStats.
+        Then: The counts carry over, keyed by primitive type and library value.
+        """
+        stats = LibraryStats(filename=self.filename)
+        delim = Delim(" ")
+        stats.record(delim, "%", failed=True, timed_out=True)
+        stats.record(delim, "%", failed=True, crashed=True)
+        stats.record(delim, "!")
+        stats.save()
+
+        loaded = LibraryStats(filename=self.filename)
+
+        self.assertEqual({"runs": 2, "failures": 2, "crashes": 1, "timeouts": 1}, loaded.counts(Delim(":"), "%"))
+        self.assertEqual({"runs": 1, "failures": 0, "crashes": 0, "timeouts": 0}, loaded.counts(delim, "!"))
+        self.assertEqual(0, loaded.counts(String(""), "%")["runs"])
+        self.assertGreater(loaded.entry_yield(delim, "%"), loaded.entry_yield(delim, "?"))
+        self.assertGreater(loaded.entry_yield(delim, "?"), loaded.entry_yield(delim, "!"))
+
+    def test_sort_libraries(self):
+        """
+        Given: A request and statistics in which a late library entry of one of its primitives often failed.
+        When: Sorting the libraries of the request.
+        Then: That entry is the first mutation, the number of mutations is unchanged and seek() agrees with mutate().
+        """
+        s_initialize("sorted")
+        s_delim(" ", name="delim")
+        s_string("value", max_len=32, name="string")
+        request = s_get("sorted")
+        num_mutations = request.num_mutations()
+
+        stats = LibraryStats()
+        for _ in range(3):
+            stats.record(request.names["delim"], "%", failed=True)
+
+        stats.sort_libraries(request)
+
+        self.assertEqual(num_mutations, request.num_mutations())
+        self.assertTrue(request.mutate())
+        self.assertEqual("%value", request.render())
+
+        rendered = []
+        request.reset()
+        while request.mutate():
+            rendered.append(request.render())
+        for mutant_index in (1, 20, num_mutations):
+            request.seek(mutant_index)
+            self.assertEqual(rendered[mutant_index - 1], request.render())
+
+    def test_session_records(self):
+        """
+        Given: A session with LibraryStats and a target that doesn't answer some test cases.
+        When: Fuzzing.
+        Then: Every test case is counted for its library entry, failures and timeouts included, and the statistics
+              are saved.
+        """
+        s_initialize("first")
+        s_string("hello", max_len=16, name="greeting")
+        s_delim(" ", name="delim")
+
+        stats = LibraryStats(filename=self.filename)
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), restart_sleep_time=0, crash_threshold=10000,
+                          target=Target(connection=ScriptedConnection(silent_on="%")), library_stats=stats)
+        session.connect(s_get("first"))
+        session.fuzz()
+
+        delim = s_get("first").names["delim"]
+        self.assertEqual({"runs": 1, "failures": 1, "crashes": 0, "timeouts": 1}, stats.counts(delim, "%"))
+        self.assertEqual({"runs": 1, "failures": 0, "crashes": 0, "timeouts": 0}, stats.counts(delim, "!"))
+        self.assertEqual(len(stats), len(LibraryStats(filename=self.filename)))
+
+
+if __name__ == '__main__':
+    unittest.main()
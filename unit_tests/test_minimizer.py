@@ -0,0 +1,155 @@
+import unittest
+
+from boofuzz import *
+from boofuzz.minimizer import ddmin, shrink_length
+from boofuzz.pacing import AdaptivePacing
+
+from .session_helpers import make_connection
+
+
+class CrashingProcmon(object):
+    """Process monitor of a target that crashes when a message containing trigger is sent to it."""
+
+    def __init__(self, connection, trigger):
+        self.connection = connection
+        self.trigger = trigger
+        self.num_replays = 0
+        self._first_message = 0
+
+    def alive(self):
+        return True
+
+    def pre_send(self, test_case_index):
+        self.num_replays += 1
+        self._first_message = len(self.connection.sent)
+
+    def post_send(self):
+        return not any(self.trigger in data for data in self.connection.sent[self._first_message:])
+
+    def restart_target(self):
+        return True
+
+    def get_crash_synopsis(self):
+        return "crashed"
+
+
+class TestMinimizer(unittest.TestCase):
+    def test_ddmin(self):
+        """
+        Given: Data of 100 kB that crashes if it contains two bytes far apart, in order.
+        When: Minimizing it with ddmin.
+        Then: Only the two bytes are left.
+        """
+        data = "A" * 30000 + "X" + "B" * 40000 + "Y" + "C" * 30000
+
+        def first_crashing(candidates):
+            for position, candidate in enumerate(candidates):
+                if "X" in candidate and "Y" in candidate[candidate.index("X"):]:
+                    return position
+            return None
+
+        self.assertEqual("XY", ddmin(data, first_crashing))
+
+    def test_ddmin_irreducible(self):
+        """
+        Given: Data of 1 MB that only crashes at its full length.
+        When: Minimizing it with ddmin, four candidates at a time and at most 256 chunks.
+        Then: The data is returned unchanged after at most 512 candidates, and no call gets more than four of them.
+        """
+        data = "A" * 1000000
+        calls = []
+
+        def first_crashing(candidates):
+            calls.append(len(candidates))
+            for position, candidate in enumerate(candidates):
+                if len(candidate) == len(data):
+                    return position
+            return None
+
+        self.assertEqual(data, ddmin(data, first_crashing, width=4, max_chunks=256))
+        self.assertLessEqual(sum(calls), 2 * 256)
+        self.assertLessEqual(max(calls), 4)
+
+    def test_shrink_length(self):
+        """
+        Given: Data that crashes when longer than 1000 bytes.
+        When: Shrinking its length one and three candidates at a time.
+        Then: The prefix of 1001 bytes is found, with fewer calls when trying more candidates at once.
+        """
+        data = "A" * 100000
+        calls = {1: [], 3: []}
+        for width in calls:
+            def first_crashing(candidates, width=width):
+                calls[width].append(len(candidates))
+                for position, candidate in enumerate(candidates):
+                    if len(candidate) > 1000:
+                        return position
+                return None
+
+            self.assertEqual(1001, len(shrink_length(data, first_crashing, width=width)))
+
+        self.assertLess(len(calls[3]), len(calls[1]))
+        self.assertEqual(set([1]), set(calls[1]))
+
+
+class TestSessionMinimizeCrash(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        s_initialize("hello")
+        s_static("HELLO")
+        s_initialize("request")
+        s_static("GET ")
+        with s_block("uri"):
+            s_string("/index", name="path")
+        s_size("uri", length=2, name="uri length", fuzzable=False)
+        s_static(" HTTP")
+
+    def test_minimize_crash(self):
+        """
+        Given: A session with two targets that crash on a message containing "%n%n", and a test case with a format
+               string of 1000 bytes.
+        When: Minimizing the test case.
+        Then: The crash is reduced to the four bytes, replays are spread over both targets, the result is recorded
+              and the session is left as it was.
+        """
+        targets = []
+        for _ in range(2):
+            connection = make_connection("ok")
+            targets.append(Target(connection=connection, procmon=CrashingProcmon(connection, "%n%n")))
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), pacing=AdaptivePacing())
+        for target in targets:
+            session.add_target(target)
+        session.connect(s_get("hello"))
+        session.connect(s_get("hello"), s_get("request"))
+
+        minimized = session.minimize_crash(23)
+
+        self.assertEqual("%n%n", minimized)
+        self.assertEqual({23: "%n%n"}, session.minimized_crashes)
+        self.assertGreater(targets[1].procmon.num_replays, 0)
+        sent = targets[0]._target_connection.sent
+        self.assertEqual("HELLO", sent[0])
+        self.assertEqual("GET " + "%n" * 500 + "\xe8\x03 HTTP", sent[1])
+        self.assertIsNone(session.fuzz_node)
+        self.assertEqual("GET /index\x06\x00 HTTP", s_get("request").render())
+
+    def test_not_reproducible(self):
+        """
+        Given: A session whose target doesn't crash on a test case.
+        When: Minimizing the test case.
+        Then: None is returned and nothing is recorded.
+        """
+        connection = make_connection("ok")
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(),
+                          target=Target(connection=connection, procmon=CrashingProcmon(connection, "%n%n")))
+        session.connect(s_get("hello"))
+        session.connect(s_get("hello"), s_get("request"))
+
+        self.assertIsNone(session.minimize_crash(1))
+        self.assertEqual({}, session.minimized_crashes)
+
+
+if __name__ == '__main__':
+    unittest.main()
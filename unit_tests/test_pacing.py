@@ -0,0 +1,94 @@
+import time
+import unittest
+
+from boofuzz import *
+from boofuzz.pacing import AdaptivePacing
+
+from .session_helpers import make_connection
+
+
+def make_slow_connection(recovery_time):
+    """Mock connection which doesn't answer when opened within recovery_time seconds of the last close."""
+    connection = make_connection("")
+    connection.closed_at = 0
+    connection.ready = True
+
+    def open_():
+        connection.ready = time.time() - connection.closed_at >= recovery_time
+
+    def close():
+        connection.closed_at = time.time()
+
+    connection.open.side_effect = open_
+    connection.close.side_effect = close
+    connection.recv.side_effect = lambda max_bytes: "ok" if connection.ready else ""
+    return connection
+
+
+class TestAdaptivePacing(unittest.TestCase):
+    def test_record_case(self):
+        """
+        Given: An AdaptivePacing.
+        When: Recording failed test cases, then test cases that passed.
+        Then: The delay backs off exponentially from step up to the maximum, then shrinks back to zero.
+        """
+        pacing = AdaptivePacing(step=0.01, maximum=0.05)
+        delays = []
+        for _ in range(4):
+            pacing.record_case(ok=False)
+            delays.append(pacing.case_delay)
+        self.assertEqual([0.01, 0.02, 0.04, 0.05], delays)
+
+        for _ in range(16):
+            pacing.record_case(ok=True)
+        self.assertEqual(0, pacing.case_delay)
+
+    def test_wait_for_restart(self):
+        """
+        Given: An AdaptivePacing.
+        When: Waiting for a target that comes back after a while, then for one that is back at once, then for one that
+              never comes back.
+        Then: restart_delay becomes the time the target took, then shrinks, and the last wait gives up.
+        """
+        pacing = AdaptivePacing(step=0.001, restart_timeout=0.2)
+        back_at = time.time() + 0.05
+        elapsed = pacing.wait_for_restart(lambda: time.time() >= back_at)
+        self.assertGreaterEqual(elapsed, 0.05)
+        self.assertEqual(elapsed, pacing.restart_delay)
+
+        pacing.wait_for_restart(lambda: True)
+        self.assertAlmostEqual(elapsed * 0.9, pacing.restart_delay)
+
+        self.assertIsNone(pacing.wait_for_restart(lambda: False))
+
+
+class TestSessionPacing(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        s_initialize("request")
+        s_byte(0, name="opcode")
+
+    def test_slow_target(self):
+        """
+        Given: A session with adaptive pacing, and a target that needs 20 ms after each connection to answer again.
+        When: Fuzzing.
+        Then: The delay grows to about what the target needs, so that most test cases pass, without a fixed sleep
+              after each restart.
+        """
+        logger = FuzzLogger()
+        pacing = AdaptivePacing(step=0.005)
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=60, pacing=pacing,
+                          target=Target(connection=make_slow_connection(0.02)))
+        session.connect(s_get("request"))
+        start = time.time()
+        session.fuzz()
+
+        self.assertLess(time.time() - start, 30)
+        self.assertLess(len(logger.failed_test_cases), session.total_mutant_index / 4)
+        self.assertGreater(pacing.case_delay, 0.005)
+
+
+if __name__ == '__main__':
+    unittest.main()
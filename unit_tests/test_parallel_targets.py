@@ -0,0 +1,66 @@
+import unittest
+
+from boofuzz import *
+
+from .session_helpers import define_requests, make_connection
+
+
+class TestParallelTargets(unittest.TestCase):
+    def setUp(self):
+        define_requests()
+
+        self.logger = FuzzLogger()
+        self.session = Session(web_port=0, fuzz_data_logger=self.logger, restart_sleep_time=0, crash_threshold=10000)
+        self.session.connect(s_get("first"))
+        self.session.connect(s_get("first"), s_get("second"))
+
+    def expected_cases(self):
+        """Data sent for each test case by a session with a single target."""
+        connection = make_connection("ok")
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), target=Target(connection=connection))
+        session.connect(s_get("first"))
+        session.connect(s_get("first"), s_get("second"))
+        session.fuzz()
+        return connection.sent
+
+    def test_cases_spread_over_targets(self):
+        """
+        Given: A session with three targets.
+        When: Calling fuzz().
+        Then: Every test case runs exactly once, on one of the targets, and every target runs some of them.
+        """
+        expected = self.expected_cases()
+        connections = [make_connection("ok") for _ in range(3)]
+        for connection in connections:
+            self.session.add_target(Target(connection=connection))
+
+        self.session.fuzz()
+
+        sent = sum((connection.sent for connection in connections), [])
+        self.assertEqual(sorted(expected), sorted(sent))
+        self.assertEqual(self.session.num_mutations(), sum(connection.open.call_count for connection in connections))
+        self.assertTrue(all(connection.open.call_count > 0 for connection in connections))
+        self.assertEqual(self.session.num_mutations(), len(self.logger.all_test_cases))
+        self.assertEqual(self.session.num_mutations(), self.session.total_mutant_index)
+
+    def test_failures_merged(self):
+        """
+        Given: A session with two targets, one of which never answers.
+        When: Calling fuzz().
+        Then: Each test case run on the silent target is recorded as a failure in the session's FuzzLogger and
+              procmon_results, and no other test case is.
+        """
+        silent = make_connection("")
+        self.session.add_target(Target(connection=make_connection("ok")))
+        self.session.add_target(Target(connection=silent))
+
+        self.session.fuzz()
+
+        self.assertEqual(silent.open.call_count, len(self.logger.failed_test_cases))
+        self.assertEqual(silent.open.call_count, len(self.session.procmon_results))
+        for index in self.session.procmon_results:
+            self.assertIn(index, [int(test_case_id.split(":")[0]) for test_case_id in self.logger.failed_test_cases])
+
+
+if __name__ == '__main__':
+    unittest.main()
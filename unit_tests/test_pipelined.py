@@ -0,0 +1,86 @@
+import threading
+import unittest
+
+# pytest is required as an extras_require:
+# noinspection PyPackageRequirements
+import mock
+
+from boofuzz import *
+from boofuzz.schedulers import RoundRobinScheduler
+
+from .session_helpers import ScriptedConnection, define_requests, make_connection
+
+
+class TestPipelined(unittest.TestCase):
+    def setUp(self):
+        define_requests(tail=True)
+
+    def run_session(self, connection, **kwargs):
+        logger = FuzzLogger()
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0, crash_threshold=3,
+                          target=Target(connection=connection))
+        session.connect(s_get("first"))
+        session.connect(s_get("first"), s_get("second"))
+        session.fuzz(**kwargs)
+        return session, logger
+
+    def test_same_data_sent(self):
+        """
+        Given: A session.
+        When: Calling fuzz() with pipeline_depth=4.
+        Then: The same data is sent as without pipelining, and the nodes are rendered outside the fuzzing thread.
+        """
+        expected = make_connection("ok")
+        self.run_session(expected)
+
+        render_threads = set()
+        original_render = Request.render
+
+        def render(request):
+            render_threads.add(threading.current_thread().name)
+            return original_render(request)
+
+        connection = make_connection("ok")
+        with mock.patch.object(Request, "render", autospec=True, side_effect=render):
+            session, _ = self.run_session(connection, pipeline_depth=4)
+
+        self.assertEqual(expected.sent, connection.sent)
+        self.assertEqual({"boofuzz-renderer"}, render_threads)
+        self.assertEqual(session.num_mutations(), session.total_mutant_index)
+
+    def test_crash_threshold(self):
+        """
+        Given: A session with a target that fails on some test cases, so that the crash threshold is reached.
+        When: Calling fuzz() with pipeline_depth=4.
+        Then: The same test cases run and fail as without pipelining.
+        """
+        sequential, sequential_logger = self.run_session(ScriptedConnection(silent_on="%"))
+        session, logger = self.run_session(ScriptedConnection(silent_on="%"), pipeline_depth=4)
+
+        self.assertLess(len(sequential_logger.all_test_cases), sequential.num_mutations())
+        self.assertEqual(sequential_logger.all_test_cases, logger.all_test_cases)
+        self.assertEqual(sequential.procmon_results, session.procmon_results)
+
+    def test_unsupported_modes(self):
+        """
+        Given: A session.
+        When: Calling fuzz() with pipeline_depth=4 and a scheduler or broadcast, or with several targets.
+        Then: ValueError is raised and nothing is sent.
+        """
+        connection = make_connection("ok")
+        with self.assertRaises(ValueError):
+            self.run_session(connection, pipeline_depth=4, scheduler=RoundRobinScheduler())
+        with self.assertRaises(ValueError):
+            self.run_session(connection, pipeline_depth=4, broadcast=True)
+
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger())
+        session.add_target(Target(connection=connection))
+        session.add_target(Target(connection=make_connection("ok")))
+        session.connect(s_get("first"))
+        with self.assertRaises(ValueError):
+            session.fuzz(pipeline_depth=4)
+        self.assertEqual([], connection.sent)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from boofuzz import *
+from boofuzz.planner import CampaignPlanner
+
+from .session_helpers import define_requests, make_connection
+
+
+class TestPlanner(unittest.TestCase):
+    def setUp(self):
+        define_requests()
+
+        self.logger = FuzzLogger()
+        self.connection = make_connection("ok")
+        self.session = Session(web_port=0, fuzz_data_logger=self.logger, restart_sleep_time=0,
+                               target=Target(connection=self.connection))
+        self.session.connect(s_get("first"))
+        self.session.connect(s_get("first"), s_get("second"))
+
+    def test_warm_up(self):
+        """
+        Given: A session.
+        When: Warming up a CampaignPlanner.
+        Then: The given number of test cases per node run, and a latency is measured for each node.
+        """
+        planner = CampaignPlanner(self.session, warmup_cases=3)
+        planner.warm_up()
+
+        self.assertEqual(6, len(self.logger.all_test_cases))
+        self.assertEqual(6, len(planner.warmup_indices))
+        self.assertEqual({"first", "first->second"}, set(planner.latencies))
+        self.assertTrue(all(latency > 0 for latency in planner.latencies.values()))
+
+    def test_warm_up_keeps_campaign_state(self):
+        """
+        Given: A session with a session file, resumed partway through a campaign with a crash recorded.
+        When: Warming up a CampaignPlanner.
+        Then: Every warm-up test case runs, and the session file, progress and results of the campaign are unchanged.
+        """
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir)
+        session_filename = os.path.join(tmp_dir, "session")
+        self.session.session_filename = session_filename
+        self.session.skip = self.session.total_mutant_index = 5
+        self.session.procmon_results = {3: "crashed"}
+        self.session.export_file()
+        with open(session_filename, "rb") as f:
+            saved = f.read()
+
+        planner = CampaignPlanner(self.session, warmup_cases=3)
+        planner.warm_up()
+
+        self.assertEqual(6, len(planner.warmup_indices))
+        with open(session_filename, "rb") as f:
+            self.assertEqual(saved, f.read())
+        self.assertEqual(session_filename, self.session.session_filename)
+        self.assertEqual(5, self.session.skip)
+        self.assertEqual(5, self.session.total_mutant_index)
+        self.assertEqual({3: "crashed"}, self.session.procmon_results)
+
+    def test_fits_budget(self):
+        """
+        Given: A CampaignPlanner with known latencies and a budget too small for all test cases.
+        When: Making a plan.
+        Then: The plan fits the budget, every primitive keeps test cases, the dropped ones are reported, and BitFields
+              keep values at the integer boundaries.
+        """
+        planner = CampaignPlanner(self.session)
+        planner.latencies = {"first": 0.1, "first->second": 0.2}
+        total = self.session.num_mutations()
+
+        plan = planner.plan(budget=10)
+
+        self.assertLessEqual(plan.estimated_duration, 10)
+        self.assertGreater(plan.estimated_duration, 9.5)
+        self.assertLess(plan.num_cases, total)
+        self.assertTrue(all(entry.positions for entry in plan.entries))
+        self.assertEqual(total - plan.num_cases, sum(num_dropped for _, num_dropped, _ in plan.dropped))
+        self.assertIn("first.greeting", plan.report())
+
+        opcode = [entry for entry in plan.entries if entry.mutation_range.name == "first->second.opcode"][0]
+        values = [opcode.mutation_range.mutant._fuzz_library[position] for position in opcode.positions]
+        self.assertIn(0, values)
+        self.assertIn(255, values)
+
+    def test_run_plan(self):
+        """
+        Given: A plan.
+        When: Fuzzing with its scheduler.
+        Then: Exactly the planned test cases run.
+        """
+        planner = CampaignPlanner(self.session)
+        planner.latencies = {"first": 0.1, "first->second": 0.1}
+        plan = planner.plan(budget=5)
+
+        self.session.fuzz(scheduler=plan.scheduler())
+
+        expected = sorted(entry.mutation_range.first_index + position
+                          for entry in plan.entries for position in entry.positions)
+        self.assertEqual(expected, sorted(int(test_case_id.split(":")[0])
+                                          for test_case_id in self.logger.all_test_cases))
+
+    def test_everything_fits(self):
+        """
+        Given: A budget larger than the whole campaign.
+        When: Making a plan.
+        Then: Nothing is dropped.
+        """
+        planner = CampaignPlanner(self.session)
+        planner.latencies = {"first": 0.1, "first->second": 0.1}
+
+        plan = planner.plan(budget=3600)
+
+        self.assertEqual(self.session.num_mutations(), plan.num_cases)
+        self.assertEqual([], plan.dropped)
+        self.assertIn("Nothing dropped.", plan.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
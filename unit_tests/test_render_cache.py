@@ -0,0 +1,77 @@
+import unittest
+
+from boofuzz import *
+
+from .session_helpers import make_connection
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        s_initialize("hello")
+        s_group("greeting", values=["HELLO", "HI"])
+        s_initialize("token")
+        s_string("0", name="value", fuzzable=False)
+        s_initialize("request")
+        s_group("verb", values=["GET", "PUT", "POST"])
+
+    def fuzz(self, render_cache, callback=None):
+        connection = make_connection("ok")
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), render_cache=render_cache,
+                          target=Target(connection=connection))
+        session.connect(s_get("hello"))
+        if callback is None:
+            session.connect(s_get("hello"), s_get("request"))
+        else:
+            session.connect(s_get("hello"), s_get("token"), callback=callback)
+            session.connect(s_get("token"), s_get("request"))
+        session.fuzz()
+        return session, connection.sent
+
+    def test_unmutated_nodes(self):
+        """
+        Given: A session fuzzing a request after another one that is fuzzed itself first.
+        When: Fuzzing with and without the render cache.
+        Then: The same data is sent, and with the cache the first request is rendered only once after it was fuzzed.
+        """
+        session, sent = self.fuzz(render_cache=True)
+        _, uncached_sent = self.fuzz(render_cache=False)
+
+        self.assertEqual(["HELLO", "HI", "HELLO", "GET", "HELLO", "PUT", "HELLO", "POST"], sent)
+        self.assertEqual(uncached_sent, sent)
+        self.assertEqual({"hits": 2, "misses": 1}, session.render_cache_stats)
+
+    def test_off_by_default(self):
+        """
+        Given: A session created without render_cache.
+        When: Fuzzing.
+        Then: Every request is rendered for every test case.
+        """
+        connection = make_connection("ok")
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), target=Target(connection=connection))
+        session.connect(s_get("hello"))
+        session.connect(s_get("hello"), s_get("request"))
+        session.fuzz()
+
+        self.assertFalse(session.render_cache)
+        self.assertEqual({}, session.render_cache_stats)
+
+    def test_edge_callback(self):
+        """
+        Given: A session with an edge callback that changes the request it leads to on every test case.
+        When: Fuzzing with the render cache.
+        Then: The changed request is rendered again every time, while the one before the callback is still reused.
+        """
+        def callback(session, node, edge, sock):
+            node.names["value"]._value = str(int(node.names["value"]._value) + 1)
+
+        session, sent = self.fuzz(render_cache=True, callback=callback)
+
+        self.assertEqual(["1", "2", "3"], sent[3::3])
+        self.assertEqual({"hits": 2, "misses": 4}, session.render_cache_stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,319 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from boofuzz import *
+from boofuzz.schedulers import FeistelPermutation, MutationRange, NoveltyScheduler, RandomScheduler, \
+    RoundRobinScheduler, WeightedScheduler
+
+from .session_helpers import ScriptedConnection, define_requests, make_connection, replay
+
+
+def make_ranges(*sizes):
+    """Adjacent MutationRanges "r0", "r1", ... of the given sizes, starting at index 1."""
+    ranges = []
+    first_index = 1
+    for i, size in enumerate(sizes):
+        ranges.append(MutationRange(first_index=first_index, num_mutations=size, path=[],
+                                    mutant=primitives.Static("", name="p{0}".format(i)), name="r{0}".format(i)))
+        first_index += size
+    return ranges
+
+
+class TestSchedulers(unittest.TestCase):
+    def test_round_robin(self):
+        """
+        Given: A RoundRobinScheduler started with ranges of different sizes.
+        When: Iterating over it.
+        Then: One index is taken from each range in turn, and every index is scheduled exactly once.
+        """
+        scheduler = RoundRobinScheduler()
+        scheduler.start(make_ranges(3, 1, 0, 2))
+
+        self.assertEqual([1, 4, 5, 2, 6, 3], list(scheduler))
+
+    def test_exhaust(self):
+        """
+        Given: A RoundRobinScheduler part of the way through its ranges.
+        When: Exhausting an index of the first range.
+        Then: No more indices of that range are scheduled.
+        """
+        scheduler = RoundRobinScheduler()
+        scheduler.start(make_ranges(3, 3))
+        self.assertEqual([1, 4], [scheduler.next_index(), scheduler.next_index()])
+
+        scheduler.exhaust(1)
+
+        self.assertEqual([5, 6], list(scheduler))
+
+    def test_weighted(self):
+        """
+        Given: A WeightedScheduler with weight 3 for one range, 0 for another and the default 1 for the rest.
+        When: Iterating over it.
+        Then: Indices are taken in proportion to the weights, evenly spread, and ranges of weight 0 are left out.
+        """
+        scheduler = WeightedScheduler(weights={"r0": 3, "r2": 0})
+        scheduler.start(make_ranges(6, 6, 6))
+
+        order = list(scheduler)
+
+        self.assertEqual([1, 2, 7, 3, 4, 5, 8, 6, 9, 10, 11, 12], order)
+
+    def test_feistel_permutation(self):
+        """
+        Given: FeistelPermutations of various sizes.
+        When: Reading every position.
+        Then: Every value in range(size) appears exactly once, and the order depends on the seed.
+        """
+        for size in (0, 1, 2, 5, 17, 1000, 4097):
+            self.assertEqual(range(size), sorted(FeistelPermutation(size, seed=7)[i] for i in range(size)))
+
+        self.assertNotEqual([FeistelPermutation(1000, seed=1)[i] for i in range(1000)],
+                            [FeistelPermutation(1000, seed=2)[i] for i in range(1000)])
+
+    def test_random(self):
+        """
+        Given: A RandomScheduler.
+        When: Iterating over it, exhausting a range along the way.
+        Then: Indices come in the order of the permutation, skipping those of the exhausted range, and a scheduler
+              with the same seed gives the same order.
+        """
+        permutation = FeistelPermutation(30, seed=5)
+        expected = [1 + permutation[i] for i in range(30)]
+
+        scheduler = RandomScheduler(seed=5)
+        scheduler.start(make_ranges(10, 10, 10))
+        order = [scheduler.next_index() for _ in range(5)]
+        scheduler.exhaust(15)
+        order.extend(scheduler)
+
+        self.assertEqual(expected[:5] + [i for i in expected[5:] if not 11 <= i <= 20], order)
+        self.assertEqual(30, scheduler.position)
+
+        again = RandomScheduler(seed=5, num_samples=5)
+        again.start(make_ranges(10, 10, 10))
+        self.assertEqual(expected[:5], list(again))
+
+    def test_random_skip(self):
+        """
+        Given: A RandomScheduler that scheduled some indices and exhausted a range.
+        When: Starting another one with the same seed and skipping with the state of the first, or skipping far
+              into a huge schedule without a state.
+        Then: Both continue where the first left off, and the huge skip jumps straight to its position.
+        """
+        scheduler = RandomScheduler(seed=5)
+        scheduler.start(make_ranges(10, 10, 10))
+        [scheduler.next_index() for _ in range(5)]
+        scheduler.exhaust(15)
+        [scheduler.next_index() for _ in range(5)]
+
+        resumed = RandomScheduler(seed=5)
+        resumed.start(make_ranges(10, 10, 10))
+        resumed.skip(10, state=scheduler.state())
+        self.assertEqual(list(scheduler), list(resumed))
+
+        size = 10 ** 12
+        huge = RandomScheduler(seed=5)
+        huge.start(make_ranges(size))
+        huge.skip(size / 2)
+        self.assertEqual(1 + FeistelPermutation(size, seed=5)[size / 2], huge.next_index())
+
+    def test_novelty(self):
+        """
+        Given: A NoveltyScheduler over a range whose test cases all get different responses and one whose test cases
+               all get the same response.
+        When: Iterating over it, giving feedback after each index.
+        Then: Most early test cases go to the first range, and every index is still scheduled exactly once.
+        """
+        scheduler = NoveltyScheduler(patience=5)
+        scheduler.start(make_ranges(100, 100))
+
+        order = []
+        for index in scheduler:
+            order.append(index)
+            if index <= 100:
+                response = "200 OK " + "".join(chr(65 + (index * i) % 26) for i in range(40))
+            else:
+                response = "400 Bad Request"
+            scheduler.feedback(index, failed=False, response=response)
+
+        self.assertEqual(range(1, 201), sorted(order))
+        self.assertGreater(len([index for index in order[:100] if index <= 100]), 75)
+        self.assertGreater(scheduler.novelty["r0"], scheduler.novelty["r1"])
+
+    def test_novelty_promotes_library_entry(self):
+        """
+        Given: A NoveltyScheduler over two ranges of primitives of the same type.
+        When: A library entry of the first range finds a new response class.
+        Then: The same library entry of the second range runs next in that range, and not again later.
+        """
+        scheduler = NoveltyScheduler()
+        scheduler.start(make_ranges(10, 10))
+
+        order = []
+        for index in scheduler:
+            order.append(index)
+            scheduler.feedback(index, failed=False, response="new" if index == 8 else "same")
+
+        self.assertEqual(18, [index for index in order[order.index(8):] if index > 10][0])
+        self.assertEqual(range(1, 21), sorted(order))
+
+    def test_novelty_coverage(self):
+        """
+        Given: A NoveltyScheduler over two ranges of primitives of the same type, whose test cases all get the same
+               response.
+        When: A library entry of the first range finds new coverage edges.
+        Then: It counts as new, and the same library entry of the second range runs next in that range.
+        """
+        scheduler = NoveltyScheduler()
+        scheduler.start(make_ranges(10, 10))
+
+        order = []
+        for index in scheduler:
+            order.append(index)
+            scheduler.feedback(index, failed=False, response="same", new_edges=3 if index == 8 else 0)
+
+        self.assertEqual(18, [index for index in order[order.index(8):] if index > 10][0])
+        self.assertEqual(2, scheduler.novelty["r0"])
+        self.assertEqual(range(1, 21), sorted(order))
+
+
+class TestSessionScheduler(unittest.TestCase):
+    def setUp(self):
+        define_requests(tail=True)
+
+    def run_session(self, connection, **kwargs):
+        logger = FuzzLogger()
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0, crash_threshold=3,
+                          skip=kwargs.pop("skip", 0), session_filename=kwargs.pop("session_filename", None),
+                          target=Target(connection=connection))
+        session.connect(s_get("first"))
+        session.connect(s_get("first"), s_get("second"))
+        session.fuzz(**kwargs)
+        return session, logger
+
+    def test_every_case_once(self):
+        """
+        Given: A session with several nodes and primitives.
+        When: Calling fuzz() with a RoundRobinScheduler.
+        Then: Every test case runs exactly once, and the first test cases mutate each primitive in turn.
+        """
+        session, logger = self.run_session(make_connection("ok"), scheduler=RoundRobinScheduler())
+
+        indices = [int(test_case_id.split(":")[0]) for test_case_id in logger.all_test_cases]
+        self.assertEqual(range(1, session.num_mutations() + 1), sorted(indices))
+
+        ranges = session._mutation_ranges(session._fuzz_case_offsets())
+        first_cases = [test_case_id.split(": ")[1].rsplit(".", 1)[0]
+                       for test_case_id in logger.all_test_cases[:len(ranges)]]
+        self.assertEqual([mutation_range.name for mutation_range in ranges], first_cases)
+
+    def test_crash_threshold(self):
+        """
+        Given: A session with a target that fails on some test cases, so that the crash threshold is reached.
+        When: Calling fuzz() with a RoundRobinScheduler.
+        Then: Exhausted primitives are dropped from the schedule, so as many test cases fail as without a scheduler.
+        """
+        sequential, sequential_logger = self.run_session(ScriptedConnection(silent_on="%"))
+        session, logger = self.run_session(ScriptedConnection(silent_on="%"), scheduler=RoundRobinScheduler())
+
+        self.assertLess(len(logger.all_test_cases), session.num_mutations())
+        self.assertEqual(len(sequential.procmon_results), len(session.procmon_results))
+
+    def test_resume(self):
+        """
+        Given: A session with skip set.
+        When: Calling fuzz() with a RoundRobinScheduler.
+        Then: The first skip test cases of the schedule are left out.
+        """
+        _, full_logger = self.run_session(make_connection("ok"), scheduler=RoundRobinScheduler())
+        _, logger = self.run_session(make_connection("ok"), scheduler=RoundRobinScheduler(), skip=10)
+
+        self.assertEqual(full_logger.all_test_cases[10:], logger.all_test_cases)
+
+    def test_random_sampling(self):
+        """
+        Given: A session.
+        When: Calling fuzz() with a RandomScheduler.
+        Then: Every test case runs exactly once, not in index order.
+        """
+        session, logger = self.run_session(make_connection("ok"), scheduler=RandomScheduler(seed=1))
+
+        indices = [int(test_case_id.split(":")[0]) for test_case_id in logger.all_test_cases]
+        self.assertEqual(range(1, session.num_mutations() + 1), sorted(indices))
+        self.assertNotEqual(sorted(indices), indices)
+
+    def test_random_resume(self):
+        """
+        Given: A session fuzzing with a RandomScheduler that stops partway, after the crash threshold exhausted
+               primitives, saving its progress to a session file.
+        When: Resuming from the session file with a RandomScheduler with the same seed.
+        Then: Together, both runs run the same test cases in the same order as a single run.
+        """
+        _, full_logger = self.run_session(ScriptedConnection(silent_on="%"), scheduler=RandomScheduler(seed=1))
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            session_filename = os.path.join(tmp_dir, "session")
+            session, logger = self.run_session(ScriptedConnection(silent_on="%"), session_filename=session_filename,
+                                               scheduler=RandomScheduler(seed=1, num_samples=150))
+            self.assertTrue(session.crashing_primitives)
+            _, resumed_logger = self.run_session(ScriptedConnection(silent_on="%"), session_filename=session_filename,
+                                                 scheduler=RandomScheduler(seed=1))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+        self.assertLess(len(full_logger.all_test_cases), session.num_mutations())
+        self.assertEqual(full_logger.all_test_cases, logger.all_test_cases + resumed_logger.all_test_cases)
+
+    def test_crash_threshold_on_last_mutation(self):
+        """
+        Given: A target that fails on the last mutation of a primitive, and a crash threshold of 1.
+        When: Calling fuzz() with a RandomScheduler, which runs that mutation before others of the primitive.
+        Then: The crash threshold exhausts the primitive although no mutation is left after it, and no more of its test
+              cases run.
+        """
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+        s_initialize("pair")
+        s_byte(0, name="a")
+        s_byte(0, name="b")
+        request = s_get("pair")
+        num_mutations = request.names["a"].num_mutations()
+        replay(request, num_mutations)
+        last_mutation = request.render()
+        request.reset()
+
+        logger = FuzzLogger()
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0, crash_threshold=1,
+                          target=Target(connection=ScriptedConnection(silent_on=last_mutation)))
+        session.connect(request)
+        session.fuzz(scheduler=RandomScheduler(seed=1))
+
+        indices = [int(test_case_id.split(":")[0]) for test_case_id in logger.all_test_cases]
+        self.assertEqual(["{0}: pair.a.{0}".format(num_mutations)], list(logger.failed_test_cases))
+        self.assertLess(len([index for index in indices if index <= num_mutations]), num_mutations)
+        self.assertEqual(num_mutations, [index for index in indices if index <= num_mutations][-1])
+
+    def test_unsupported_modes(self):
+        """
+        Given: A session with two targets.
+        When: Calling fuzz() with a scheduler and processes > 1, or without broadcast.
+        Then: ValueError is raised and nothing is sent.
+        """
+        connection = make_connection("ok")
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger())
+        session.add_target(Target(connection=connection))
+        session.add_target(Target(connection=make_connection("ok")))
+        session.connect(s_get("first"))
+
+        with self.assertRaises(ValueError):
+            session.fuzz(scheduler=RoundRobinScheduler(), processes=2)
+        with self.assertRaises(ValueError):
+            session.fuzz(scheduler=RoundRobinScheduler())
+        self.assertEqual([], connection.sent)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+
+# pytest is required as an extras_require:
+# noinspection PyPackageRequirements
+import mock
+
+from boofuzz import *
+
+from .session_helpers import define_requests, replay
+
+
+class TestSeek(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        s_initialize("seek-test")
+        s_size("body", length=2, name="sizer")
+        s_group("opcode", values=["\x01", "\x02", "\x03"])
+        s_string("name", size=12, name="fixed")
+        if s_block_start("body", group="opcode"):
+            s_delim(":", name="delim")
+            s_byte(0x41, name="byte")
+            with s_block("inner", dep="byte", dep_value=0x41):
+                s_word(0x1234, name="word")
+            s_checksum("inner", algorithm="crc32", name="crc")
+        s_block_end()
+        s_repeat("body", min_reps=1, max_reps=4, name="repeat")
+        s_string("tail", max_len=64, name="tail")
+        self.request = s_get("seek-test")
+
+    def test_seek_matches_replay(self):
+        """
+        Given: A request with sizers, groups, dependencies, checksums and repeaters.
+        When: Seeking to a mutant index.
+        Then: The rendered value, mutant and mutant index match replaying mutate() that many times.
+        """
+        num_mutations = self.request.num_mutations()
+        for mutant_index in range(0, num_mutations + 1, 7) + [num_mutations]:
+            replay(self.request, mutant_index)
+            expected = (self.request.render(), self.request.mutant, self.request.mutant_index)
+
+            self.request.seek(mutant_index)
+
+            self.assertEqual(expected, (self.request.render(), self.request.mutant, self.request.mutant_index))
+
+    def test_mutate_after_seek(self):
+        """
+        Given: A request seeked to some mutant index.
+        When: Calling mutate() until it returns False.
+        Then: The remaining mutations are exactly those a full replay produces.
+        """
+        num_mutations = self.request.num_mutations()
+        self.request.reset()
+        expected = []
+        while self.request.mutate():
+            expected.append(self.request.render())
+        self.assertEqual(num_mutations, len(expected))
+
+        for start in (0, 1, 50, num_mutations - 1, num_mutations):
+            self.request.seek(start)
+            rendered = []
+            while self.request.mutate():
+                rendered.append(self.request.render())
+
+            self.assertEqual(expected[start:], rendered)
+            self.assertEqual(self.request.original_value, self.request.render())
+
+    def test_exhaust_primitive(self):
+        """
+        Given: A request mutating a primitive.
+        When: Exhausting that primitive.
+        Then: The number of skipped mutations is returned and mutate() moves on to the next primitive.
+        """
+        self.request.seek(3)
+        self.assertIs(self.request.names["sizer"], self.request.mutant)
+
+        skipped = self.request.mutant.exhaust()
+        self.assertEqual(self.request.names["sizer"].num_mutations() - 3, skipped)
+
+        self.request.mutate()
+        self.assertIs(self.request.names["opcode"], self.request.mutant)
+
+    def test_seek_out_of_range(self):
+        """
+        Given: A request.
+        When: Seeking past its last mutation.
+        Then: IndexError is raised.
+        """
+        with self.assertRaises(IndexError):
+            self.request.seek(self.request.num_mutations() + 1)
+
+    def test_static_size_string_library(self):
+        """
+        Given: A String with a static size.
+        When: Counting and rendering its mutations.
+        Then: Every mutation fits the size, so num_mutations() matches the mutations actually produced.
+        """
+        fixed = self.request.names["fixed"]
+        fixed.reset()
+        count = 0
+        while fixed.mutate():
+            count += 1
+            self.assertEqual(12, len(fixed.render()))
+
+        self.assertEqual(fixed.num_mutations(), count)
+
+
+class TestSessionSeek(unittest.TestCase):
+    def setUp(self):
+        define_requests()
+
+        self.session = Session(web_port=0, fuzz_data_logger=FuzzLogger(),
+                               target=Target(connection=mock.MagicMock(spec=ITargetConnection)))
+        self.session.connect(s_get("first"))
+        self.session.connect(s_get("first"), s_get("second"))
+        self.session.connect(s_get("second"))
+
+    def iterate(self):
+        cases = []
+        for (path,) in self.session._iterate_protocol():
+            cases.append((self.session.total_mutant_index,
+                          [e.id for e in path],
+                          self.session.fuzz_node.render(),
+                          self.session.fuzz_node.mutant))
+        return cases
+
+    def test_seek_case_matches_iteration(self):
+        """
+        Given: A session with several paths through its graph.
+        When: Seeking each global test case index.
+        Then: Path, rendered node and mutant match those of sequential iteration.
+        """
+        cases = self.iterate()
+        self.assertEqual(self.session.num_mutations(), len(cases))
+
+        for index, path_ids, rendered, mutant in cases:
+            path = self.session._seek_case(index)
+            self.assertEqual((index, path_ids, rendered, mutant),
+                             (self.session.total_mutant_index,
+                              [e.id for e in path],
+                              self.session.fuzz_node.render(),
+                              self.session.fuzz_node.mutant))
+
+    def test_resume_skips_without_replay(self):
+        """
+        Given: A session with skip set part of the way into its second path.
+        When: Iterating the protocol.
+        Then: Iteration starts at the test case after skip and continues exactly as a full iteration would.
+        """
+        cases = self.iterate()
+        skip = self.session._fuzz_case_offsets()[1][1] + 5
+        self.session.skip = skip
+
+        with mock.patch.object(Request, "mutate", autospec=True, side_effect=Request.mutate) as mutate:
+            resumed = self.iterate()
+
+        self.assertEqual(cases[skip:], resumed)
+        self.assertEqual(len(resumed) + len(self.session._fuzz_case_offsets()) - 1, mutate.call_count)
+
+    def test_seek_case_out_of_range(self):
+        """
+        Given: A session.
+        When: Seeking a test case index beyond the last test case.
+        Then: SullyRuntimeError is raised.
+        """
+        with self.assertRaises(SullyRuntimeError):
+            self.session._seek_case(self.session.num_mutations() + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+
+from boofuzz import *
+
+from .session_helpers import make_connection
+
+
+def headers():
+    s_string("Host: ", fuzzable=False)
+    s_string("example.com", max_len=16, name="host")
+    s_delim("\r\n")
+
+
+class TestSharedBlock(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+        blocks.SHARED = {}
+
+    def define(self, *methods, **kwargs):
+        s_shared_block("headers", headers, **kwargs)
+        for method in methods:
+            s_initialize(method)
+            s_string(method, max_len=16, name="method")
+            s_shared("headers")
+        return [s_get(method) for method in methods]
+
+    def test_fuzzed_once(self):
+        """
+        Given: A shared block used in three requests.
+        When: Counting and rendering mutations.
+        Then: Only the first request fuzzes it, every request renders it, and the others render its original value
+              while the first one mutates it.
+        """
+        get, head, options = self.define("GET", "HEAD", "OPTIONS")
+        shared_mutations = get.names["headers"].num_mutations()
+        method_mutations = get.names["method"].num_mutations()
+
+        self.assertTrue(get.names["headers"].host)
+        self.assertFalse(head.names["headers"].fuzzable)
+        self.assertEqual(method_mutations + shared_mutations, get.num_mutations())
+        self.assertEqual(head.names["method"].num_mutations(), head.num_mutations())
+        self.assertEqual(options.names["method"].num_mutations(), options.num_mutations())
+        self.assertEqual("HEADHost: example.com\r\n", head.render())
+
+        get.seek(method_mutations + 1)
+        self.assertNotEqual(get.original_value, get.render())
+        self.assertEqual(head.original_value, head.render())
+
+    def test_hosts(self):
+        """
+        Given: A shared block with two hosts.
+        When: Using it in three requests, the first of them explicitly not a host.
+        Then: The second and third requests fuzz it.
+        """
+        s_shared_block("headers", headers, hosts=2)
+        hosts = []
+        for method in ("GET", "HEAD", "OPTIONS"):
+            s_initialize(method)
+            hosts.append(s_shared("headers", host=False if method == "GET" else None).host)
+
+        self.assertEqual([False, True, True], hosts)
+        self.assertEqual(2, blocks.SHARED["headers"].num_hosts)
+
+    def test_own_copy(self):
+        """
+        Given: A shared block used in two requests, each with a sizer of it.
+        When: Rendering the requests.
+        Then: Each sizer measures the copy in its own request.
+        """
+        self.define("GET", "HEAD")
+        for method in ("GET", "HEAD"):
+            s_switch(method)
+            s_size("headers", length=1, fuzzable=False)
+
+        self.assertEqual("GETHost: example.com\r\n\x13", s_get("GET").render())
+        self.assertEqual("HEADHost: example.com\r\n\x13", s_get("HEAD").render())
+        self.assertIsNot(s_get("GET").names["host"], s_get("HEAD").names["host"])
+
+    def test_errors(self):
+        """
+        Given: A shared block.
+        When: Defining it again, or using a shared block that doesn't exist.
+        Then: SullyRuntimeError is raised.
+        """
+        self.define()
+        with self.assertRaises(SullyRuntimeError):
+            s_shared_block("headers", headers)
+
+        s_initialize("GET")
+        with self.assertRaises(SullyRuntimeError):
+            s_shared("footers")
+
+    def test_session(self):
+        """
+        Given: A session with two requests using a shared block.
+        When: Fuzzing.
+        Then: The mutations of the shared block run once.
+        """
+        get, head = self.define("GET", "HEAD")
+        logger = FuzzLogger()
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0,
+                          target=Target(connection=make_connection("ok")))
+        session.connect(get)
+        session.connect(head)
+        session.fuzz()
+
+        host_cases = [test_case_id for test_case_id in logger.all_test_cases if ".host." in test_case_id]
+        self.assertEqual(get.names["host"].num_mutations(), len(host_cases))
+        self.assertTrue(all(test_case_id.split(": ")[1].startswith("GET.") for test_case_id in host_cases))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -332,6 +332,41 @@ class TestSocketConnection(unittest.TestCase):
         self.assertEqual(data_to_send, server.received)
         self.assertEqual(received, bytes(''))
 
+    def test_tcp_client_recv_timeout(self):
+        """
+        Given: A SocketConnection 'tcp' object with a long timeout and a TCP server, set not to respond.
+        When: Calling SocketConnection.set_recv_timeout() with a short timeout, then .recv()
+        Then: recv() returns bytes('') after the short timeout.
+         and: The socket timeout is back to the long timeout afterwards.
+        """
+        # Given
+        server = MiniTestServer(stay_silent=True)
+        server.bind()
+
+        t = threading.Thread(target=server.serve_once)
+        t.daemon = True
+        t.start()
+
+        uut = SocketConnection(host=socket.gethostname(), port=server.active_port, proto='tcp', timeout=30)
+        uut.logger = logging.getLogger("SulleyUTLogger")
+
+        # When
+        uut.open()
+        uut.send(data=bytes('uuddlrlrba'))
+        uut.set_recv_timeout(0.1)
+        start = time.time()
+        received = uut.recv(10000)
+        elapsed = time.time() - start
+        socket_timeout = uut._sock.gettimeout()
+        uut.close()
+
+        t.join(THREAD_WAIT_TIMEOUT)
+
+        # Then
+        self.assertEqual(received, bytes(''))
+        self.assertLess(elapsed, 5)
+        self.assertEqual(30, socket_timeout)
+
     def test_udp_client(self):
         """
         Given: A SocketConnection 'udp' object and a UDP server.
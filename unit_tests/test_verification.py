@@ -0,0 +1,114 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from boofuzz import *
+from boofuzz import verification
+from boofuzz.pacing import AdaptivePacing
+
+from .session_helpers import make_connection
+
+
+class ScriptedProcmon(object):
+    """
+    Process monitor of a target that always crashes on "CRASH", crashes on "AFTER" only right after "SETUP", and
+    crashes on every third "FLAKY".
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.num_replays = 0
+        self._num_flaky = 0
+        self._first_message = 0
+
+    def alive(self):
+        return True
+
+    def pre_send(self, test_case_index):
+        self.num_replays += 1
+        self._first_message = len(self.connection.sent)
+
+    def post_send(self):
+        sent = self.connection.sent[self._first_message:]
+        if "CRASH" in sent:
+            return False
+        if "AFTER" in sent and "SETUP" in sent[:sent.index("AFTER")]:
+            return False
+        if "FLAKY" in sent:
+            self._num_flaky += 1
+            return self._num_flaky % 3 != 0
+        return True
+
+    def restart_target(self):
+        return True
+
+    def get_crash_synopsis(self):
+        return "crashed"
+
+
+class TestVerifyCrashes(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        s_initialize("request")
+        s_group("verb", values=["A", "CRASH", "SETUP", "AFTER", "NOISE", "FLAKY"])
+
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def make_session(self, num_targets):
+        session = Session(web_port=0, fuzz_data_logger=FuzzLogger(), pacing=AdaptivePacing())
+        for _ in range(num_targets):
+            connection = make_connection("ok")
+            session.add_target(Target(connection=connection, procmon=ScriptedProcmon(connection)))
+        session.connect(s_get("request"))
+        session.procmon_results = {2: "crash\ndetails", 4: "crash", 5: "crash", 6: "crash"}
+        return session
+
+    def test_classification(self):
+        """
+        Given: A session with recorded crashes: one that always reproduces, one that needs the test case before it,
+               one that reproduces sometimes and one that doesn't.
+        When: Verifying the crashes.
+        Then: They are classified as reproducible, order-dependent, flaky and not reproducible.
+        """
+        session = self.make_session(num_targets=1)
+
+        results = session.verify_crashes(repetitions=3, context=1)
+
+        self.assertEqual({2: verification.REPRODUCIBLE,
+                          4: verification.ORDER_DEPENDENT,
+                          5: verification.NOT_REPRODUCIBLE,
+                          6: verification.FLAKY},
+                         dict((index, result.classification) for index, result in results.items()))
+        self.assertEqual(verification.VerificationResult(mutant_index=2, crashes_alone=3, runs_alone=3,
+                                                         crashes_in_context=3, runs_in_context=3,
+                                                         synopsis="crash\ndetails"), results[2])
+        self.assertIsNone(session.fuzz_node)
+
+    def test_parallel_report(self):
+        """
+        Given: A session with recorded crashes and two targets.
+        When: Verifying the crashes without context and writing a report.
+        Then: Every replay runs once across the targets, and the report has a row per crash in test case order.
+        """
+        session = self.make_session(num_targets=2)
+        report_filename = os.path.join(self.tmp_dir, "report.csv")
+
+        results = session.verify_crashes(repetitions=4, context=0, report_filename=report_filename)
+
+        self.assertEqual(16, sum(target.procmon.num_replays for target in session.targets))
+        self.assertEqual(0, results[4].runs_in_context)
+        rows = verification.read_report(report_filename)
+        self.assertEqual([2, 4, 5, 6], [row["test_case"] for row in rows])
+        self.assertEqual(["reproducible", "not reproducible", "not reproducible"],
+                         [row["classification"] for row in rows[:3]])
+        self.assertEqual("crash", rows[0]["synopsis"])
+
+
+if __name__ == '__main__':
+    unittest.main()
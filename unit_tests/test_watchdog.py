@@ -0,0 +1,139 @@
+import threading
+import time
+import unittest
+
+from boofuzz import *
+from boofuzz import pedrpc
+from boofuzz.sex import BoofuzzWatchdogTimeout
+from boofuzz.watchdog import Watchdog
+
+from .session_helpers import make_connection
+
+
+class TestWatchdog(unittest.TestCase):
+    def test_case_timeout(self):
+        """
+        Given: A Watchdog with a test case timeout.
+        When: A test case blocks past it.
+        Then: BoofuzzWatchdogTimeout is raised with the phase the test case was in and the test case timeout.
+        """
+        watchdog = Watchdog(timeout=0.1)
+        start = time.time()
+        with self.assertRaises(BoofuzzWatchdogTimeout) as context:
+            with watchdog.case():
+                with watchdog.phase("transmit"):
+                    time.sleep(5)
+
+        self.assertLess(time.time() - start, 1)
+        self.assertEqual(BoofuzzWatchdogTimeout(phase="transmit", timeout=0.1), context.exception)
+
+    def test_phase_timeout(self):
+        """
+        Given: A Watchdog with a short timeout for one phase and a long test case timeout.
+        When: Other phases take longer than it, then the phase blocks.
+        Then: Only the phase with the timeout is interrupted, and nothing goes off after the test case.
+        """
+        watchdog = Watchdog(timeout=5, phase_timeouts={"post_send": 0.1})
+        with self.assertRaises(BoofuzzWatchdogTimeout) as context:
+            with watchdog.case():
+                with watchdog.phase("transmit"):
+                    time.sleep(0.2)
+                with watchdog.phase("post_send"):
+                    time.sleep(5)
+
+        self.assertEqual(BoofuzzWatchdogTimeout(phase="post_send", timeout=0.1), context.exception)
+        time.sleep(0.2)
+
+        with self.assertRaises(ValueError):
+            Watchdog(phase_timeouts={"restart": 1})
+
+
+class TestSessionWatchdog(unittest.TestCase):
+    def setUp(self):
+        blocks.REQUESTS = {}
+        blocks.CURRENT = None
+
+        s_initialize("request")
+        s_group("verb", values=["GET", "PUT", "HANG", "POST"])
+
+    def test_hung_post_send(self):
+        """
+        Given: A session with a test case timeout, and a post_send callback that hangs on one test case.
+        When: Fuzzing.
+        Then: That test case fails as a hang and is recorded in hang_results, and the other test cases run.
+        """
+        def post_send(target, fuzz_data_logger, session, sock):
+            if session.last_send == "HANG":
+                time.sleep(60)
+
+        logger = FuzzLogger()
+        connection = make_connection("ok")
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0, case_timeout=0.2,
+                          target=Target(connection=connection))
+        session.connect(s_get("request"))
+        session.post_send = post_send
+        start = time.time()
+        session.fuzz()
+
+        self.assertLess(time.time() - start, 10)
+        self.assertEqual(["GET", "PUT", "HANG", "POST"], connection.sent)
+        self.assertEqual({3: "post_send"}, session.hang_results)
+        self.assertEqual(["3: request.verb.3"], list(logger.failed_test_cases))
+
+    def test_hung_process_monitor(self):
+        """
+        Given: A session with a test case timeout, and a process monitor whose post_send hangs on one test case.
+        When: Fuzzing.
+        Then: That test case fails as a hang in the monitor phase, not as a crash, and the other test cases run.
+        """
+        procmon = HungProcessMonitor(hang_on=3, hang_time=3)
+        connection = make_connection("ok")
+        logger = FuzzLogger()
+        session = Session(web_port=0, fuzz_data_logger=logger, restart_sleep_time=0, case_timeout=0.5)
+        session.add_target(Target(connection=connection, procmon=pedrpc.Client("127.0.0.1", procmon.port)))
+        session.on_failure += lambda logger: None
+        session.connect(s_get("request"))
+        start = time.time()
+        session.fuzz()
+
+        self.assertLess(time.time() - start, 10)
+        self.assertEqual(["GET", "PUT", "HANG", "POST"], connection.sent)
+        self.assertEqual({3: "monitor"}, session.hang_results)
+        self.assertEqual(["3: request.verb.3"], list(logger.failed_test_cases))
+        self.assertNotIn("procmon detected crash", session.procmon_results[3])
+
+
+class HungProcessMonitor(pedrpc.Server):
+    """Process monitor on a free local port whose post_send hangs for hang_time seconds on test case hang_on."""
+
+    def __init__(self, hang_on, hang_time):
+        pedrpc.Server.__init__(self, "127.0.0.1", 0)
+        self.port = self._Server__server.getsockname()[1]
+        self.hang_on = hang_on
+        self.hang_time = hang_time
+        self.test_number = None
+
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def alive(self):
+        return True
+
+    def pre_send(self, test_number):
+        self.test_number = test_number
+
+    def post_send(self):
+        if self.test_number == self.hang_on:
+            time.sleep(self.hang_time)
+        return True
+
+    def get_crash_synopsis(self):
+        return "crash"
+
+    def restart_target(self):
+        return True
+
+
+if __name__ == '__main__':
+    unittest.main()